@@ -8,7 +8,486 @@ from Ant import UNIT_STATS
 from Move import Move
 from GameState import addCoords
 from AIPlayerUtils import *
+from Experience import ExperienceWriter
+import os
+import mmap
+import struct
 import pickle
+import math
+from collections import OrderedDict
+from bisect import bisect_right
+
+# --- BINS --- (stateToCategory puts each feature into one of these)
+FOOD_BINS = [0, 2, 4, 6, 8, 10, 11] # Absolute food bins (for AI and enemy)
+FOOD_DIFF_BINS = [-6, -3, -1, 0, 1, 3, 6] # Relative food difference bins
+COMBAT_DIFF_BINS = [-3, -1, 0, 1, 3] # Combat power difference bins
+WORKER_BINS = [0, 1, 2] # Worker count bins
+QUEEN_HP_BINS = [0.25, 0.5, 0.75, 1.01] # Queen HP bins (0–1 normalized)
+THREAT_BINS = [0, 2] # Threat bins (queen/hill)
+NEAREST_FOOD_DIST_BINS = [0, 1, 2, 4, 6] # Nearest food distance bins
+NEAREST_DROPOFF_DIST_BINS = [0, 1, 2, 4, 6] # Nearest drop off location distance bins
+ATTACK_DIST_BINS = [0, 1, 2, 3, 5, 7, 10]  # distance bins for attacking ants to enemy queen
+GAME_STAGE_BINS = [0.15, 0.35, 0.6, 0.85] # Stage of the game based on food count
+
+# How many values each element of a category can take, in order (a value
+# falls below one of the bin edges or above them all)
+CATEGORY_RADICES = tuple(len(bins) + 1 for bins in (
+    FOOD_BINS, FOOD_BINS, FOOD_DIFF_BINS, COMBAT_DIFF_BINS, WORKER_BINS, QUEEN_HP_BINS,
+    THREAT_BINS, THREAT_BINS, NEAREST_FOOD_DIST_BINS, NEAREST_DROPOFF_DIST_BINS,
+    ATTACK_DIST_BINS, GAME_STAGE_BINS))
+
+
+##
+#categoryIndex
+#Description: Numbers a category tuple as a mixed-radix integer, one digit per
+#   element, so that every possible category has its own int.
+##
+def categoryIndex(category):
+    index = 0
+    for radix, value in zip(CATEGORY_RADICES, category):
+        index = index * radix + value
+    return index
+
+
+# The src directory, one up from this module, where the agent's files are
+# kept whatever directory the game is run from
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where the utility table is kept, and the pickle older versions saved it in
+# (imported the first time the table is opened)
+TABLE_FILE = os.path.join(DATA_DIR, "utility_table.bin")
+LEGACY_TABLE_FILE = os.path.join(DATA_DIR, "utility_table.pkl")
+
+# Where the games played while training are logged, for Experience.py to
+# learn from offline
+EXPERIENCE_FILE = os.path.join(DATA_DIR, "experience.log")
+
+TABLE_MAGIC = b"HW6UTIL1"
+# magic, capacity, entries used, CATEGORY_RADICES
+TABLE_HEADER = struct.Struct("<8sQQ12B4x")
+# bytes per slot: its category index + 1 (0 if free), utility and visit count
+SLOT_SIZE = 24
+MIN_CAPACITY = 1024
+
+
+##
+#UtilityTable
+#Description: The utility and visit count of every category seen so far, in
+#   an open-addressed hash table on disk that is memory-mapped rather than
+#   read in, so opening it costs the same however big it is.  The file is the
+#   header, then the category indices, utilities and visit counts of every
+#   slot as three fixed-size columns, which are used in place through typed
+#   views.  Grows to twice the size when half full.
+#
+#   A table opened for writing changes the file itself, and flush writes back
+#   only the pages that changed.  Otherwise the mapping is copy-on-write: the
+#   agent still learns during a game, but only in its own private copy of the
+#   pages it changes, so any number of players and worker processes can share
+#   one file, read-mostly, with a single writer.  Within a process, open
+#   hands every writer of a file the same table (see writableTables); there
+#   is no locking between writers in different processes.
+#
+#Variables:
+#   path - the file changes are written to, None if they are not kept
+#   users - how many opened this table and have not closed it yet
+#   capacity - number of slots (a power of two)
+#   indices - category index + 1 by slot, 0 for a free slot (view of Q)
+#   utilities - utility by slot (view of d)
+#   visits - visit count by slot (view of Q)
+#   slots - the slots of category indices looked up so far
+##
+class UtilityTable(object):
+    def __init__(self, path=None, writable=False):
+        self.path = path if writable else None
+        self.users = 1
+        self.mm = None
+        self.slots = {}
+        if path is not None and os.path.exists(path):
+            with open(path, "r+b" if writable else "rb") as f:
+                self.attach(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY))
+        else:
+            self.attach(self.newMap(MIN_CAPACITY))
+
+    ##
+    #open
+    #Description: Opens the table in path (TABLE_FILE unless given), making
+    #   it from LEGACY_TABLE_FILE first if that is all there is.  Opened for
+    #   writing, it is the table this process already has open for writing
+    #   there, if any: a second mapping of the file would go stale when the
+    #   first grows it, and then grow over the new file.
+    ##
+    @staticmethod
+    def open(writable=False, path=TABLE_FILE):
+        path = os.path.abspath(path)
+        if writable:
+            table = writableTables.get(path)
+            if table is not None:
+                table.users += 1
+                return table
+        if not os.path.exists(path) and os.path.exists(LEGACY_TABLE_FILE):
+            # made under another name and moved into place, in case other
+            # players are opening it at the same time
+            partial = "%s.%d" % (path, os.getpid())
+            table = UtilityTable(partial, True)
+            with open(LEGACY_TABLE_FILE, "rb") as f:
+                table.load(pickle.load(f))
+            table.close()
+            os.replace(partial, path)
+        table = UtilityTable(path, writable)
+        if writable:
+            writableTables[path] = table
+        return table
+
+    def __len__(self):
+        return TABLE_HEADER.unpack_from(self.mm)[2]
+
+    def __contains__(self, index):
+        return self.get(index, None) is not None
+
+    ##
+    #newMap
+    #Description: An empty table of the given capacity, in a new file at path
+    #   if changes are kept, otherwise in memory.
+    ##
+    def newMap(self, capacity):
+        size = TABLE_HEADER.size + capacity * SLOT_SIZE
+        if self.path is None:
+            mm = mmap.mmap(-1, size)
+        else:
+            with open(self.path, "w+b") as f:
+                f.truncate(size)
+                mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE)
+        TABLE_HEADER.pack_into(mm, 0, TABLE_MAGIC, capacity, 0, *CATEGORY_RADICES)
+        return mm
+
+    ##
+    #attach
+    #Description: Starts using a mapped table.
+    ##
+    def attach(self, mm):
+        magic, capacity, used = TABLE_HEADER.unpack_from(mm)[:3]
+        if magic != TABLE_MAGIC:
+            raise ValueError("not a utility table")
+        if TABLE_HEADER.unpack_from(mm)[3:] != CATEGORY_RADICES:
+            raise ValueError("utility table was saved with different category bins")
+        self.mm = mm
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        view = memoryview(mm)
+        start = TABLE_HEADER.size
+        self.indices = view[start:start + capacity * 8].cast('Q')
+        self.utilities = view[start + capacity * 8:start + capacity * 16].cast('d')
+        self.visits = view[start + capacity * 16:start + capacity * 24].cast('Q')
+        self.slots = {}
+
+    def detach(self):
+        for view in (self.indices, self.utilities, self.visits):
+            view.release()
+        self.mm.close()
+
+    ##
+    #probe
+    #Description: The slot that holds a category index, or the free slot it
+    #   would go in.
+    ##
+    def probe(self, index):
+        key = index + 1
+        mask = self.capacity - 1
+        slot = ((index * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        indices = self.indices
+        while True:
+            found = indices[slot]
+            if found == key or found == 0:
+                return slot
+            slot = (slot + 1) & mask
+
+    ##
+    #slot
+    #Description: The slot of a category index, making one (with a utility of
+    #   0.0) the first time it is seen.  That can grow the table, which moves
+    #   every slot and replaces the column views, so call it before reading
+    #   utilities or visits.
+    ##
+    def slot(self, index):
+        slot = self.slots.get(index)
+        if slot is not None:
+            return slot
+        slot = self.probe(index)
+        if self.indices[slot] == 0:
+            used = len(self) + 1
+            if used * 2 > self.capacity:
+                self.grow()
+                slot = self.probe(index)
+            self.indices[slot] = index + 1
+            TABLE_HEADER.pack_into(self.mm, 0, TABLE_MAGIC, self.capacity, used, *CATEGORY_RADICES)
+        self.slots[index] = slot
+        return slot
+
+    ##
+    #get
+    #Description: The utility of a category index, default if it has not been
+    #   seen.
+    ##
+    def get(self, index, default=0.0):
+        slot = self.slots.get(index)
+        if slot is None:
+            slot = self.probe(index)
+            if self.indices[slot] == 0:
+                return default
+            self.slots[index] = slot
+        return self.utilities[slot]
+
+    ##
+    #items
+    #Description: (category index, utility, visits) of every category seen.
+    ##
+    def items(self):
+        for slot in range(self.capacity):
+            if self.indices[slot]:
+                yield self.indices[slot] - 1, self.utilities[slot], self.visits[slot]
+
+    ##
+    #grow
+    #Description: Moves everything into a table twice the size.  A table kept
+    #   on disk is rebuilt next to the file and then replaces it.
+    ##
+    def grow(self):
+        old = (self.mm, self.indices, self.utilities, self.visits)
+        entries = list(self.items())
+        path = self.path
+        if path is not None:
+            self.path = path + ".grow"
+        self.attach(self.newMap(self.capacity * 2))
+        self.load(entries)
+        if path is not None:
+            self.mm.flush()
+            os.replace(self.path, path)
+            self.path = path
+        for view in old[1:]:
+            view.release()
+        old[0].close()
+
+    ##
+    #load
+    #Description: Adds utilities from a pickled table: the dict keyed by
+    #   category tuple older versions saved, or (index, utility, visits)
+    #   entries.
+    ##
+    def load(self, data):
+        if isinstance(data, dict):
+            data = [(categoryIndex(category), utility, 0) for category, utility in data.items()]
+        for index, utility, visits in data:
+            slot = self.slot(index)
+            self.utilities[slot] = utility
+            self.visits[slot] = visits
+
+    ##
+    #flush
+    #Description: Writes the changed pages back to the file, if changes are
+    #   kept.
+    ##
+    def flush(self):
+        if self.path is not None:
+            self.mm.flush()
+
+    ##
+    #close
+    #Description: Writes back the changes and, once everyone who opened the
+    #   table has closed it, unmaps it.
+    ##
+    def close(self):
+        self.flush()
+        self.users -= 1
+        if self.users > 0:
+            return
+        if self.path is not None and writableTables.get(self.path) is self:
+            del writableTables[self.path]
+        self.detach()
+
+
+# The tables open for writing in this process, by absolute path (see
+# UtilityTable.open)
+writableTables = {}
+
+
+# Ants that count toward combat power and threats
+COMBAT_TYPES = (SOLDIER, R_SOLDIER, DRONE)
+
+
+##
+#getBin
+#Description: The bin a value falls in: the first edge it is below, or past
+#   them all (the edges are in increasing order).
+##
+def getBin(value, bin):
+    return bisect_right(bin, value)
+
+
+##
+#CategoryContext
+#Description: What stateToCategory needs to know about a state, looked up
+#   once.  category() works out the category of the state itself, and
+#   successor() that of the state a move leads to (as getNextState would
+#   make it) by changing only what the move changes: where one ant is and
+#   what it carries, the food count, a new ant, or an enemy ant killed.
+#
+#Variables:
+#   ants - (type, coords, carrying) of each ant of the player to move
+#   enemyCombat - the enemy's combat ants
+#   enemyQueen - the enemy's queen (None if there is none)
+##
+class CategoryContext(object):
+    def __init__(self, state):
+        self.state = state
+        self.me = state.whoseTurn
+        self.myInv = getCurrPlayerInventory(state)
+        enemyInv = getEnemyInv(None, state)
+        self.myFood = self.myInv.foodCount
+        self.enemyFood = enemyInv.foodCount
+        self.myAnts = list(self.myInv.ants)
+        self.ants = [(ant.type, ant.coords, ant.carrying) for ant in self.myAnts]
+        self.enemyCombat = [ant for ant in enemyInv.ants if ant.type in COMBAT_TYPES]
+        self.enemyQueen = enemyInv.getQueen()
+        self.queenHP = self.myInv.getQueen().health
+        self.hill = self.myInv.getAnthill()
+        self.tunnels = self.myInv.getTunnels()
+        self.foodLocations = getConstrList(state, None, (FOOD,))
+
+    ##
+    #successor
+    #Description: The category of the state after a move.
+    ##
+    def successor(self, move):
+        if move.moveType == BUILD and move.buildType in (WORKER, DRONE, SOLDIER, R_SOLDIER):
+            # the new ant appears on the anthill
+            ants = self.ants + [(move.buildType, self.hill.coords, False)]
+            return self.category(ants, self.myFood - UNIT_STATS[move.buildType][COST])
+        if move.moveType != MOVE_ANT:
+            return self.category()
+
+        start = move.coordList[0]
+        end = move.coordList[-1]
+        ant = self.state.getAntAt(start)
+        if ant is None or ant.player != self.me:
+            return self.category()
+
+        # drop food on the anthill or a tunnel, pick it up from food
+        food = self.myFood
+        carrying = ant.carrying
+        constr = self.state.getConstrAt(end)
+        if carrying and constr is not None and constr in self.myInv.constrs:
+            food += 1
+            carrying = False
+        if not carrying and ant.type == WORKER and constr is not None and constr.type == FOOD:
+            carrying = True
+        ants = list(self.ants)
+        ants[self.myAnts.index(ant)] = (ant.type, end, carrying)
+
+        # the first enemy in range is attacked, which only matters if it dies
+        enemyCombat = self.enemyCombat
+        enemyQueen = self.enemyQueen
+        for coord in listAttackable(end, UNIT_STATS[ant.type][RANGE]):
+            victim = self.state.getAntAt(coord)
+            if victim is not None and victim.player != self.me:
+                if victim.health <= UNIT_STATS[ant.type][ATTACK]:
+                    enemyCombat = [enemy for enemy in enemyCombat if enemy is not victim]
+                    if victim is enemyQueen:
+                        enemyQueen = None
+                break
+        return self.category(ants, food, enemyCombat, enemyQueen)
+
+    ##
+    #category
+    #Description: The category tuple (see AIPlayer.stateToCategory), for the
+    #   state or with some of it replaced.
+    ##
+    def category(self, ants=None, myFood=None, enemyCombat=None, enemyQueen=False):
+        if ants is None:
+            ants = self.ants
+        if myFood is None:
+            myFood = self.myFood
+        if enemyCombat is None:
+            enemyCombat = self.enemyCombat
+        if enemyQueen is False:
+            enemyQueen = self.enemyQueen
+        enemyFood = self.enemyFood
+
+        # --- Food ---
+        myFoodCat = getBin(myFood, FOOD_BINS)
+        enemyFoodCat = getBin(enemyFood, FOOD_BINS)
+        foodDiffCat = getBin(myFood - enemyFood, FOOD_DIFF_BINS)
+
+        # --- Combat ---
+        attackers = [coords for type, coords, carrying in ants if type in COMBAT_TYPES]
+        combatCat = getBin(len(attackers) - len(enemyCombat), COMBAT_DIFF_BINS)
+
+        # --- Workers ---
+        workers = [(coords, carrying) for type, coords, carrying in ants if type == WORKER]
+        workerCat = getBin(len(workers), WORKER_BINS)
+
+        # --- Queen HP ---
+        myQueenHPCat = getBin(self.queenHP, QUEEN_HP_BINS)
+
+        # --- Threats ---
+        queenCoords = None
+        for type, coords, carrying in ants:
+            if type == QUEEN:
+                queenCoords = coords
+                break
+        queenThreat = 0
+        hillThreat = 0
+        for a in enemyCombat:
+            if a.coords and queenCoords and approxDist(a.coords, queenCoords) <= 2:
+                queenThreat = 1
+            if a.coords and self.hill.coords and approxDist(a.coords, self.hill.coords) <= 2:
+                hillThreat = 1
+        queenThreatCat = getBin(queenThreat, THREAT_BINS)
+        hillThreatCat = getBin(hillThreat, THREAT_BINS)
+
+        # --- Worker distances for food efficiency ---
+        bestDistToFood = 999
+        bestDistToDropoff = 999
+        for coords, carrying in workers:
+            if not coords:
+                continue
+            if not carrying:
+                # Worker going to nearest food
+                for food in self.foodLocations:
+                    bestDistToFood = min(bestDistToFood, approxDist(coords, food.coords))
+            else:
+                # Worker carrying food → nearest drop-off (anthill or tunnel)
+                dHill = approxDist(coords, self.hill.coords)
+                dTunnel = approxDist(coords, self.tunnels[0].coords) if self.tunnels else 999
+                bestDistToDropoff = min(bestDistToDropoff, dHill, dTunnel)
+        nearestFoodDistCat = getBin(bestDistToFood, NEAREST_FOOD_DIST_BINS)
+        nearestDropoffDistCat = getBin(bestDistToDropoff, NEAREST_DROPOFF_DIST_BINS)
+
+        # --- Game stage ---
+        gameProgress = max(myFood / 11.0, enemyFood / 11.0)
+        gameStageCat = getBin(gameProgress, GAME_STAGE_BINS)
+
+        # --- Attack distance to enemy queen ---
+        minAttackDist = 999
+        if enemyQueen is not None and enemyQueen.coords is not None:
+            for coords in attackers:
+                if coords:
+                    minAttackDist = min(minAttackDist, approxDist(coords, enemyQueen.coords))
+        attackDistCat = getBin(minAttackDist, ATTACK_DIST_BINS)
+
+        return (
+            myFoodCat,
+            enemyFoodCat,
+            foodDiffCat,
+            combatCat,
+            workerCat,
+            myQueenHPCat,
+            queenThreatCat,
+            hillThreatCat,
+            nearestFoodDistCat,
+            nearestDropoffDistCat,
+            attackDistCat,
+            gameStageCat,
+        )
 
 
 ##
@@ -27,19 +506,31 @@ class AIPlayer(Player):
     #
     #Parameters:
     #   inputPlayerId - The id to give the new player (int)
-    #   cpy           - whether the player is a copy (when playing itself)
+    #   tablePath     - the utility table file (TABLE_FILE unless given)
     ##
-    def __init__(self, inputPlayerId):
+    def __init__(self, inputPlayerId, tablePath=TABLE_FILE):
         super(AIPlayer,self).__init__(inputPlayerId, "HW6")
 
         self.train = False
         
-        # Dictionary to store how many times each category was visited
-        # Key = category tuple, Value = visit count (int)
-        self.categoryVisits = {}
-
-        # Track utility for each category (key = category tuple, value = float)
-        self.utilityTable = {}
+        # Track utility and visit count for each category (by categoryIndex).
+        # Only kept on disk when training.
+        self.utilityTable = UtilityTable.open(self.train, tablePath)
+
+        # What this player has learned, when it is being collected for a
+        # learner elsewhere (see Train.py): key = category index,
+        # value = [change in utility, visits].  None when not collected.
+        self.learned = None
+
+        # The (category index, reward) of each move this game, when it is
+        # being recorded: a list, else None.  Written to experienceLog (an
+        # ExperienceWriter) at the end of each game, if there is one; Train.py
+        # collects it itself.
+        self.episode = None
+        self.experienceLog = None
+        if self.train:
+            self.episode = []
+            self.experienceLog = ExperienceWriter(EXPERIENCE_FILE)
 
         # Stores the previous state for Bellman Equation
         self.prevState = None
@@ -49,22 +540,27 @@ class AIPlayer(Player):
         self.epsilonDecay = 0.99 # decay factor per move
         self.epsilonMin = 0.05   # minimum exploration
 
-        # Stores eligibility traces for visited categories
-        self.eligibility = {}  # key = category tuple, value = trace value
+        # Stores eligibility traces for visited categories.  A trace is 1.0
+        # when its category is visited and decays by lambda_ every move after,
+        # so only the move it was last visited on is kept: its trace is
+        # lambda_ ** (traceStep - visited).  Kept oldest visit first.
+        self.eligibility = OrderedDict()  # key = category index, value = move last visited
         self.lambda_ = 0.8     # decay factor for eligibility traces
+        self.traceStep = 0     # moves made so far
+        self.traceMin = 0.01   # traces smaller than this are dropped
+        self.compactEvery = 64 # how often (in moves) dropped traces are removed
+        # trace by age, up to the oldest one still big enough to keep
+        maxAge = int(math.log(self.traceMin) / math.log(self.lambda_))
+        self.tracePowers = [self.lambda_ ** age for age in range(maxAge + 1)]
 
-        # Load learning if file exists
-        import os
-        if os.path.exists("utility_table.pkl"):
-            with open("utility_table.pkl", "rb") as f:
-                self.utilityTable = pickle.load(f)
-            print("Loaded utility table from file")
 
-
-    def saveLearning(self, filename="utility_table.pkl"):
-        with open(filename, "wb") as f:
-            pickle.dump(self.utilityTable, f)
-        print(f"Utility table saved to {filename}")
+    ##
+    #saveLearning
+    #Description: Writes what changed in the utility table since the last
+    #   save back to its file.
+    ##
+    def saveLearning(self):
+        self.utilityTable.flush()
     
 
     ##
@@ -102,7 +598,7 @@ class AIPlayer(Player):
                     break
             #If one or more of the corners are covered pick a random spot
             while len(foodSpots) < 2:
-                coord = (random.randint(0, 9), random.randint(6, 9))
+                coord = (self.random.randint(0, 9), self.random.randint(6, 9))
                 if legalCoord(coord) and getConstrAt(currentState, coord) is None and coord not in foodSpots:
                     foodSpots.append(coord)
 
@@ -119,27 +615,27 @@ class AIPlayer(Player):
     #
     ##
     def getMove(self, currentState):
-        category = self.stateToCategory(currentState)
+        category = self.stateToIndex(currentState)
 
-        # Increment trace for the current state
-        self.eligibility[category] = 1.0
+        # --- Initialize utility if first visit ---
+        slot = self.utilityTable.slot(category)
 
-        # Decay all other traces
-        for s in list(self.eligibility.keys()):
-            if s != category:
-                self.eligibility[s] *= self.lambda_
-            # Remove tiny traces to save space
-            if self.eligibility[s] < 0.01:
-                del self.eligibility[s]
+        # Decay all traces by moving the clock on, and set the trace for
+        # the current state back to 1.0
+        self.traceStep += 1
+        self.eligibility[category] = self.traceStep
+        self.eligibility.move_to_end(category)
 
-        # Increment visits
-        self.categoryVisits[category] = self.categoryVisits.get(category, 0) + 1
-        if category not in self.utilityTable:
-            self.utilityTable[category] = 0.0
+        # Remove tiny traces to save space
+        if self.traceStep % self.compactEvery == 0:
+            self.compactTraces()
 
-        # --- Initialize utility if first visit ---
-        if category not in self.utilityTable:
-            self.utilityTable[category] = 0.0
+        # Increment visits
+        self.utilityTable.visits[slot] += 1
+        if self.learned is not None:
+            self.learned.setdefault(category, [0.0, 0])[1] += 1
+        if self.episode is not None:
+            self.episode.append((category, self.reward(currentState)))
 
         # TD update if we have a previous state
         if self.prevState is not None:
@@ -151,21 +647,20 @@ class AIPlayer(Player):
         # --- GLIE: epsilon-greedy action selection ---
         legalMoves = listAllLegalMoves(currentState)
         legalMoves = self.filterLegalMoves(currentState, legalMoves)  # <-- filter workers
-        takeRandom = random.random() < self.epsilon
+        takeRandom = self.random.random() < self.epsilon
 
         if takeRandom:
-            chosenMove = random.choice(legalMoves)  # explore
+            chosenMove = self.random.choice(legalMoves)  # explore
         else:
             # exploit: pick move leading to highest expected utility
             bestMove = None
             bestUtility = -float("inf")
-            for move in legalMoves:
-                # simulate the move
-                moveUtility = self.estimateMoveUtility(currentState, move)
+            moveUtilities = self.estimateMoveUtilities(currentState, legalMoves)
+            for move, moveUtility in zip(legalMoves, moveUtilities):
                 if moveUtility > bestUtility:
                     bestUtility = moveUtility
                     bestMove = move
-            chosenMove = bestMove if bestMove is not None else random.choice(legalMoves)
+            chosenMove = bestMove if bestMove is not None else self.random.choice(legalMoves)
 
         # Decay epsilon (GLIE)
         self.epsilon = max(self.epsilonMin, self.epsilon * self.epsilonDecay)
@@ -211,11 +706,33 @@ class AIPlayer(Player):
         # Simulate the result of making the move
         simulatedState = getNextState(currentState, move)
 
-        # Convert the simulated state to a category
-        s_category = self.stateToCategory(simulatedState)
+        # Look up the utility value for its category in the utility table
+        return self.utilityTable.get(self.stateToIndex(simulatedState))
 
-        # Look up the utility value for that category in the utility table
-        return self.utilityTable.get(s_category, 0.0)
+    def estimateMoveUtilities(self, currentState, moves):
+        """
+        The batched form of estimateMoveUtility: the utility of each move,
+        in order.  The state is looked over once, each move's category is
+        worked out from what that move changes, and moves that end the same
+        ant in the same place, or lead to a category already looked up,
+        are not worked out again.
+        """
+        context = CategoryContext(currentState)
+        byEnd = {}
+        byCategory = {}
+        utilities = []
+        for move in moves:
+            key = (move.coordList[0], move.coordList[-1]) if move.moveType == MOVE_ANT else None
+            utility = byEnd.get(key) if key is not None else None
+            if utility is None:
+                index = categoryIndex(context.successor(move))
+                utility = byCategory.get(index)
+                if utility is None:
+                    utility = byCategory[index] = self.utilityTable.get(index)
+                if key is not None:
+                    byEnd[key] = utility
+            utilities.append(utility)
+        return utilities
 
     
     ##
@@ -233,6 +750,9 @@ class AIPlayer(Player):
     #
     def registerWin(self, hasWon):
         self.prevState = None
+        if self.experienceLog is not None:
+            self.experienceLog.episode(self.episode, 1.0 if hasWon else -1.0)
+            self.episode = []
         if self.train:
             self.saveLearning()  # saves utilityTable to file
 
@@ -256,155 +776,63 @@ class AIPlayer(Player):
         prevState = s
         currentState  = s'
         """
-        s_prime = self.stateToCategory(currentState)
-        U_s_prime = self.utilityTable.get(s_prime, 0)
+        s_prime = self.stateToIndex(currentState)
+        U_s_prime = self.utilityTable.get(s_prime)
         
         # TD error for this transition
-        U_prev = self.utilityTable.get(self.stateToCategory(prevState), 0)
+        U_prev = self.utilityTable.get(self.stateToIndex(prevState))
         delta = self.reward(prevState) + discount * U_s_prime - U_prev
 
-        for s, e_s in self.eligibility.items():
-            U_s = self.utilityTable.get(s, 0)
-            self.utilityTable[s] = U_s + alpha * delta * e_s
-
-
-    def stateToCategory(self, state):
-        def getBin(value, bin):
-            for i, b, in enumerate(bin):
-                if value < b:
-                    return i
-            return len(bin)
-    
-        # --- BINS ---
-        foodBin = [0, 2, 4, 6, 8, 10, 11] # Absolute food bins (for AI and enemy)
-        foodDiffBin = [-6, -3, -1, 0, 1, 3, 6] # Relative food difference bins
-        combatDiffBin = [-3, -1, 0, 1, 3] # Combat power difference bins
-        workerBin = [0, 1, 2] # Worker count bins
-        queenHPBin = [0.25, 0.5, 0.75, 1.01] # Queen HP bins (0–1 normalized)
-        threatBin = [0, 2] # Threat bins (queen/hill)
-        nearestFoodDistBin = [0, 1, 2, 4, 6] # Nearest food distance bins
-        nearestDropoffDistBin = [0, 1, 2, 4, 6] # Nearest drop off location distance bins
-        attackDistBin = [0, 1, 2, 3, 5, 7, 10]  # distance bins for attacking ants to enemy queen
-        gameStageBins = [0.15, 0.35, 0.6, 0.85] # Stage of the game based on food count
-
-        myInv = getCurrPlayerInventory(state)
-        enemyInv = getEnemyInv(self, state)
-
-        # --- Food ---
-        myFood = myInv.foodCount
-        enemyFood = enemyInv.foodCount
-        myFoodCat = getBin(myFood, foodBin)
-        enemyFoodCat = getBin(enemyFood, foodBin)
-        foodDiff = myFood - enemyFood
-        foodDiffCat = getBin(foodDiff, foodDiffBin)
-
-        # --- Combat ---
-        def combatPower(inv):
-            power = 0
-            for a in inv.ants:
-                if a.type == SOLDIER:
-                    power += 1
-                elif a.type == R_SOLDIER:
-                    power += 1  
-                elif a.type == DRONE:
-                    power += 1
-            return power
-
-        combatDiff = combatPower(myInv) - combatPower(enemyInv)
-        combatCat = getBin(combatDiff, combatDiffBin)
-        
-        # --- Workers ---
-        myWorkers = getAntList(state, state.whoseTurn, (WORKER,))
-        numWorkers = len(myWorkers)
-        workerCat = getBin(numWorkers, workerBin)
-
-        # --- Queen HP ---
-        myQueen = myInv.getQueen()
-        myQueenHP = myQueen.health
-        myQueenHPCat = getBin(myQueenHP, queenHPBin)
-
-        # --- Threats ---
-        enemyAnts = enemyInv.ants
-        queenThreat = 0
-        hillThreat = 0
-
-        hill = myInv.getAnthill()
-
-        for a in enemyAnts:
-            if a.type in (SOLDIER, R_SOLDIER, DRONE):
-                if a.coords and myQueen.coords and approxDist(a.coords, myQueen.coords) <= 2:
-                    queenThreat = 1
-                if a.coords and hill.coords and approxDist(a.coords, hill.coords) <= 2:
-                    hillThreat = 1
-
-        queenThreatCat = getBin(queenThreat, threatBin)
-        hillThreatCat = getBin(hillThreat, threatBin)
-
-        # --- Worker distances for food efficiency ---
-        foodLocations = getConstrList(state, None, (FOOD,))
-        tunnel = myInv.getTunnels()
-
-        bestDistToFood = 999
-        bestDistToDropoff = 999
+        # U += alpha * delta * E, over the categories with live traces
+        table = self.utilityTable
+        step = alpha * delta
+        for s, e_s in self.traces():
+            # slot first: it can grow the table, replacing table.utilities
+            slot = table.slot(s)
+            table.utilities[slot] += step * e_s
+            if self.learned is not None:
+                self.learned.setdefault(s, [0.0, 0])[0] += step * e_s
 
-        for w in myWorkers:
-            if not w.coords:
-                continue
-            if not w.carrying:
-                # Worker going to nearest food
-                for food in foodLocations:
-                    d = approxDist(w.coords, food.coords)
-                    bestDistToFood = min(bestDistToFood, d)
-            else:
-                # Worker carrying food → nearest drop-off (anthill or tunnel)
-                dHill = approxDist(w.coords, hill.coords)
-                dTunnel = approxDist(w.coords, tunnel[0].coords) if tunnel else 999
-                bestDistToDropoff = min(bestDistToDropoff, dHill, dTunnel)
-
-        # Ensure distances default to max if no workers
-        nearestFoodDistCat = getBin(bestDistToFood, nearestFoodDistBin)
-        nearestDropoffDistCat = getBin(bestDistToDropoff, nearestDropoffDistBin)
-
-        # ---------- GAME STAGE ----------
-        myProgress = myInv.foodCount / 11.0
-        enemyProgress = enemyInv.foodCount / 11.0
-        
-        gameProgress = max(myProgress, enemyProgress)
-        gameStageCat = getBin(gameProgress, gameStageBins)
-
-        # --- Attack distance to enemy queen ---
-        # --- Attack distance to enemy queen ---
-        enemyQueen = enemyInv.getQueen()
-        attackingAnts = getAntList(state, state.whoseTurn, (SOLDIER, R_SOLDIER, DRONE))
+    ##
+    #traces
+    #Description: The categories whose traces are still big enough to count,
+    #   most recently visited first, with their traces.  Stops at the first
+    #   one too old, so the cost doesn't depend on how many are waiting to be
+    #   compacted away.
+    ##
+    def traces(self):
+        for s in reversed(self.eligibility):
+            age = self.traceStep - self.eligibility[s]
+            if age >= len(self.tracePowers):
+                return
+            yield s, self.tracePowers[age]
 
-        minAttackDist = 999  # large number initially
-        if enemyQueen is not None and enemyQueen.coords is not None:
-            for a in attackingAnts:
-                if a.coords:
-                    d = approxDist(a.coords, enemyQueen.coords)
-                    if d < minAttackDist:
-                        minAttackDist = d
-        else:
-            # No enemy queen → keep minAttackDist high
-            minAttackDist = 999
+    ##
+    #compactTraces
+    #Description: Removes the traces that have decayed below traceMin.
+    ##
+    def compactTraces(self):
+        while self.eligibility:
+            s = next(iter(self.eligibility))
+            if self.traceStep - self.eligibility[s] < len(self.tracePowers):
+                break
+            del self.eligibility[s]
 
-        # Bin the distance
-        attackDistCat = getBin(minAttackDist, attackDistBin)
 
-        # --- Return tuple ---
-        category = (
-            myFoodCat,
-            enemyFoodCat,
-            foodDiffCat,
-            combatCat,
-            workerCat,
-            myQueenHPCat,
-            queenThreatCat,
-            hillThreatCat,
-            nearestFoodDistCat,
-            nearestDropoffDistCat,
-            attackDistCat,
-            gameStageCat,
-        )
+    ##
+    #stateToIndex
+    #Description: The category of a state as an int (see categoryIndex).
+    ##
+    def stateToIndex(self, state):
+        return categoryIndex(self.stateToCategory(state))
 
-        return category
+    ##
+    #stateToCategory
+    #Description: Sums a state up as a tuple of bin numbers: food (mine, the
+    #   enemy's and the difference), combat power difference, workers, queen
+    #   HP, threats to the queen and anthill, worker distances to food and to
+    #   a drop-off, attack distance to the enemy queen and game stage.  See
+    #   CategoryContext.category.
+    ##
+    def stateToCategory(self, state):
+        return CategoryContext(state).category()
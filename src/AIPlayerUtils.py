@@ -1,8 +1,10 @@
 import random
+import heapq
 from Constants import *
 from Ant import *
 from Construction import *
 from Move import *
+from GameState import listAttackable
 
 #
 # AIPlayerUtils.py
@@ -15,6 +17,13 @@ from Move import *
 # these routines safe for a GameState that has been generated via the
 # GameState.fastclone method.
 #
+# getAntAt and getConstrAt read the GameState's occupancy index.  Code that
+# moves, adds or removes ants in a GameState should use GameState.moveAnt,
+# addAnt and removeAnt so that the index stays current.
+#
+# Distances and paths are based on the game's Terrain (see getTerrain), which
+# is computed once from the constructions and ignores ants.
+#
 
 ##
 # legalCoord
@@ -114,15 +123,7 @@ def getConstrList(currentState,
 #
 # Return:  the construct at the coordinate or None if there is none
 def getConstrAt(state, coords):
-    #get a list of all constructs
-    allConstrs = getConstrList(state)
-
-    #search for one at the given coord
-    for constr in allConstrs:
-        if constr.coords == coords:
-            return constr
-
-    return None  #not found
+    return state.getConstrAt(coords)
 
 
 ##
@@ -136,15 +137,7 @@ def getConstrAt(state, coords):
 #
 # Return:  the ant at the coordinate or None if there is none
 def getAntAt(state, coords) -> Ant:
-    #get a list of all constructs
-    allAnts = getAntList(state)
-
-    #search for one at the given coord
-    for ant in allAnts:
-        if ant.coords == coords:
-            return ant
-
-    return None  #not found
+    return state.getAntAt(coords)
 
 
 ##
@@ -195,45 +188,14 @@ def listAdjacent(coord):
     if not legalCoord(coord):
         return []
 
-    #this set of coord deltas represent movement in each cardinal direction
-    deltas = [ (-1, 0), (1, 0), (0, -1), (0, 1) ]
-    x = coord[0]
-    y = coord[1]
-    result = []
-
-    #calculate the cost after making each move
-    for delta in deltas:
-        newX = delta[0] + coord[0]
-        newY = delta[1] + coord[1]
+    return list(ADJACENT_COORDS[coord[0]][coord[1]])
 
-        #skip illegal moves
-        if legalCoord((newX, newY)):
-            result.append((newX, newY))
-
-    return result
-
-##
-# listAttackable
-#
-# lists the attackable coordinates from a start coordinate and attack range
-# coordinates from a taxicab square around start
-#
-# coord - the coordinate of the attacking ant
-# dist - the attack range of the attacking ant
-def listAttackable(coord, dist = 1):
-    res = []
-
-    # goes L-R across board, offset by 1 for range()
-    for i in range(-dist, dist + 1):
-        # get allowed y variance given x variance
-        # offset by 1 for range()
-        yLen = dist - abs(i)
-        for j in range(-yLen, yLen + 1):
-            newCord = (coord[0] + i, coord[1] + j)
-            if legalCoord(newCord) and newCord != coord:
-                res.append(newCord)
-
-    return res
+#the legal neighbours of every cell, as interned coords (see BOARD_COORDS)
+#listed in the order: left, right, up, down
+ADJACENT_COORDS = [[tuple([BOARD_COORDS[x + dx][y + dy]
+                            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                            if legalCoord((x + dx, y + dy))])
+                     for y in range(BOARD_LENGTH)] for x in range(BOARD_LENGTH)]
 
 
 
@@ -267,22 +229,94 @@ def listReachableAdjacent(state, coords, movement, ignoresGrass = False):
     return candMoves
 
 ##
-# listAllMovementPaths              <!-- RECURSIVE -->
+# listAllMovementPaths
 #
-# calculates all the legal paths for a single ant to move from a given position.
+# calculates the legal paths for a single ant to move from a given position.
 # The ant doesn't actually have to be there for this method to return a valid
-# answer.  This method does not take queen ant movement restrictions
-# into account.
+# answer.
+#
+# By default this runs a Dijkstra search over movement cost bounded by the
+# ant's movement points and returns one cheapest path to each reachable cell,
+# since every path that ends on the same cell has the same outcome.  The
+# exhaustive mode returns every distinct path instead, as older versions did.
 #
 # Parameters:
 #    currentState - current game state
 #    coords       - where the ant is
 #    movement     - movement points ant has remaining
+#    ignoresGrass - if grass costs the same as open ground
+#    isQueen      - if the path must stay inside the queen's territory
+#    exhaustive   - if every path should be listed, not one per destination
 #
 # Return: a list of lists of coords (tuples). Each sub-list of tuples is an
-# acceptable set of coords for a Move object
-# TODO: I think this method could be sped up to improve computation time
-def listAllMovementPaths(currentState, coords, movement, ignoresGrass = False):
+# acceptable set of coords for a Move object.  The zero-step path [coords]
+# comes last.
+def listAllMovementPaths(currentState, coords, movement, ignoresGrass = False,
+                         isQueen = False, exhaustive = False):
+    if exhaustive:
+        paths = listAllMovementPathsExhaustive(currentState, coords, movement, ignoresGrass)
+        if isQueen:
+            paths = [path for path in paths if isPathOkForQueen(path)]
+        return paths
+
+    if movement <= 0 or (isQueen and not isPathOkForQueen([coords])):
+        return []
+    if not legalCoord(coords):
+        return [[coords]]
+
+    #cheapest known cost and predecessor of every cell reached so far
+    costs = { coords : 0 }
+    parents = { coords : None }
+    queue = [ (0, coords) ]
+    while queue:
+        cost, cell = heapq.heappop(queue)
+        if cost > costs[cell]:
+            continue
+        for nextCell in ADJACENT_COORDS[cell[0]][cell[1]]:
+            if currentState.getAntAt(nextCell) is not None:
+                continue
+            if isQueen and not isPathOkForQueen([nextCell]):
+                continue
+            nextCost = cost + 1
+            if not ignoresGrass:
+                constr = currentState.getConstrAt(nextCell)
+                if constr is not None:
+                    nextCost = cost + CONSTR_STATS[constr.type][MOVE_COST]
+            if nextCost <= movement and (nextCell not in costs or nextCost < costs[nextCell]):
+                costs[nextCell] = nextCost
+                parents[nextCell] = cell
+                heapq.heappush(queue, (nextCost, nextCell))
+
+    #walk back from each destination to build its path
+    validMoves = []
+    for cell in parents:
+        if cell == coords:
+            continue
+        path = [cell]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        validMoves.append(path)
+
+    #Append the zero-step move (used to activate attack on adjacent foe)
+    validMoves.append([coords])
+    return validMoves
+
+
+##
+# listAllMovementPathsExhaustive              <!-- RECURSIVE -->
+#
+# lists every distinct legal path for a single ant (see listAllMovementPaths).
+# Many of them end on the same cell.  This method does not take queen ant
+# movement restrictions into account.
+#
+# Parameters:
+#    currentState - current game state
+#    coords       - where the ant is
+#    movement     - movement points ant has remaining
+#
+# Return: a list of lists of coords (tuples)
+def listAllMovementPathsExhaustive(currentState, coords, movement, ignoresGrass = False):
     #base case: ant can't move any further
     if (movement <= 0): return []
 
@@ -305,7 +339,7 @@ def listAllMovementPaths(currentState, coords, movement, ignoresGrass = False):
             cost = CONSTR_STATS[constrAtDest.type][MOVE_COST]
 
         #get a list of all moves that will extend this one
-        extensions = listAllMovementPaths(currentState, moveCoords, movement - cost, ignoresGrass)
+        extensions = listAllMovementPathsExhaustive(currentState, moveCoords, movement - cost, ignoresGrass)
 
         #create new moves by adding each extension to the base move
         for ext in extensions:
@@ -320,11 +354,28 @@ def listAllMovementPaths(currentState, coords, movement, ignoresGrass = False):
     return validMoves
 
 
+##
+# getTerrain
+#
+# returns the Terrain of a state: the movement cost of every cell and the
+# all-pairs shortest distances, for ants that respect grass and ants that
+# ignore it.  It is computed once per set of constructions, so after the
+# first call this is a lookup.
+#
+#Parameters:
+#   currentState   - The state of the game (GameState)
+#
+# Return: a Terrain object (see Terrain.py)
+def getTerrain(currentState):
+    return currentState.getTerrain()
+
+
 ##
 # stepsToReach
 #
 # calculates the shortest distance between two cells taking
-# movement costs into account.
+# movement costs into account.  Ants are ignored.  This is a lookup in the
+# state's Terrain.
 #
 #Parameters:
 #   currentState   - The state of the game (GameState)
@@ -337,41 +388,7 @@ def stepsToReach(currentState, src, dst):
     if (not legalCoord(src)): return -1
     if (not legalCoord(dst)): return -1
 
-    #a dictionary of already visted cells and the corresponding cost to reach
-    visited = { src : 0 }
-    #a list of to be processed cells
-    queue = [ src ]
-
-    #this loops processes cells in the queue until it is empty
-    while(len(queue) > 0):
-        cell = queue.pop(0)
-
-        #if this cell is our destination we are done
-        if (cell == dst):
-            return visited[cell]
-
-        #calc distance to all cells adj to this one assuming we reach them
-        #from this one
-        nextSteps = listAdjacent(cell)
-        for newCell in nextSteps:
-            constrAtDest = getConstrAt(currentState, newCell)
-            cost = 1  #default
-            if constrAtDest != None:
-                cost = CONSTR_STATS[constrAtDest.type][MOVE_COST]
-            dist = visited[cell] + cost
-
-            #if the new distance is best so far, update the visited dict
-            if (newCell in visited):
-                if (dist < visited[newCell]):
-                    visited[newCell] = dist
-            #if we've never seen this cell before also update dict and
-            #enqueue this new cell to be processed at a future loop iteration
-            else:
-                visited[newCell] = dist
-                queue.append(newCell)
-
-    #we should never reach this point
-    return -1
+    return currentState.getTerrain().distance(src, dst)
 
 
 ##
@@ -395,6 +412,10 @@ def approxDist(sourceCoords, targetCoords):
 # creates a legal path toward a destination.  This method does not verify that
 # the path is okay for a queen.
 #
+# Of the cells the ant can reach this turn (taking other ants into account),
+# the path ends on the one that is closest to the destination according to
+# the state's Terrain.
+#
 # Parameters:
 #   currentState - currentState of the game
 #   sourceCoords - starting position (an x,y coord)
@@ -410,7 +431,18 @@ def createPathToward(currentState, sourceCoords, targetCoords, movement):
         ignoresGrass = False
     else:
         ignoresGrass = UNIT_STATS[ant.type][IGNORES_GRASS]
-    return findPathRecursive(currentState, sourceCoords, targetCoords, movement, ignoresGrass)[0]
+    if not legalCoord(sourceCoords) or not legalCoord(targetCoords):
+        return findPathRecursive(currentState, sourceCoords, targetCoords, movement, ignoresGrass)[0]
+
+    terrain = currentState.getTerrain()
+    bestPath = [sourceCoords]
+    bestDist = terrain.distance(sourceCoords, targetCoords, ignoresGrass)
+    for path in listAllMovementPaths(currentState, sourceCoords, movement, ignoresGrass):
+        dist = terrain.distance(path[-1], targetCoords, ignoresGrass)
+        if dist < bestDist:
+            bestPath = path
+            bestDist = dist
+    return bestPath
 
 
 ##
@@ -484,7 +516,7 @@ def listAllBuildMoves(currentState):
 #
 # determines if a given path would move the ant outside of the home
 # territory.  The caller is responsible for providing a legal path.
-# This is a helper method for listAllMovementMoves
+# This is a helper method for listAllMovementPaths
 #
 #Parameters:
 #   path - the path to check
@@ -506,9 +538,11 @@ def isPathOkForQueen(path):
 #
 # Parameters:
 #   currentState - the current state
+#   exhaustive   - list every path rather than one per destination
+#                  (see listAllMovementPaths)
 #
 # Returns:  a list of Move objects
-def listAllMovementMoves(currentState):
+def listAllMovementMoves(currentState, exhaustive = False):
     result = []
 
     #first get all MOVE_ANT moves for each ant in the inventory
@@ -517,19 +551,14 @@ def listAllMovementMoves(currentState):
         #skip ants that have already moved
         if (ant.hasMoved): continue
 
-        #create a Move object for each valid movement path
+        #create a Move object for each valid movement path, keeping the
+        #queen inside her territory
         allPaths = listAllMovementPaths(currentState,
                                         ant.coords,
                                         UNIT_STATS[ant.type][MOVEMENT],
-                                        UNIT_STATS[ant.type][IGNORES_GRASS])
-
-        #remove moves that take the queen out of her territory
-        if (ant.type == QUEEN):
-            tmpList = []
-            for path in allPaths:
-                if (isPathOkForQueen(path)):
-                    tmpList.append(path)
-            allPaths = tmpList
+                                        UNIT_STATS[ant.type][IGNORES_GRASS],
+                                        ant.type == QUEEN,
+                                        exhaustive)
 
         #construct the list of moves using the paths
         for path in allPaths:
@@ -546,17 +575,164 @@ def listAllMovementMoves(currentState):
 #
 # Parameters:
 #   currentState - the current state
+#   exhaustive   - list every movement path rather than one per destination
+#                  (see listAllMovementPaths)
 #
 # Returns:  a list of Move objects
-def listAllLegalMoves(currentState):
+def listAllLegalMoves(currentState, exhaustive = False):
     result = []
-    result.extend(listAllMovementMoves(currentState))
+    result.extend(listAllMovementMoves(currentState, exhaustive))
     result.extend(listAllBuildMoves(currentState))
     result.append(Move(END, None, None))
     return result
 
 
 
+##
+# iterLegalMoves
+#
+# yields the legal moves of the player whose turn it is, one at a time.  Moves
+# are only created as they are needed, so a caller that stops early (a cutoff
+# in alpha-beta, an epsilon-greedy pick) does not pay for the rest; in
+# particular an ant's movement paths are only computed when one of its moves
+# is reached.
+#
+# With no order the moves come out exactly as listAllLegalMoves returns them.
+# Otherwise the categories named in order come first, in that order, and then
+# all remaining moves in the default order.  Every legal move is yielded
+# exactly once, in the first category it matches.  The categories are:
+#   "captures" - moves that end in attack range of an enemy ant or on the
+#                enemy anthill
+#   "builds"   - BUILD moves
+#   "workers"  - worker moves that get closer to food (or, when carrying, to
+#                the anthill or a tunnel)
+#   "moves"    - all MOVE_ANT moves
+#   "end"      - the END move
+# An entry of order may also be a function f(state, move) returning True for
+# the moves it wants first.
+#
+# Parameters:
+#   currentState - the current state
+#   order        - a sequence of categories (see above)
+#   exhaustive   - list every movement path rather than one per destination
+#                  (see listAllMovementPaths)
+#
+# Returns:  a generator of Move objects
+def iterLegalMoves(currentState, order = (), exhaustive = False):
+    myInv = getCurrPlayerInventory(currentState)
+    ants = [ant for ant in myInv.ants if not ant.hasMoved]
+    #per ant movement moves and the build moves, made on first use
+    antMoves = {}
+    buildMoves = []
+    endMove = Move(END, None, None)
+
+    def candidates(moveType, antTypes):
+        if moveType is None or moveType == MOVE_ANT:
+            for ant in ants:
+                if antTypes is not None and ant.type not in antTypes:
+                    continue
+                if id(ant) not in antMoves:
+                    paths = listAllMovementPaths(currentState, ant.coords,
+                                                 UNIT_STATS[ant.type][MOVEMENT],
+                                                 UNIT_STATS[ant.type][IGNORES_GRASS],
+                                                 ant.type == QUEEN, exhaustive)
+                    antMoves[id(ant)] = [Move(MOVE_ANT, path, None) for path in paths]
+                for move in antMoves[id(ant)]:
+                    yield move, ant
+        if moveType is None or moveType == BUILD:
+            if not buildMoves:
+                buildMoves.extend(listAllBuildMoves(currentState))
+            for move in buildMoves:
+                yield move, None
+        if moveType is None or moveType == END:
+            yield endMove, None
+
+    def matches(category, move, ant):
+        moveType, antTypes, test = category
+        if moveType is not None and move.moveType != moveType:
+            return False
+        if antTypes is not None and (ant is None or ant.type not in antTypes):
+            return False
+        return test is None or test(currentState, move)
+
+    categories = []
+    for entry in order:
+        if callable(entry):
+            categories.append((None, None, entry))
+        else:
+            categories.append(MOVE_CATEGORIES[entry])
+    #everything that is left, in the default order
+    categories.append((None, None, None))
+
+    for index in range(len(categories)):
+        moveType, antTypes, test = categories[index]
+        earlier = categories[:index]
+        for move, ant in candidates(moveType, antTypes):
+            if test is not None and not test(currentState, move):
+                continue
+            if any([matches(category, move, ant) for category in earlier]):
+                continue
+            yield move
+
+
+##
+# isCaptureMove
+#
+# determines if a MOVE_ANT move ends in attack range of an enemy ant or on
+# the enemy anthill (the "captures" category of iterLegalMoves)
+#
+# Return: True or False
+def isCaptureMove(currentState, move):
+    ant = getAntAt(currentState, move.coordList[0])
+    if ant is None:
+        return False
+    end = move.coordList[-1]
+    enemyHill = currentState.inventories[1 - ant.player].getAnthill()
+    if enemyHill is not None and enemyHill.coords == end:
+        return True
+    if ant.type == WORKER:
+        return False
+    for coord in listAttackable(end, UNIT_STATS[ant.type][RANGE]):
+        foundAnt = getAntAt(currentState, coord)
+        if foundAnt is not None and foundAnt.player != ant.player:
+            return True
+    return False
+
+
+##
+# isWorkerProgressMove
+#
+# determines if a worker's MOVE_ANT move gets it closer to food or, if it is
+# carrying, to its anthill or a tunnel (the "workers" category of
+# iterLegalMoves)
+#
+# Return: True or False
+def isWorkerProgressMove(currentState, move):
+    ant = getAntAt(currentState, move.coordList[0])
+    if ant is None or ant.type != WORKER:
+        return False
+    if ant.carrying:
+        goals = [constr.coords for constr in getConstrList(currentState, ant.player, (ANTHILL, TUNNEL))]
+    else:
+        goals = [constr.coords for constr in getConstrList(currentState, None, (FOOD,))]
+    if not goals:
+        return False
+    terrain = currentState.getTerrain()
+    start = min([terrain.distance(ant.coords, goal) for goal in goals])
+    end = min([terrain.distance(move.coordList[-1], goal) for goal in goals])
+    return end < start
+
+
+#the named categories of iterLegalMoves as (move type, ant types, test)
+MOVE_CATEGORIES = {
+    "captures" : (MOVE_ANT, None, isCaptureMove),
+    "builds" : (BUILD, None, None),
+    "workers" : (MOVE_ANT, (WORKER,), isWorkerProgressMove),
+    "moves" : (MOVE_ANT, None, None),
+    "end" : (END, None, None),
+}
+
+
 ##
 # Return: a reference to the inventory of the player whose turn it is
 def getCurrPlayerInventory(currentState):
@@ -617,6 +793,13 @@ def getEnemyInv(self, currentState):
 # into consideration, MOVE_ANT commands do not cause the hasMoved property of
 # the ant to change to True.  Furthermore the END move type is ignored.
 #
+# The move is made on the packed form of the state (see GameState.nextState),
+# which is cheapest when currentState is itself a result of getNextState or
+# fastclone whose board and inventories have not been used: a state that has
+# been unpacked must be packed again first, which takes several times as long
+# as the move.  Searches that visit many nodes should use GameState.applyMove and
+# GameState.undoMove, which do neither.
+#
 # Parameters:
 #   currentState - A clone of the current state (GameState)
 #   move - The move that the agent would take (Move)
@@ -624,70 +807,12 @@ def getEnemyInv(self, currentState):
 # Return: A clone of what the state would look like if the move was made
 ##
 def getNextState(currentState, move):
-    # variables I will need
-    myGameState = currentState.fastclone()
-    myInv = getCurrPlayerInventory(myGameState)
-    me = myGameState.whoseTurn
-    myAnts = myInv.ants
-    myTunnels = myInv.getTunnels()
-    myAntHill = myInv.getAnthill()
+    # ants are no longer allowed to build tunnels, so this is an error
+    if move.moveType == BUILD and move.buildType == TUNNEL:
+        print("Attempted tunnel build in getNextState()")
+        return currentState
 
-    # If enemy ant is on my anthill or tunnel update capture health
-    ant = getAntAt(myGameState, myAntHill.coords)
-    if ant is not None:
-        if ant.player != me:
-            myAntHill.captureHealth -= 1
-
-    # If an ant is built update list of ants
-    antTypes = [WORKER, DRONE, SOLDIER, R_SOLDIER]
-    if move.moveType == BUILD:
-        if move.buildType in antTypes:
-            ant = Ant(myInv.getAnthill().coords, move.buildType, me)
-            myInv.ants.append(ant)
-            # Update food count depending on ant built
-            myInv.foodCount -= UNIT_STATS[move.buildType][COST]
-        # ants are no longer allowed to build tunnels, so this is an error
-        elif move.buildType == TUNNEL:
-            print("Attempted tunnel build in getNextState()")
-            return currentState
-
-    # If an ant is moved update their coordinates and has moved
-    elif move.moveType == MOVE_ANT:
-        newCoord = move.coordList[-1]
-        startingCoord = move.coordList[0]
-        for ant in myAnts:
-            if ant.coords == startingCoord:
-                ant.coords = newCoord
-                # TODO: should this be set true? Design decision
-                ant.hasMoved = False
-                # If an ant is carrying food and ends on the anthill or tunnel drop the food
-                if ant.carrying and ant.coords == myInv.getAnthill().coords:
-                    myInv.foodCount += 1
-                    ant.carrying = False
-                for tunnels in myTunnels:
-                    if ant.carrying and (ant.coords == tunnels.coords):
-                        myInv.foodCount += 1
-                        ant.carrying = False
-                # If an ant doesn't have food and ends on the food grab food
-                if not ant.carrying and ant.type == WORKER:
-                    foods = getConstrList(myGameState, 2, [FOOD])
-                    for food in foods:
-                        if food.coords == ant.coords:
-                            ant.carrying = True
-                # If my ant is close to an enemy ant attack it
-                attackable = listAttackable(ant.coords, UNIT_STATS[ant.type][RANGE])
-                for coord in attackable:
-                    foundAnt = getAntAt(myGameState, coord)
-                    if foundAnt is not None:  # If ant is adjacent my ant
-                        if foundAnt.player != me:  # if the ant is not me
-                            foundAnt.health = foundAnt.health - UNIT_STATS[ant.type][ATTACK]  # attack
-                            # If an enemy is attacked and looses all its health remove it from the other players
-                            # inventory
-                            if foundAnt.health <= 0:
-                                myGameState.inventories[1 - me].ants.remove(foundAnt)
-                            # If attacked an ant already don't attack any more
-                            break
-    return myGameState
+    return currentState.nextState(move, False)
 
 ##
 # getNextStateAdversarial
@@ -695,6 +820,10 @@ def getNextState(currentState, move):
 # Description: This is the same as getNextState (above) except that it properly
 # updates the hasMoved property on ants and the END move is processed correctly.
 #
+# Searches that visit many nodes can avoid the clone by using
+# GameState.applyMove and GameState.undoMove, which follow the same rules
+# but modify the state in place.
+#
 # Parameters:
 #   currentState - A clone of the current state (GameState)
 #   move - The move that the agent would take (Move)
@@ -702,22 +831,59 @@ def getNextState(currentState, move):
 # Return: A clone of what the state would look like if the move was made
 ##
 def getNextStateAdversarial(currentState, move):
-    # variables I will need
-    nextState = getNextState(currentState, move)
-    myInv = getCurrPlayerInventory(nextState)
-    myAnts = myInv.ants
+    # ants are no longer allowed to build tunnels, so this is an error
+    if move.moveType == BUILD and move.buildType == TUNNEL:
+        print("Attempted tunnel build in getNextState()")
+        return currentState
+
+    return currentState.nextState(move)
+
 
-    # If an ant is moved update their coordinates and has moved
-    if move.moveType == MOVE_ANT:
-        startingCoord = move.coordList[-1]
-        for ant in myAnts:
-            if ant.coords == startingCoord:
-                ant.hasMoved = True
-    elif move.moveType == END:
-        for ant in myAnts:
-            ant.hasMoved = False
-        nextState.whoseTurn = 1 - currentState.whoseTurn
-    return nextState
+##
+# getNextStates
+#
+# Description: The batched form of getNextState: returns the state after each
+# of the given moves.  The work that only depends on currentState is done
+# once and each result only copies the objects its move changes, so this is
+# faster than calling getNextState for every move.
+#
+# CAVEAT: the results share the ants and constructions their move does not
+# change with currentState and with each other.  Treat them as read-only or
+# clone() them first (see GameState.nextStates).
+#
+# Parameters:
+#   currentState - A clone of the current state (GameState)
+#   moves - The moves that the agent could take (list of Move)
+#
+# Return: A list with the state after each move, in the same order
+##
+def getNextStates(currentState, moves):
+    return batchNextStates(currentState, moves, False)
+
+##
+# getNextStatesAdversarial
+#
+# Description: The batched form of getNextStateAdversarial (see getNextStates)
+##
+def getNextStatesAdversarial(currentState, moves):
+    return batchNextStates(currentState, moves, True)
+
+##
+# batchNextStates
+#
+# Description: Helper for getNextStates and getNextStatesAdversarial.  Tunnel
+# builds are reported and give back currentState, as in getNextState.
+##
+def batchNextStates(currentState, moves, adversarial):
+    valid = []
+    for move in moves:
+        if move.moveType == BUILD and move.buildType == TUNNEL:
+            print("Attempted tunnel build in getNextState()")
+        else:
+            valid.append(move)
+    nextStates = iter(currentState.nextStates(valid, adversarial))
+    return [currentState if move.moveType == BUILD and move.buildType == TUNNEL
+            else next(nextStates) for move in moves]
 
 
 ##
@@ -813,110 +979,89 @@ def asciiPrintState(state):
     print(" food: " + str(p1Food) + "/" + str(p2Food))
 
 
-class GraphNode:
-
-    def __init__(self, parent=None, coords=None, f=0.0, g=0.0, h=0.0):
-        self.parent = parent
-        self.coords = coords
-        self.f = f
-        self.g = g
-        self.h = h
-
-    def __hash__(self):
-        return hash(self.coords)
-
-    def __eq__(self, other):
-        if self.coords == other.coords:
-            return True
-        return False
-
-    def __str__(self):
-        return str(self.coords)
-
 
 ##
 # aStarSearchPath
 #
-# Create a path towards from start to goal
-# CAVEAT: A-STAR SEARCH IS SLOWER THAN createPathToward() BECAUSE THIS IS OPTIMAL
-#         AND createPathTowards() IS GREEDY FOR TIME EFFICIENCY
+# Finds the cheapest path from start to the nearest of one or more goals with
+# A*, using true movement costs (grass costs 2 unless the ant at start ignores
+# it).  Cells holding other ants cannot be entered, including goals.  The
+# heuristic is the state's Terrain distance, which ignores ants and so never
+# overestimates.
 #
-#   @param currentState - a gameState
-#   @param start - the Ant's Coordinates aka ant.coords
-#   @param goal - the target coordinates
-#
-##
-def aStarSearchPath(currentState, start, goal):
-    start = GraphNode(coords=start)
-    goal = GraphNode(coords=goal)
-
-    ant = getAntAt(currentState, start.coords)
-
-    antMovement = UNIT_STATS[ant.type][MOVEMENT]
-    antMovement = antMovement + 1
-    ign_grass = UNIT_STATS[ant.type][IGNORES_GRASS]
-
-    if start.coords == goal.coords:
-        return []
-
-    start.f = start.g + approxDist(start.coords, goal.coords)
-    open_list = [start, ]
-    closed_list = list()
-    current = start
-
-    while open_list:
-        if current == goal:
-            return construct_path(current, antMovement)
-
-        current = open_list.pop(open_list.index(min(open_list, key=lambda x: x.f)))
-
-        if current in closed_list:
+# Parameters:
+#   currentState - a GameState
+#   start        - the coordinates to start from, normally an ant's coords
+#   goal         - the target coordinates, or a list of them (e.g. every food
+#                  or every drop-off); the nearest one is used
+#   distanceOnly - return the cost of the cheapest path rather than the path
+#
+# Return: with distanceOnly, the movement cost to the nearest goal (0 if
+# start is a goal, -1 if none can be reached).  Otherwise the start of the
+# path, cut to what the ant at start can move this turn so that it can be
+# used as the coordList of a Move; [] if start is a goal; False if no goal
+# can be reached.
+#
+def aStarSearchPath(currentState, start, goal, distanceOnly = False):
+    if len(goal) > 0 and isinstance(goal[0], int):
+        goals = [goal]
+    else:
+        goals = goal
+    start = tuple(start)
+    goalSet = set([tuple(g) for g in goals if legalCoord(g)])
+    if start in goalSet:
+        return 0 if distanceOnly else []
+    if not goalSet or not legalCoord(start):
+        return -1 if distanceOnly else False
+
+    ant = getAntAt(currentState, start)
+    ignoresGrass = ant is not None and UNIT_STATS[ant.type][IGNORES_GRASS]
+    terrain = currentState.getTerrain()
+    table = terrain.distances[1 if ignoresGrass else 0]
+    cells = BOARD_LENGTH * BOARD_LENGTH
+    goalIndexes = [x * BOARD_LENGTH + y for x, y in goalSet]
+
+    def heuristic(cell):
+        row = (cell[0] * BOARD_LENGTH + cell[1]) * cells
+        return min([table[row + index] for index in goalIndexes])
+
+    #cheapest known cost and predecessor of every cell reached so far;
+    #queue entries are (f, -g, cell) so ties go to the deeper cell
+    costs = { start : 0 }
+    parents = { start : None }
+    queue = [ (heuristic(start), 0, start) ]
+    found = None
+    while queue:
+        f, g, cell = heapq.heappop(queue)
+        g = -g
+        if g > costs[cell]:
             continue
-
-        for neighbor in neighbors(currentState, current, goal, ign_grass, antMovement):
-            if neighbor == goal:
-                return construct_path(current, antMovement)
-            if neighbor in open_list:
-                other = next((x for x in open_list if x.coords == neighbor.coords), None)
-                if next((x for x in open_list if x.coords == neighbor.coords), None) is not None:
-                    if other.f < neighbor.f:
-                        continue
-            if neighbor in closed_list:
-                other = next((x for x in open_list if x.coords == neighbor.coords), None)
-                if next((x for x in open_list if x.coords == neighbor.coords), None) is not None:
-                    if other.f < neighbor.f:
-                        continue
-                    else:
-                        open_list.append(neighbor)
-                else:
-                    open_list.append(neighbor)
-            else:
-                open_list.append(neighbor)
-
-        closed_list.append(current)
-
-    return False
-
-
-def neighbors(currentState, node, goal, ign_grass, antMovement):
-    bors = [GraphNode(coords=y) for y in listReachableAdjacent(currentState, node.coords, antMovement, ign_grass)]
-    for bor in bors:
-        bor.g = node.g + 1
-        bor.f = bor.g + approxDist(bor.coords, goal.coords)
-        bor.parent = node
-    return bors
-
-
-def construct_path(node, antMovement):
-    path = [node, ]
-    normalPath = list()
-    while node.parent is not None:
-        node = node.parent
-        path.append(node)
-
-    for x in path:
-        normalPath.append(x.coords)
-
-    li = normalPath[::-1]
-
-    return li if len(li) <= antMovement else li[:antMovement]
+        if cell in goalSet:
+            found = cell
+            break
+        for nextCell in ADJACENT_COORDS[cell[0]][cell[1]]:
+            if currentState.getAntAt(nextCell) is not None:
+                continue
+            nextCost = g + (1 if ignoresGrass else terrain.cost(nextCell))
+            if nextCell not in costs or nextCost < costs[nextCell]:
+                costs[nextCell] = nextCost
+                parents[nextCell] = cell
+                heapq.heappush(queue, (nextCost + heuristic(nextCell), -nextCost, nextCell))
+
+    if found is None:
+        return -1 if distanceOnly else False
+    if distanceOnly:
+        return costs[found]
+
+    path = [found]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+
+    #keep the steps the ant can pay for this turn
+    if ant is not None:
+        movement = UNIT_STATS[ant.type][MOVEMENT]
+        for i in range(1, len(path)):
+            if costs[path[i]] > movement:
+                return path[:i]
+    return path
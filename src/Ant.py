@@ -27,6 +27,7 @@ UNIT_STATS.append([1, 2, 3, 3, 2, True]) #Ranged soldier
 #   player - The id of the player that owns the Ant
 ##
 class Ant(object):
+    __slots__ = ('coords', 'type', 'hasMoved', 'carrying', 'player', 'health', 'UniqueID')
 
     ##
     #__init__
@@ -46,10 +47,25 @@ class Ant(object):
         self.health = UNIT_STATS[self.type][HEALTH]
         self.UniqueID = id(self)
 
+    ##
+    #make
+    #Description: Creates an Ant with every field given, skipping the stats
+    #   lookup done by __init__ (used by clone and GameState unpacking)
+    #
+    #Return: the new Ant
+    ##
+    @staticmethod
+    def make(coords, antType, player, health, carrying, hasMoved, uniqueId):
+        ant = Ant.__new__(Ant)
+        ant.coords = coords
+        ant.type = antType
+        ant.hasMoved = hasMoved
+        ant.carrying = carrying
+        ant.player = player
+        ant.health = health
+        ant.UniqueID = uniqueId
+        return ant
+
     def clone(self):
-        rtnAnt = Ant(self.coords, self.type, self.player)
-        rtnAnt.hasMoved = self.hasMoved
-        rtnAnt.carrying = self.carrying
-        rtnAnt.health = self.health
-        rtnAnt.UniqueID = self.UniqueID
-        return rtnAnt
+        return Ant.make(self.coords, self.type, self.player, self.health,
+                        self.carrying, self.hasMoved, self.UniqueID)
@@ -0,0 +1,675 @@
+import os
+import sys
+import pickle
+import time
+import random
+import argparse
+import importlib
+import itertools
+import tempfile
+import tracemalloc
+from Constants import *
+from GameState import GameState
+from Ant import Ant
+from Building import Building
+from Construction import Construction
+from Terrain import Terrain
+from Engine import Engine
+import Tournament
+from RemotePlayer import RemotePlayer
+from GameRecord import GameRecorder, GameLog, MAGIC
+from Replay import Replay
+from Train import Trainer, DEFAULT_OPPONENTS
+from Experience import ExperienceLog, BatchTD
+from AIPlayerUtils import *
+
+#
+# Benchmarks.py
+#
+# micro-benchmarks for the game engine and the helpers in AIPlayerUtils.
+# Run from the src directory:
+#
+#     python Benchmarks.py            (run every benchmark)
+#     python Benchmarks.py clone      (run only the named benchmark(s))
+#
+# Every benchmark prints one line per measurement in the form
+# "<name>: <rate> /s" so that results can be compared between commits.
+#
+
+
+##
+# midGameState
+#
+# builds a representative play-phase GameState: both players have a full
+# grass layout, a tunnel, two food on each side of the board and a handful
+# of ants, one of them carrying food.
+#
+# Return: a GameState with a fully populated board
+#
+def midGameState():
+    state = GameState.getBlankState()
+    state.phase = PLAY_PHASE
+
+    def place(constr, inv):
+        state.board[constr.coords[0]][constr.coords[1]].constr = constr
+        state.inventories[inv].constrs.append(constr)
+
+    def spawn(coords, antType, player, carrying = False):
+        ant = Ant(coords, antType, player)
+        ant.carrying = carrying
+        state.board[coords[0]][coords[1]].ant = ant
+        state.inventories[player].ants.append(ant)
+        return ant
+
+    # player one builds on the top half, player two on the bottom half
+    place(Building((1, 1), ANTHILL, PLAYER_ONE), PLAYER_ONE)
+    place(Building((8, 1), TUNNEL, PLAYER_ONE), PLAYER_ONE)
+    place(Building((8, 8), ANTHILL, PLAYER_TWO), PLAYER_TWO)
+    place(Building((1, 8), TUNNEL, PLAYER_TWO), PLAYER_TWO)
+    for x in (0, 1, 2, 3, 4, 5, 6, 8, 9):
+        place(Construction((x, 3), GRASS), NEUTRAL)
+        place(Construction((9 - x, 6), GRASS), NEUTRAL)
+    for coords in ((0, 9), (9, 7), (0, 0), (9, 2)):
+        place(Construction(coords, FOOD), NEUTRAL)
+
+    spawn((1, 1), QUEEN, PLAYER_ONE)
+    spawn((5, 2), WORKER, PLAYER_ONE, True)
+    spawn((3, 1), WORKER, PLAYER_ONE)
+    spawn((4, 5), DRONE, PLAYER_ONE)
+    spawn((6, 4), SOLDIER, PLAYER_ONE)
+    spawn((8, 8), QUEEN, PLAYER_TWO)
+    spawn((2, 7), WORKER, PLAYER_TWO)
+    spawn((5, 7), R_SOLDIER, PLAYER_TWO)
+    spawn((7, 5), DRONE, PLAYER_TWO)
+
+    state.inventories[PLAYER_ONE].foodCount = 4
+    state.inventories[PLAYER_TWO].foodCount = 3
+    return state
+
+
+##
+# randomGameState
+#
+# builds a random play-phase GameState: each player's anthill, tunnel and
+# nine grass are scattered over their own four rows, two food per player go
+# on the opponent's side, and a few ants of each player are placed anywhere
+# that is free.
+#
+# Parameters:
+#   rng - a random.Random to draw from
+#
+# Return: a GameState with a fully populated board
+#
+def randomGameState(rng):
+    state = GameState.getBlankState()
+    state.phase = PLAY_PHASE
+    free = set([(x, y) for x in range(BOARD_LENGTH) for y in range(BOARD_LENGTH)])
+
+    def take(rows):
+        coords = rng.choice(sorted([c for c in free if c[1] in rows]))
+        free.discard(coords)
+        return coords
+
+    for player, rows in ((PLAYER_ONE, range(0, 4)), (PLAYER_TWO, range(6, 10))):
+        hill = Building(take(rows), ANTHILL, player)
+        state.addConstr(hill, player)
+        state.addConstr(Building(take(rows), TUNNEL, player), player)
+        for i in range(9):
+            state.addConstr(Construction(take(rows), GRASS), NEUTRAL)
+        state.addAnt(Ant(hill.coords, QUEEN, player))
+    for rows in (range(6, 10), range(0, 4)):
+        for i in range(2):
+            state.addConstr(Construction(take(rows), FOOD), NEUTRAL)
+
+    cells = [BOARD_COORDS[x][y] for x in range(BOARD_LENGTH) for y in range(BOARD_LENGTH)]
+    occupied = set([ant.coords for inv in state.inventories for ant in inv.ants])
+    for player in (PLAYER_ONE, PLAYER_TWO):
+        for i in range(rng.randint(2, 5)):
+            coords = rng.choice([c for c in cells if c not in occupied])
+            occupied.add(coords)
+            state.addAnt(Ant(coords, rng.choice((WORKER, DRONE, SOLDIER, R_SOLDIER)), player))
+    state.inventories[PLAYER_ONE].foodCount = rng.randint(0, 6)
+    state.inventories[PLAYER_TWO].foodCount = rng.randint(0, 6)
+    return state
+
+
+##
+# rate
+#
+# calls fn repeatedly for roughly the given number of seconds
+#
+# Return: the number of calls per second
+#
+def rate(fn, seconds = 1.0):
+    count = 0
+    start = time.perf_counter()
+    end = start + seconds
+    now = start
+    while now < end:
+        for i in range(50):
+            fn()
+        count += 50
+        now = time.perf_counter()
+    return count / (now - start)
+
+
+def report(name, value, unit = "/s"):
+    print("%-40s %12.1f %s" % (name + ":", value, unit))
+
+
+##
+# benchClone
+#
+# GameState.clone, GameState.fastclone and a full getNextState sweep over
+# every legal move of a mid-game state, from the state as built (which has
+# to be packed for every move) and from a packed copy
+#
+def benchClone():
+    state = midGameState()
+    report("clone", rate(state.clone))
+    report("fastclone", rate(state.fastclone))
+    moves = listAllLegalMoves(state)
+    report("getNextState (%d moves)" % len(moves),
+           len(moves) * rate(lambda: [getNextState(state, m) for m in moves]))
+    packed = state.fastclone()
+    report("getNextState from packed (%d moves)" % len(moves),
+           len(moves) * rate(lambda: [getNextState(packed, m) for m in moves]))
+
+
+##
+# benchMakeUnmake
+#
+# node rate of a depth-2 tree walk using clone-based getNextStateAdversarial
+# versus in-place GameState.applyMove/undoMove
+#
+def benchMakeUnmake():
+    state = midGameState().fastclone()
+
+    def walkClone(node, depth):
+        if depth == 0:
+            return 1
+        count = 1
+        for move in listAllLegalMoves(node):
+            count += walkClone(getNextStateAdversarial(node, move), depth - 1)
+        return count
+
+    def walkInPlace(node, depth):
+        if depth == 0:
+            return 1
+        count = 1
+        for move in listAllLegalMoves(node):
+            record = node.applyMove(move)
+            count += walkInPlace(node, depth - 1)
+            node.undoMove(record)
+        return count
+
+    for name, walk in (("getNextStateAdversarial", walkClone), ("applyMove/undoMove", walkInPlace)):
+        start = time.perf_counter()
+        nodes = walk(state, 2)
+        report("%s (%d nodes)" % (name, nodes), nodes / (time.perf_counter() - start), "nodes/s")
+
+
+##
+# benchMoveGen
+#
+# legal move generation and the lookups it is built on
+#
+def benchMoveGen():
+    state = midGameState().fastclone()
+    report("getAntAt x100", rate(lambda: [getAntAt(state, (x, y)) for x in range(10) for y in range(10)]))
+    report("getConstrAt x100", rate(lambda: [getConstrAt(state, (x, y)) for x in range(10) for y in range(10)]))
+    report("listAllLegalMoves", rate(lambda: listAllLegalMoves(state)))
+
+
+##
+# benchHash
+#
+# GameState.zobristHash computed from scratch versus kept up to date through
+# getNextState, and a depth-2 walk that counts distinct positions with a set
+#
+def benchHash():
+    state = midGameState().fastclone()
+    moves = listAllLegalMoves(state)
+
+    def fromScratch():
+        state.invalidateHash()
+        return state.zobristHash()
+    report("zobristHash (from scratch)", rate(fromScratch))
+    report("zobristHash (incremental)", rate(state.zobristHash))
+    report("getNextState + hash (%d moves)" % len(moves),
+           len(moves) * rate(lambda: [hash(getNextState(state, m)) for m in moves]))
+
+    seen = set()
+    for move in moves:
+        record = state.applyMove(move)
+        for reply in listAllLegalMoves(state):
+            child = getNextStateAdversarial(state, reply)
+            seen.add(child)
+        state.undoMove(record)
+    report("distinct positions at depth 2", len(seen), "")
+
+
+##
+# benchObjects
+#
+# creation rate and memory footprint of the model objects: Ant.clone, fully
+# materialized GameState clones (board and inventories) and their size
+#
+def benchObjects():
+    state = midGameState()
+    ant = state.inventories[PLAYER_ONE].ants[1]
+    report("Ant.clone", rate(ant.clone))
+    report("Move()", rate(lambda: Move(MOVE_ANT, [(0, 0), (0, 1)], None)))
+    report("listAdjacent x100", rate(lambda: [listAdjacent((x, y)) for x in range(10) for y in range(10)]))
+
+    def materialize():
+        copy = state.clone()
+        copy.board
+        return copy
+    report("clone + materialize", rate(materialize))
+
+    for name, make in (("packed clone", state.clone), ("materialized clone", materialize)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        keep = [make() for i in range(1000)]
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        report("memory per %s" % name, used / len(keep), "bytes")
+
+
+##
+# benchPaths
+#
+# listAllLegalMoves with one cheapest path per destination versus the
+# exhaustive path enumeration, and the cost of simulating every move
+#
+def benchPaths():
+    state = midGameState().fastclone()
+    for name, exhaustive in (("dijkstra", False), ("exhaustive", True)):
+        moves = listAllLegalMoves(state, exhaustive)
+        report("listAllLegalMoves %s (%d moves)" % (name, len(moves)),
+               rate(lambda: listAllLegalMoves(state, exhaustive)))
+        report("  + getNextState on each move",
+               rate(lambda: [getNextState(state, m) for m in listAllLegalMoves(state, exhaustive)]))
+
+
+##
+# benchTerrain
+#
+# building the Terrain tables, and the distance and path helpers that use them
+#
+def benchTerrain():
+    state = midGameState().fastclone()
+    state.getTerrain()
+    records = state._layout.records
+    report("Terrain()", rate(lambda: Terrain(records), 2.0))
+    pairs = [((x, 0), (9 - x, 9)) for x in range(10)]
+    report("stepsToReach x10", rate(lambda: [stepsToReach(state, a, b) for a, b in pairs]))
+    report("createPathToward x10", rate(lambda: [createPathToward(state, a, b, 3) for a, b in pairs]))
+
+
+##
+# benchAStar
+#
+# aStarSearchPath from every ant to each food, to the nearest food and as a
+# distance-only query, over a set of random boards
+#
+def benchAStar():
+    rng = random.Random(8)
+    queries = []
+    for i in range(20):
+        state = randomGameState(rng)
+        state.getTerrain()
+        foods = [food.coords for food in getConstrList(state, None, (FOOD,))]
+        for inv in state.inventories[:2]:
+            for ant in inv.ants:
+                queries.append((state, ant.coords, foods))
+    report("aStarSearchPath x%d (single goal)" % len(queries),
+           rate(lambda: [aStarSearchPath(st, start, foods[0]) for st, start, foods in queries]))
+    report("aStarSearchPath x%d (nearest food)" % len(queries),
+           rate(lambda: [aStarSearchPath(st, start, foods) for st, start, foods in queries]))
+    report("aStarSearchPath x%d (distance only)" % len(queries),
+           rate(lambda: [aStarSearchPath(st, start, foods, True) for st, start, foods in queries]))
+
+
+##
+# benchIterMoves
+#
+# consuming a few moves from iterLegalMoves versus building the whole list
+#
+def benchIterMoves():
+    state = midGameState().fastclone()
+    report("listAllLegalMoves", rate(lambda: listAllLegalMoves(state)))
+    report("list(iterLegalMoves)", rate(lambda: list(iterLegalMoves(state))))
+    report("iterLegalMoves, first move", rate(lambda: next(iterLegalMoves(state))))
+    for order in (("builds",), ("captures", "builds"), ("workers",)):
+        report("iterLegalMoves %s, first 3" % "/".join(order),
+               rate(lambda: list(itertools.islice(iterLegalMoves(state, order), 3))))
+
+
+##
+# benchBatch
+#
+# successors of every legal move built one at a time with getNextState versus
+# in one batch with getNextStates
+#
+def benchBatch():
+    state = midGameState().fastclone()
+    moves = listAllLegalMoves(state)
+    n = len(moves)
+    report("getNextState loop (%d moves)" % n,
+           n * rate(lambda: [getNextState(state, m) for m in moves]), "states/s")
+    report("getNextStates (%d moves)" % n,
+           n * rate(lambda: getNextStates(state, moves)), "states/s")
+    report("getNextStatesAdversarial (%d moves)" % n,
+           n * rate(lambda: getNextStatesAdversarial(state, moves)), "states/s")
+
+
+##
+# loadAI
+#
+# creates a player from one of the modules in the AI directory
+#
+def loadAI(moduleName, playerId):
+    sys.path.insert(0, "AI")
+    try:
+        return importlib.import_module(moduleName).AIPlayer(playerId)
+    finally:
+        sys.path.pop(0)
+
+
+##
+# benchEngine
+#
+# whole Random vs FoodGatherer games played headless by Engine versus the
+# same games through Game.runGame with no UI attached
+#
+def benchEngine(games = 20):
+    import Game
+    argv = sys.argv
+    sys.argv = argv[:1]
+    try:
+        game = Game.Game(testing=True)
+    finally:
+        sys.argv = argv
+
+    def playEngine(p1, p2, seed):
+        Engine(p1, p2, seed).play()
+
+    def playGame(p1, p2, seed):
+        game.setup(Game.GameData(p1, p2), 0)
+        game.seed = seed
+        game.currentPlayerScores = [[p1.author, 0, 0], [p2.author, 0, 0]]
+        game.runGame()
+
+    for name, play in (("Engine.play", playEngine), ("Game.runGame, no UI", playGame)):
+        start = time.perf_counter()
+        for seed in range(games):
+            play(loadAI("Random", 0), loadAI("FoodGatherer", 1), seed)
+        report(name, games / (time.perf_counter() - start), "games/s")
+
+
+##
+# benchTournament
+#
+# Random vs FoodGatherer games played one after another in this process
+# versus spread over a Tournament pool with one worker per CPU (pool start-up
+# included)
+#
+def benchTournament(games = 40):
+    tasks = [(0, j, ("Random", 0, False), ("FoodGatherer", 1, False), j) for j in range(games)]
+    Tournament.initWorker("AI")
+    start = time.perf_counter()
+    for task in tasks:
+        Tournament.playGame(task)
+    report("sequential", games / (time.perf_counter() - start), "games/s")
+
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    pool = Tournament.makePool(workers, "AI")
+    try:
+        for result in pool.imap_unordered(Tournament.playGame, tasks):
+            pass
+    finally:
+        pool.terminate()
+    report("pool of %d" % workers, games / (time.perf_counter() - start), "games/s")
+
+
+##
+# benchRemote
+#
+# FoodGatherer vs Random games with both agents in this process versus each
+# in its own RemotePlayer process with a time limit, which adds a round trip
+# over a pipe to every call.  The two take turns over a few rounds, and the
+# spread of the local rounds shows how much of the difference is noise.  The
+# overhead left is mostly the two process switches per call (see
+# RemotePlayer), so it is well above the noise on a single CPU.
+#
+def benchRemote(games = 20, rounds = 3):
+    local = (loadAI("FoodGatherer", 0), loadAI("Random", 1))
+    remote = (RemotePlayer("FoodGatherer", 0, timeLimit=1, cpuLimit=1),
+              RemotePlayer("Random", 1, timeLimit=1, cpuLimit=1))
+    try:
+        perMove = {local: [], remote: []}
+        for players in perMove:
+            # the agents' first game builds their caches
+            Engine(players[0], players[1], games).play()
+        for i in range(rounds):
+            for players in perMove:
+                moves = 0
+                start = time.perf_counter()
+                for seed in range(games):
+                    moves += Engine(players[0], players[1], seed).play().moves
+                perMove[players].append((time.perf_counter() - start) / moves * 1e6)
+        localTime = sorted(perMove[local])[rounds // 2]
+        remoteTime = sorted(perMove[remote])[rounds // 2]
+        report("local agents, per move", localTime, "us")
+        report("RemotePlayer agents, per move", remoteTime, "us")
+        report("RemotePlayer overhead, per move", remoteTime - localTime, "us")
+        report("spread of the local rounds", max(perMove[local]) - min(perMove[local]), "us")
+        report("RemotePlayer call round trip", rate(lambda: remote[0].call("registerWin", True)))
+        state = midGameState().clone()
+        report("GameState pickle round trip",
+               rate(lambda: pickle.loads(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))))
+    finally:
+        for player in remote:
+            player.stop()
+
+
+##
+# benchRecord
+#
+# Random vs FoodGatherer games with and without a GameRecorder, the size of
+# a recorded game, and how fast the games read back
+#
+def benchRecord(games = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.rec")
+        recorder = GameRecorder(path)
+        for name, rec in (("Engine.play", None), ("Engine.play, recorded", recorder)):
+            start = time.perf_counter()
+            for seed in range(games):
+                engine = Engine(loadAI("Random", 0), loadAI("FoodGatherer", 1), seed)
+                engine.recorder = rec
+                engine.play()
+            report(name, games / (time.perf_counter() - start), "games/s")
+        recorder.close()
+        report("bytes per game", (os.path.getsize(path) - len(MAGIC)) / games, "B")
+        with GameLog(path) as log:
+            report("GameLog read", rate(lambda: [record.turns for record in log]) * games, "games/s")
+
+
+##
+# benchReplay
+#
+# Playing Random vs FoodGatherer games against replaying them from their
+# records to the end, and rebuilding positions of a replayed game in a
+# random order
+#
+def benchReplay(games = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.rec")
+        with GameRecorder(path) as recorder:
+            start = time.perf_counter()
+            for seed in range(games):
+                engine = Engine(loadAI("Random", 0), loadAI("FoodGatherer", 1), seed)
+                engine.recorder = recorder
+                engine.play()
+            report("Engine.play", games / (time.perf_counter() - start), "games/s")
+        with GameLog(path) as log:
+            records = list(log)
+    report("Replay to the end", rate(lambda: [Replay(record).stateAt(len(record.events)) for record in records]) * games, "games/s")
+
+    replay = Replay(records[0])
+    positions = random.Random(0).choices(range(len(replay) + 1), k=100)
+    report("Replay.stateAt, random positions", rate(lambda: [replay.stateAt(p) for p in positions]) * 100)
+
+
+##
+# benchTrain
+#
+# self-play training of the HW6 agent with Train.py, one worker per CPU,
+# starting from the shipped utility table (copied, so it is left alone),
+# and how often the trained agent then beats Booger and FoodGatherer
+#
+def benchTrain(games = 40, evalGames = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        with Trainer(path = os.path.join(tmp, "utility_table.bin")) as trainer:
+            trainer.train(games, 0)
+            report("self-play training, %d workers" % len(trainer.processes), trainer.gamesPerHour(), "games/hour")
+            for opponent in DEFAULT_OPPONENTS:
+                report("win rate vs " + opponent, trainer.evaluate(opponent, evalGames, 0) * 100, "%")
+
+
+##
+# benchExperience
+#
+# Self-play training games logged as experience, and how fast an offline
+# batch TD(lambda) pass then goes over the log
+#
+def benchExperience(games = 40, epochs = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "experience.log")
+        with Trainer(path = os.path.join(tmp, "utility_table.bin"), record = path) as trainer:
+            trainer.train(games, 0)
+        log = ExperienceLog(path)
+        report("log size", os.path.getsize(path) / len(log.indices), "bytes/step")
+        learner = BatchTD(log)
+        start = time.perf_counter()
+        learner.train(epochs = epochs)
+        report("batch TD(lambda), %d steps" % len(log.indices),
+               epochs * len(log.indices) / (time.perf_counter() - start), "steps/s")
+
+
+##
+# benchTable
+#
+# Adding categories to the HW6 agent's UtilityTable through two writers of
+# the same file, as the two players of a self-play game are when training,
+# and a check that the table still holds every one of them after growing
+#
+def benchTable(entries = 20000):
+    sys.path.insert(0, "AI")
+    try:
+        module = importlib.import_module("martinsi26_leda27_HW6")
+    finally:
+        sys.path.pop(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "utility_table.bin")
+        # an empty table, rather than one made from the shipped pickle
+        module.UtilityTable(path, True).close()
+        writers = [module.UtilityTable.open(True, path), module.UtilityTable.open(True, path)]
+        start = time.perf_counter()
+        for index in range(entries):
+            table = writers[index % 2]
+            slot = table.slot(index)
+            table.utilities[slot] = index
+        report("UtilityTable.slot, new categories", entries / (time.perf_counter() - start))
+        for table in writers:
+            table.close()
+        table = module.UtilityTable.open(False, path)
+        lost = sum(1 for index in range(entries) if table.get(index, None) != index)
+        grows = (table.capacity // module.MIN_CAPACITY).bit_length() - 1
+        table.close()
+    report("categories lost by two writers", lost, "of %d (%d grows)" % (entries, grows))
+    if lost:
+        raise AssertionError("two writers of one utility table lost %d categories" % lost)
+
+
+##
+# benchTiles
+#
+# Redrawing every tile of a full board, composing each tile from its texture
+# layers (an empty sprite cache) against swapping in cached pictures.  Needs
+# a display.
+#
+def benchTiles():
+    import tkinter
+    from GamePane import GamePane, BoardButton
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        print("skipped, no display (%s)" % e)
+        return
+    pane = GamePane(None, root)
+    pane.staleCells = set()
+    tiles = [BoardButton(root, pane, x, y) for x in range(10) for y in range(10)]
+    state = midGameState()
+    for tile in tiles:
+        loc = state.board[tile.x][tile.y]
+        if loc.constr is not None:
+            tile.construct = loc.constr.type
+            tile.constTeam = loc.constr.player
+        if loc.ant is not None:
+            tile.ant = loc.ant.type
+            tile.antTeam = loc.ant.player
+            tile.carrying = loc.ant.carrying
+            tile.health = (UNIT_STATS[loc.ant.type][HEALTH], loc.ant.health)
+
+    # toggle a highlight so every tile really changes on every redraw
+    def redrawBoard(cached):
+        if not cached:
+            pane.sprites.clear()
+        for tile in tiles:
+            tile.highlight = not tile.highlight
+            tile.reDraw()
+        root.update_idletasks()
+
+    report("full board, composing tiles", rate(lambda: redrawBoard(False), 2.0), "boards/s")
+    report("full board, cached tiles", rate(lambda: redrawBoard(True), 2.0), "boards/s")
+    root.destroy()
+
+
+BENCHMARKS = {
+    "clone": benchClone,
+    "makeunmake": benchMakeUnmake,
+    "movegen": benchMoveGen,
+    "hash": benchHash,
+    "objects": benchObjects,
+    "paths": benchPaths,
+    "terrain": benchTerrain,
+    "astar": benchAStar,
+    "itermoves": benchIterMoves,
+    "batch": benchBatch,
+    "engine": benchEngine,
+    "tournament": benchTournament,
+    "remote": benchRemote,
+    "record": benchRecord,
+    "replay": benchReplay,
+    "train": benchTrain,
+    "experience": benchExperience,
+    "table": benchTable,
+    "tiles": benchTiles,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ReAntics micro-benchmarks')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='benchmarks to run: ' + ", ".join(BENCHMARKS))
+    args = parser.parse_args()
+    for name in args.names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark '%s'" % name)
+        print("== " + name)
+        BENCHMARKS[name]()
@@ -13,6 +13,7 @@ from Constants import *
 #       take before being captured.
 ##
 class Building(Construction):
+    __slots__ = ('player', 'captureHealth')
 
     ##
     #__init__
@@ -30,5 +31,22 @@ class Building(Construction):
         else:
             self.captureHealth = CONSTR_STATS[inputType][CAP_HEALTH]
     
+    ##
+    #make
+    #Description: Creates a Building with every field given, skipping the
+    #   stats lookups done by __init__
+    #
+    #Return: the new Building
+    ##
+    @staticmethod
+    def make(coords, constrType, player, captureHealth):
+        building = Building.__new__(Building)
+        building.coords = coords
+        building.type = constrType
+        building.movementCost = CONSTR_STATS[constrType][MOVE_COST]
+        building.player = player
+        building.captureHealth = captureHealth
+        return building
+
     def clone(self):
-        return Building(self.coords, self.type, self.player, self.captureHealth)
+        return Building.make(self.coords, self.type, self.player, self.captureHealth)
@@ -13,6 +13,10 @@ NEUTRAL    = 2
 #Length of the board (it's square)
 BOARD_LENGTH = 10
 
+#Interned (x, y) tuples for every cell, indexed BOARD_COORDS[x][y], so that
+#the same coordinate is always the same object
+BOARD_COORDS = tuple([tuple([(x, y) for y in range(BOARD_LENGTH)]) for x in range(BOARD_LENGTH)])
+
 #Game Phases
 MENU_PHASE = 0
 SETUP_PHASE_1 = 1
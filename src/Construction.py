@@ -21,6 +21,7 @@ CONSTR_STATS.append((1,None,None)) #Food
 #       down and to the right.
 ##
 class Construction(object):
+    __slots__ = ('coords', 'type', 'movementCost')
 
     ##
     #__init__
@@ -36,4 +37,8 @@ class Construction(object):
         self.movementCost = CONSTR_STATS[inputType][MOVE_COST]
     
     def clone(self):
-        return Construction(self.coords, self.type)
+        constr = Construction.__new__(Construction)
+        constr.coords = self.coords
+        constr.type = self.type
+        constr.movementCost = self.movementCost
+        return constr
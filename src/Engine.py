@@ -0,0 +1,1051 @@
+import random, time
+from Construction import *
+from Constants import *
+from GameState import *
+from Inventory import *
+from Building import *
+from Location import *
+from Ant import *
+from Move import *
+from Player import Player
+
+# Reasons a game can end (GameResult.reason)
+QUEEN_KILLED = "queen killed"
+ANTHILL_CAPTURED = "anthill captured"
+FOOD_GOAL_REACHED = "food goal"
+OUT_OF_ANTS = "out of food and ants"
+BAD_PLACEMENT = "invalid placement"
+BAD_MOVE = "invalid move"
+BAD_ATTACK = "invalid attack"
+TURN_LIMIT = "turn limit"
+
+
+##
+# newSeed
+# Description: A seed for a game that was not given one, drawn from the
+#   operating system so it does not depend on (or disturb) the state of the
+#   random module.
+##
+def newSeed():
+    return random.SystemRandom().getrandbits(32)
+
+
+##
+# GameResult
+# Description: The outcome of one game played by an Engine.
+#
+# Variables:
+#   players - the authors of the two players, in the order given to the Engine
+#   winner - index (0 or 1) of the winning player, or None if nobody won
+#   reason - why the game ended (one of the reasons above)
+#   message - what was wrong with the losing player's placement, move or
+#       attack, or None if the game was won on the board
+#   turns - number of turns completed in the play phase
+#   moves - number of moves made in the play phase (END moves included)
+#   seed - the seed the game was played with (see Engine.seedGame)
+#   state - the final GameState
+#   elapsed - wall-clock seconds the game took
+##
+class GameResult(object):
+    def __init__(self, players, winner, reason, message, turns, moves, seed, state, elapsed):
+        self.players = players
+        self.winner = winner
+        self.reason = reason
+        self.message = message
+        self.turns = turns
+        self.moves = moves
+        self.seed = seed
+        self.state = state
+        self.elapsed = elapsed
+
+    @property
+    def loser(self):
+        return None if self.winner is None else 1 - self.winner
+
+    def __str__(self):
+        if self.winner is None:
+            outcome = "no winner"
+        else:
+            outcome = "%s beat %s" % (self.players[self.winner], self.players[self.loser])
+        return "%s (%s) after %d turns" % (outcome, self.reason, self.turns)
+
+
+##
+# Engine
+# Description: The rules of the game, and a headless loop that plays two AI
+#   players against each other from setup to the end of the game.
+#
+#   Engine has no UI, threads or waits: it asks each player for its
+#   placement, moves and attacks in turn and stops at the first win or
+#   illegal action.  Game extends it and reuses the rule checks and state
+#   updates below, adding the UI, human input and tournament bookkeeping.
+#
+# Variables:
+#   currentPlayers - the two Players, indexed by player ID
+#   seed - the seed games are played with, or None for a new one each game
+#   seedModule - also seed Python's random module with each game's seed, for
+#       agents that use it directly (off by default: it is shared by the
+#       whole process)
+#   maxTurns - ends the game with no winner after this many turns, or None
+#   verbose - print illegal actions to the console
+#   state - the GameState being played
+#   recorder - a GameRecorder the game is streamed to, or None
+#   thinkTime - seconds the current player took over its last decision
+#   dirtyCells - the cells changed since the last takeDirtyCells, or None
+#       if the whole board has to be redrawn
+##
+class Engine(object):
+    ##
+    # __init__
+    # Description: Creates an engine for one pairing of players.
+    #
+    # Parameters:
+    #   p1 - the Player moving first (Player)
+    #   p2 - the Player moving second (Player)
+    #   seed - optional seed to play every game with (int)
+    #   maxTurns - optional limit on the number of turns (int)
+    #   verbose - print the reason for illegal actions (bool)
+    #   seedModule - seed the random module too (bool)
+    ##
+    def __init__(self, p1: Player, p2: Player, seed=None, maxTurns=None, verbose=False, seedModule=False):
+        self.currentPlayers = [p1, p2]
+        self.seed = seed
+        self.seedModule = seedModule
+        self.maxTurns = maxTurns
+        self.verbose = verbose
+        self.state = None
+        self.gameOver = False
+        self.winner = None
+        self.reason = None
+        self.message = None
+        self.turns = 0
+        self.moves = 0
+        self.recorder = None
+        self.thinkTime = 0.0
+        self.random = None
+        self.dirtyCells = None
+
+    ##
+    # play
+    # Description: Plays a full game and reports how it went.  The players'
+    #   registerWin is called once the game is decided, as it is by Game.
+    #
+    # Returns: the GameResult
+    ##
+    def play(self):
+        start = time.perf_counter()
+        seed = self.seedGame(self.seed)
+
+        self.state = GameState.getBlankState()
+        self.state.phase = SETUP_PHASE_1
+        self.dirtyCells = None
+        self.gameOver = False
+        self.winner = None
+        self.reason = None
+        self.message = None
+        self.turns = 0
+        self.moves = 0
+        constrsToPlace = self.constrsFor(SETUP_PHASE_1, PLAYER_ONE)
+        if self.recorder is not None:
+            self.recorder.startGame((self.currentPlayers[0].author, self.currentPlayers[1].author), seed)
+
+        while not self.gameOver:
+            # each player sees its own copy of the state, from its own side
+            theState = self.state.clone()
+            if theState.whoseTurn == PLAYER_TWO:
+                theState.flipBoard()
+            currentPlayer = self.currentPlayers[self.state.whoseTurn]
+
+            if self.state.phase == SETUP_PHASE_1 or self.state.phase == SETUP_PHASE_2:
+                # hide the 1st player's anthill and grass placement from the 2nd player
+                if theState.whoseTurn == PLAYER_TWO and self.state.phase == SETUP_PHASE_1:
+                    theState.clearConstrs()
+                targets = self.ask(currentPlayer.getPlacement, theState)
+                if type(targets) == list:
+                    targets = targets[:len(constrsToPlace)]
+
+                if self.isValidPlacement(constrsToPlace, targets):
+                    self.placeConstrs(constrsToPlace, targets)
+                    if not constrsToPlace:
+                        constrsToPlace = self.advanceSetup()
+                else:
+                    self.forfeit(BAD_PLACEMENT, "invalid placement: " + str(targets))
+
+            elif self.state.phase == PLAY_PHASE:
+                self.playMove(currentPlayer, theState)
+
+            if not self.gameOver:
+                for playerId in (PLAYER_ONE, PLAYER_TWO):
+                    reason = self.victoryReason(playerId)
+                    if reason is not None:
+                        self.finish(playerId, reason)
+                        break
+
+        return GameResult((self.currentPlayers[0].author, self.currentPlayers[1].author),
+                          self.winner, self.reason, self.message, self.turns, self.moves,
+                          seed, self.state, time.perf_counter() - start)
+
+    ##
+    # seedGame
+    # Description: Makes a game reproducible.  Everything random in the game
+    #   follows from its seed: the engine's own random numbers (self.random)
+    #   and each player's stream (Player.seedRandom).  Python's random module
+    #   is left alone unless seedModule is set; an AI in its own process (see
+    #   RemotePlayer) has its module seeded from its stream either way.
+    #
+    # Parameters:
+    #   seed - the seed, or None for a new one (int)
+    #
+    # Returns: the seed
+    ##
+    def seedGame(self, seed):
+        if seed is None:
+            seed = newSeed()
+        if self.seedModule:
+            random.seed(seed)
+        self.random = random.Random(seed)
+        for player in self.currentPlayers:
+            player.seedRandom(self.random.getrandbits(32))
+        return seed
+
+    ##
+    # playMove
+    # Description: Gets one move from the current player and carries it out,
+    #   including any attack that follows.
+    #
+    # Parameters:
+    #   currentPlayer - the Player whose turn it is (Player)
+    #   theState - that player's view of the state (GameState)
+    ##
+    def playMove(self, currentPlayer, theState):
+        move = self.ask(currentPlayer.getMove, theState)
+        self.translateMove(move)
+        if not self.isValidMove(move):
+            self.forfeit(BAD_MOVE, "invalid move: " + str(move))
+            return
+        self.moves += 1
+
+        if move.moveType == MOVE_ANT:
+            antToMove = self.applyMoveAnt(move)
+            # workers can not attack
+            if antToMove.type != WORKER:
+                self.resolveAttack(antToMove, currentPlayer)
+        elif move.moveType == BUILD:
+            self.applyBuild(move)
+        elif move.moveType == END:
+            self.endTurn()
+            self.turns += 1
+            if self.maxTurns is not None and self.turns >= self.maxTurns:
+                self.finish(None, TURN_LIMIT)
+
+    ##
+    # resolveAttack
+    # Description: Asks the player which enemy to attack, if any are in range
+    #   of the ant that just moved, and carries out the attack.
+    #
+    # Parameters:
+    #   attackingAnt - The Ant that has an available attack (Ant)
+    #   currentPlayer - The Player whose turn it currently is (Player)
+    ##
+    def resolveAttack(self, attackingAnt, currentPlayer):
+        validAttackCoords = self.validAttackCoords(attackingAnt)
+        if validAttackCoords == []:
+            return
+
+        theState = self.state.clone()
+        if theState.whoseTurn == PLAYER_TWO:
+            theState.flipBoard()
+        attackCoord = self.ask(currentPlayer.getAttack, theState, attackingAnt.clone(), validAttackCoords)
+        if self.isValidCoord(attackCoord):
+            attackCoord = self.state.coordLookup(attackCoord, theState.whoseTurn)
+
+        if not self.isValidAttack(attackingAnt, attackCoord):
+            self.forfeit(BAD_ATTACK, "invalid attack: " + str(attackCoord))
+            return
+        self.applyAttack(attackingAnt, attackCoord)
+
+    ##
+    # ask
+    # Description: Asks a player for a decision and notes how long it took.
+    #
+    # Parameters:
+    #   method - the player's getPlacement, getMove or getAttack
+    #   args - what to pass it
+    #
+    # Returns: the player's answer
+    ##
+    def ask(self, method, *args):
+        start = time.perf_counter()
+        answer = method(*args)
+        self.thinkTime = time.perf_counter() - start
+        return answer
+
+    ##
+    # markDirty
+    # Description: Notes cells whose contents have changed, for a UI that
+    #   redraws only those (see takeDirtyCells).
+    #
+    # Parameters:
+    #   coords - the cells, on the real board ((int,int)[])
+    ##
+    def markDirty(self, coords):
+        if self.dirtyCells is not None:
+            self.dirtyCells.update(coords)
+
+    ##
+    # takeDirtyCells
+    # Description: The cells changed since the last call.  Nothing is
+    #   tracked until this is first called, so a game nobody watches pays
+    #   nothing for it.
+    #
+    # Returns: a set of (int,int), or None if every cell may have changed
+    ##
+    def takeDirtyCells(self):
+        dirty = self.dirtyCells
+        self.dirtyCells = set()
+        return dirty
+
+    ##
+    # forfeit
+    # Description: Ends the game with a loss for the player whose turn it is.
+    ##
+    def forfeit(self, reason, message):
+        if self.verbose:
+            print("AI ERROR: " + self.currentPlayers[self.state.whoseTurn].author + ": " + message)
+        self.finish(1 - self.state.whoseTurn, reason, message)
+
+    ##
+    # finish
+    # Description: Ends the game and tells the players how they did.
+    #
+    # Parameters:
+    #   winner - the ID of the winning player, or None if nobody won (int)
+    #   reason - why the game ended (str)
+    #   message - details of an illegal action (str)
+    ##
+    def finish(self, winner, reason, message=None):
+        self.gameOver = True
+        self.winner = winner
+        self.reason = reason
+        self.message = message
+        if self.recorder is not None:
+            self.recorder.endGame(winner, reason, message)
+        for playerId in (PLAYER_ONE, PLAYER_TWO):
+            self.currentPlayers[playerId].registerWin(playerId == winner)
+
+    ##
+    # errorReport
+    #
+    # Description:  Explains why a move was rejected.  Only printed in
+    # verbose mode; the result's message records the illegal move itself.
+    #
+    # Parameters:
+    #   msg - the message to send
+    #
+    def errorReport(self, msg):
+        if self.verbose:
+            print(msg)
+
+    ##
+    # constrsFor
+    # Description: The constructions a player places in a setup phase.
+    #   Phase 1: 1 anthill/queen, 1 tunnel/worker and 9 grass on their own
+    #   side.  Phase 2: 2 food on the opponent's side.
+    #
+    # Parameters:
+    #   phase - SETUP_PHASE_1 or SETUP_PHASE_2 (int)
+    #   playerId - the player placing them (int)
+    #
+    # Returns: the Constructions to place, in order
+    ##
+    def constrsFor(self, phase, playerId):
+        if phase == SETUP_PHASE_1:
+            constrsToPlace = []
+            constrsToPlace += [Building(None, ANTHILL, playerId)]
+            constrsToPlace += [Building(None, TUNNEL, playerId)]
+            constrsToPlace += [Construction(None, GRASS) for i in range(0, 9)]
+            return constrsToPlace
+        return [Construction(None, FOOD) for i in range(0, 2)]
+
+    ##
+    # placeConstrs
+    # Description: Puts a valid placement on the board.  The placed
+    #   constructions are popped off the front of constrsToPlace.
+    #
+    # Parameters:
+    #   constrsToPlace - the constructions still to be placed (Construction[])
+    #   targets - where to put them, in the current player's view ((int,int)[])
+    ##
+    def placeConstrs(self, constrsToPlace, targets):
+        if self.recorder is not None:
+            self.recorder.placement(self.state.whoseTurn, [self.state.coordLookup(target, self.state.whoseTurn)
+                                                           for target in targets], self.thinkTime)
+        for target in targets:
+            # translate coords to match player
+            target = self.state.coordLookup(target, self.state.whoseTurn)
+            # get construction to place
+            constr = constrsToPlace.pop(0)
+            # give constr its coords
+            constr.coords = target
+            self.markDirty((target,))
+            # put constr on board and in the inventory
+            if constr.type == ANTHILL or constr.type == TUNNEL:
+                self.state.addConstr(constr, self.state.whoseTurn)
+            else:  # grass and food
+                self.state.addConstr(constr, NEUTRAL)
+
+    ##
+    # advanceSetup
+    # Description: Moves on once the current player has placed everything:
+    #   hands the turn to the other player, and after the last placement
+    #   starts the play phase.
+    #
+    # Returns: the constructions the next player has to place
+    ##
+    def advanceSetup(self):
+        constrsToPlace = []
+        if self.state.phase == SETUP_PHASE_1:
+            if self.state.whoseTurn == PLAYER_ONE:
+                constrsToPlace = self.constrsFor(SETUP_PHASE_1, PLAYER_TWO)
+            elif self.state.whoseTurn == PLAYER_TWO:
+                constrsToPlace = self.constrsFor(SETUP_PHASE_2, PLAYER_ONE)
+                self.state.phase = SETUP_PHASE_2
+        elif self.state.phase == SETUP_PHASE_2:
+            if self.state.whoseTurn == PLAYER_ONE:
+                constrsToPlace = self.constrsFor(SETUP_PHASE_2, PLAYER_TWO)
+            elif self.state.whoseTurn == PLAYER_TWO:
+                self.startPlayPhase()
+
+        # change player turn in state
+        self.state.whoseTurn = (self.state.whoseTurn + 1) % 2
+        return constrsToPlace
+
+    ##
+    # startPlayPhase
+    # Description: Adds each player's queen and first worker, gives them
+    #   their starting food and switches to the play phase.
+    ##
+    def startPlayPhase(self):
+        p1inventory = self.state.inventories[PLAYER_ONE]
+        p2inventory = self.state.inventories[PLAYER_TWO]
+        # get anthill coords
+        p1AnthillCoords = p1inventory.constrs[0].coords
+        p2AnthillCoords = p2inventory.constrs[0].coords
+        # get tunnel coords
+        p1TunnelCoords = p1inventory.constrs[1].coords
+        p2TunnelCoords = p2inventory.constrs[1].coords
+        # create queen and worker ants
+        p1Queen = Ant(p1AnthillCoords, QUEEN, PLAYER_ONE)
+        p2Queen = Ant(p2AnthillCoords, QUEEN, PLAYER_TWO)
+        p1Worker = Ant(p1TunnelCoords, WORKER, PLAYER_ONE)
+        p2Worker = Ant(p2TunnelCoords, WORKER, PLAYER_TWO)
+        # put ants on board and in the inventories
+        self.state.addAnt(p1Queen)
+        self.state.addAnt(p2Queen)
+        self.state.addAnt(p1Worker)
+        self.state.addAnt(p2Worker)
+        self.markDirty((p1AnthillCoords, p2AnthillCoords, p1TunnelCoords, p2TunnelCoords))
+        # give the players the initial food
+        p1inventory.foodCount = 1
+        p2inventory.foodCount = 1
+        # change to play phase
+        self.state.phase = PLAY_PHASE
+        self.prepareTerrain()
+
+    ##
+    # prepareTerrain
+    # Description: Constructions are fixed once play begins, so builds the
+    #   terrain tables for both players' views of the board before either
+    #   player needs them.
+    ##
+    def prepareTerrain(self):
+        self.state.getTerrain()
+        flipped = self.state.clone()
+        flipped.flipBoard()
+        flipped.getTerrain()
+
+    ##
+    # translateMove
+    # Description: Converts the coordinates of a move from the current
+    #   player's view of the board to the real board, in place.  Malformed
+    #   coordinates are left for isValidMove to reject.
+    ##
+    def translateMove(self, move):
+        if type(move) != Move or type(move.coordList) != list:
+            return
+        for i in range(0, len(move.coordList)):
+            if self.isValidCoord(move.coordList[i]):
+                move.coordList[i] = self.state.coordLookup(move.coordList[i], self.state.whoseTurn)
+
+    ##
+    # applyMoveAnt
+    # Description: Carries out a valid MOVE_ANT move.
+    #
+    # Returns: the Ant that moved
+    ##
+    def applyMoveAnt(self, move):
+        startCoord = move.coordList[0]
+        endCoord = move.coordList[-1]
+
+        # take ant from start coord
+        antToMove = self.state.board[startCoord[0]][startCoord[1]].ant
+
+        # move ant to last loc in coordList and set hasMoved status
+        self.state.moveAnt(antToMove, (endCoord[0], endCoord[1]))
+        self.state.updateAnt(antToMove, hasMoved = True)
+        self.markDirty((startCoord, endCoord))
+        if self.recorder is not None:
+            self.recorder.move(self.state.whoseTurn, move, self.thinkTime)
+        return antToMove
+
+    ##
+    # applyBuild
+    # Description: Carries out a valid BUILD move.
+    ##
+    def applyBuild(self, move):
+        if self.recorder is not None:
+            self.recorder.move(self.state.whoseTurn, move, self.thinkTime)
+        coord = move.coordList[0]
+        currentPlayerInv = self.state.inventories[self.state.whoseTurn]
+        self.markDirty((coord,))
+
+        # subtract the cost of the item from the player's food count
+        if move.buildType == TUNNEL:
+            currentPlayerInv.foodCount -= CONSTR_STATS[move.buildType][BUILD_COST]
+
+            tunnel = Building(coord, TUNNEL, self.state.whoseTurn)
+            self.state.board[coord[0]][coord[1]].constr = tunnel
+        else:
+            currentPlayerInv.foodCount -= UNIT_STATS[move.buildType][COST]
+
+            ant = Ant(coord, move.buildType, self.state.whoseTurn)
+            ant.hasMoved = True
+            self.state.addAnt(ant)
+
+    ##
+    # endTurn
+    # Description: Carries out an END move: captures, food gathering and
+    #   drop-off for the current player's ants, then passes the turn.
+    ##
+    def endTurn(self):
+        if self.recorder is not None:
+            self.recorder.move(self.state.whoseTurn, Move(END), self.thinkTime)
+        # take care of end of turn business for ants and constructions
+        for ant in self.state.inventories[self.state.whoseTurn].ants:
+            constrUnderAnt = self.state.board[ant.coords[0]][ant.coords[1]].constr
+            if constrUnderAnt != None:
+                # if constr is enemy's and ant hasnt moved, affect capture health of buildings
+                if type(
+                        constrUnderAnt) is Building and not constrUnderAnt.player == self.state.whoseTurn:
+                    self.state.setCaptureHealth(constrUnderAnt, constrUnderAnt.captureHealth - 1)
+                # have all worker ants on food sources gather food
+                elif constrUnderAnt.type == FOOD and ant.type == WORKER:
+                    self.state.updateAnt(ant, carrying = True)
+                # deposit carried food (only workers carry)
+                elif (
+                        constrUnderAnt.type == ANTHILL or constrUnderAnt.type == TUNNEL) and ant.carrying == True:
+                    self.state.inventories[self.state.whoseTurn].foodCount += 1
+                    self.state.updateAnt(ant, carrying = False)
+
+            # reset hasMoved on all ants of player
+            self.state.updateAnt(ant, hasMoved = False)
+            self.markDirty((ant.coords,))
+
+        # switch whose turn it is
+        self.state.whoseTurn = (self.state.whoseTurn + 1) % 2
+
+    ##
+    # validAttackCoords
+    # Description: The enemy ants in range of an ant.
+    #
+    # Parameters:
+    #   attackingAnt - The Ant that could attack (Ant)
+    #
+    # Returns: their coordinates, in the current player's view ((int,int)[])
+    ##
+    def validAttackCoords(self, attackingAnt):
+        validAttackCoords = []
+        opponentId = (self.state.whoseTurn + 1) % 2
+        for ant in self.state.inventories[opponentId].ants:
+            if self.isValidAttack(attackingAnt, ant.coords):
+                # keep track of valid attack coords (flipped for player two)
+                validAttackCoords.append(self.state.coordLookup(ant.coords, self.state.whoseTurn))
+        return validAttackCoords
+
+    ##
+    # applyAttack
+    # Description: Carries out a valid attack.
+    #
+    # Parameters:
+    #   attackingAnt - The Ant that is attacking (Ant)
+    #   attackCoord - The coordinates of the Ant being attacked ((int,int))
+    ##
+    def applyAttack(self, attackingAnt, attackCoord):
+        if self.recorder is not None:
+            self.recorder.attack(self.state.whoseTurn, attackCoord, self.thinkTime)
+        # decrement ants health
+        attackedAnt = self.state.board[attackCoord[0]][attackCoord[1]].ant
+        self.markDirty((attackCoord,))
+        self.state.updateAnt(attackedAnt, health = attackedAnt.health - UNIT_STATS[attackingAnt.type][ATTACK])
+
+        # check for dead ant
+        if attackedAnt.health <= 0:
+            # remove dead ant from board and inventory
+            self.state.removeAnt(attackedAnt)
+
+    #########################################
+    #   # ##### #     ##### ##### ####  #####
+    #   # #     #     #   # #     #   # #
+    ##### ###   #     ##### ###   ####  #####
+    #   # #     #     #     #     #  #      #
+    #   # ##### ##### #     ##### #   # #####
+    #########################################
+
+    ##
+    # isValidMove(Move)
+    # Description: Checks to see if the move is valid for the current player.
+    #
+    # Parameters:
+    #   move - The Move to check (Move)
+    #
+    # Returns: None if no move is given, true if the given move is valid, or false if the given move is invalid
+    ##
+    def isValidMove(self, move):
+        # check for no move
+        if move == None:
+            self.errorReport("ERROR: Invalid Move: " + str(move))
+            return None
+
+        # check that the move is well-formed typewise (tuples, ints, etc)
+        if type(move) != Move:
+            self.errorReport("ERROR: Invalid Move: " + str(move))
+            self.errorReport("ERROR:  player did not supply an object of type 'Move'")
+            return False
+        if type(move.moveType) != int:
+            self.errorReport("ERROR: Invalid Move: " + str(move))
+            self.errorReport("       Move type must be an integer.")
+            return False
+        # for END or UNDO type moves, lots we don't need to check
+        if move.moveType == END or move.moveType == UNDO:
+            return True
+        if move.coordList == None or type(move.coordList) != list or len(move.coordList) == 0:
+            self.errorReport("ERROR: Invalid Move: " + str(move))
+            self.errorReport("       The coordinate list is empty!")
+            return False
+        index = 0
+        for coord in move.coordList:
+            if (type(coord) != tuple):
+                self.errorReport("ERROR: Invalid Move: " + str(move))
+                self.errorReport("       Coordinate at index " + str(index) + " is not a tuple.")
+                return False
+            if (len(coord) != 2):
+                self.errorReport("ERROR: Invalid Move: " + str(move))
+                self.errorReport(
+                    "       Coordinate at index " + str(index) + " has " + str(len(coord)) + "entries instead of 2.")
+                return False
+            if (type(coord[0]) != int) or (type(coord[1]) != int):
+                self.errorReport("ERROR: Invalid Move: " + str(move))
+                self.errorReport("       Coordinate at index " + str(index) + " contains a value that is not an int.")
+                return False
+            index += 1
+        if type(move.buildType) != type(None) and type(move.buildType) != int:
+            return False
+
+        # for MOVE_ANT and BUILD type moves
+        if move.moveType == MOVE_ANT:
+            firstCoord = move.coordList[0]
+            # check valid start location (good coords and ant ownership)
+            if self.checkMoveStart(firstCoord):
+                # get ant to move
+                antToMove = self.state.board[firstCoord[0]][firstCoord[1]].ant
+                movePoints = UNIT_STATS[antToMove.type][MOVEMENT]
+                previousCoord = None
+
+                index = 0
+                for coord in move.coordList:
+                    # if first runthough, need to set up previous coord
+                    if previousCoord == None:
+                        previousCoord = coord
+                        continue
+                    # if any to-coords are invalid, return invalid move
+                    if not self.checkMovePath(previousCoord, coord):
+                        self.errorReport("ERROR: Invalid Move: " + str(move))
+                        self.errorReport("       Illegal movement path at index" + str(index))
+                        return False
+
+                    # subtract cost of loc from movement points
+                    constrAtLoc = self.state.board[coord[0]][coord[1]].constr
+                    if constrAtLoc == None or UNIT_STATS[antToMove.type][IGNORES_GRASS]:
+                        movePoints -= 1
+                    else:
+                        movePoints -= CONSTR_STATS[constrAtLoc.type][MOVE_COST]
+
+                    previousCoord = coord
+                    index += 1
+
+                # Check for Queen ant trying to leave her territory
+                if (antToMove.type == QUEEN):
+                    for coord in move.coordList:
+                        if (coord[1] == BOARD_LENGTH / 2 - 1) \
+                                or (coord[1] == BOARD_LENGTH / 2):
+                            self.errorReport("ERROR: Invalid Move: " + str(move))
+                            self.errorReport("       Queen ant may not leave her own territory")
+                            return False
+
+                # within movement range and hasn't moved yet?
+                if (movePoints < 0):
+                    self.errorReport("ERROR: Invalid Move: " + str(move))
+                    self.errorReport("       Ant has insufficient movement points for this move")
+                    return False
+                if antToMove.hasMoved:
+                    self.errorReport("ERROR: Invalid Move: " + str(move))
+                    self.errorReport("       Ant has already made a move this turn")
+                    return False
+                else:
+                    return True
+
+        elif move.moveType == BUILD:
+            # coord list must contain one point for build
+            if len(move.coordList) != 1:
+                self.errorReport("ERROR: Invalid Move: " + str(move))
+                self.errorReport("       for a BUILD move, the coordinate list should contain exactly 1 coordinate")
+                return False
+
+            buildCoord = move.coordList[0]
+            # check valid start location
+            if self.checkBuildStart(buildCoord):
+                # we're building either an ant or constr for sure ->
+                # -> no longer able to build tunnels, so can only build ants.
+
+                if self.state.board[buildCoord[0]][buildCoord[1]].ant == None:
+                    # we know we're building an ant
+                    buildCost = None
+                    # check buildType for valid ant
+                    if move.buildType == WORKER:
+                        buildCost = UNIT_STATS[WORKER][COST]
+                    elif move.buildType == DRONE:
+                        buildCost = UNIT_STATS[DRONE][COST]
+                    elif move.buildType == SOLDIER:
+                        buildCost = UNIT_STATS[SOLDIER][COST]
+                    elif move.buildType == R_SOLDIER:
+                        buildCost = UNIT_STATS[R_SOLDIER][COST]
+                    else:
+                        self.errorReport("ERROR: Invalid Move: " + str(move))
+                        self.errorReport("       the buildType must be one of:  WORKER, DRONE, SOLDIER or R_SOLDIER.")
+                        return False
+
+                    # check the player has enough food
+                    currFood = self.state.inventories[self.state.whoseTurn].foodCount
+                    if currFood >= buildCost:
+                        # self.ui.notify("")
+                        return True
+                    else:
+                        self.errorReport("ERROR: Invalid Move: " + str(move))
+                        self.errorReport("       Player has " + str(currFood) + " food but needs " + str(
+                            buildCost) + " to build this ant")
+                        return False
+
+
+                # Below is the code that allows a player to build more tunnels during the course of a game,
+                # in case it is ever desired to be a part of the game again.
+
+                # else:
+                #     # we know we're building a construction
+                #     adjacentCoords = []
+                #     adjacentCoords.append(addCoords(buildCoord, (0, -1)))
+                #     adjacentCoords.append(addCoords(buildCoord, (0, 1)))
+                #     adjacentCoords.append(addCoords(buildCoord, (-1, 0)))
+                #     adjacentCoords.append(addCoords(buildCoord, (1, 0)))
+                #
+                #     # check that there's no food in adjacent locations
+                #     for aCoord in adjacentCoords:
+                #         if aCoord[0] >= 0 and aCoord[0] < 10 and aCoord[1] >= 0 and aCoord[1] < 10:
+                #             if (self.state.board[aCoord[0]][aCoord[1]].constr != None and
+                #                         self.state.board[aCoord[0]][aCoord[1]].constr.type == FOOD):
+                #                 self.errorReport("ERROR: Invalid Move: " + str(move))
+                #                 self.errorReport("       Cannot tunnel build next to food.")
+                #                 return False
+                #
+                #     buildCost = CONSTR_STATS[TUNNEL][BUILD_COST]
+                #     if self.state.inventories[self.state.whoseTurn].foodCount >= buildCost:
+                #         # self.ui.notify("")
+                #         return True
+                #     else:
+                #         self.errorReport("ERROR: Invalid Move: " + str(move))
+                #         self.errorReport("       Must have at least " + str(buildCost) + " food to build a tunnel.")
+                #         return False
+
+
+            else:  # invalid build start
+                self.errorReport("ERROR: Invalid Move: " + str(move))
+                self.errorReport("       Build location invalid.  Possible cause:")
+                loc = self.state.board[buildCoord[0]][buildCoord[1]]
+                if loc.ant == None:  # building ant
+                    self.errorReport("         - Anthill does not belong to current player")
+                else:
+                    if (move.buildType != TUNNEL):
+                        self.errorReport("         - Anthill is already occupied")
+                    elif (loc.ant.hasMoved):
+                        self.errorReport("         - Worker ant has already moved this turn")
+                    else:
+                        self.errorReport("         - Worker ant does not belong to current player")
+        else:
+            # invalid numeric move type
+            return False
+
+    ##
+    # isValidPlacement
+    # Description: Checks that the given placement of Constructions is valid
+    #
+    # Paramters:
+    #   items - The items to place (Construction[])
+    #   targets - A list of the coordinates to place the items at ((int,int)[])
+    #
+    # Returns None if no target is given, true if it is a valid placement, or false if it is an invalid placement
+    ##
+    def isValidPlacement(self, items, targets):
+        # check for well-formed input of targets (from players)
+        if type(targets) == type(None) or type(targets) != list:
+            return False
+            # If no target, return None (human vs ai caught by caller)
+        if len(targets) == 0:
+            return None
+        for coord in targets:
+            if not self.isValidCoord(coord):
+                return False
+
+        for i in range(0, len(targets)):
+            # Nobody can place in the center two rows of the board or on their opponents side
+
+            # check item type
+            if items[i].type == ANTHILL or items[i].type == TUNNEL or items[i].type == GRASS:
+                # check targets[i] is within proper boundaries y-wise
+                # must be on own side
+                if not self.isInHomeTerritory(targets[i]):
+                    return False
+            # check item type
+            elif items[i].type == FOOD:
+                # check targets[i] is within proper boundaries y-wise
+                # must be on opponent's side
+                if not self.isInEnemyTerritory(targets[i]):
+                    return False
+            else:
+                # I don't know what this type is.
+                return False
+
+            # change target to access appropriate players locations
+            aTarget = self.state.coordLookup(targets[i], self.state.whoseTurn)
+            # make sure nothing is there yet
+            if self.state.board[aTarget[0]][aTarget[1]].constr:
+                return False
+            # This item should be placed and this location becomes occupied
+            self.state.board[aTarget[0]][aTarget[1]].constr = items[i]
+
+        return True
+
+    ##
+    # isValidAttack
+    # Description: Determines whether the attack with the given parameters is valid
+    #   Attacking ant is assured to exist and belong to the player whose turn it is
+    #
+    # Parameters:
+    #   attackingAnt - The Ant that is attacking (Ant)
+    #   attackCoord - The coordinates of the Ant that is being attacked ((int,int))
+    #
+    # Returns: None if there is no attackCoord, true if valid attack, or false if invalid attack
+    ##
+    def isValidAttack(self, attackingAnt, attackCoord):
+        if attackCoord == None:
+            return None
+
+        # check for well-formed input from players
+        if not self.isValidCoord(attackCoord):
+            return False
+
+        attackLoc = self.state.board[attackCoord[0]][attackCoord[1]]
+
+        if attackLoc.ant == None or attackLoc.ant.player == attackingAnt.player:
+            return False
+
+        # we know we have an enemy ant
+        range = UNIT_STATS[attackingAnt.type][RANGE]
+        diffX = abs(attackingAnt.coords[0] - attackCoord[0])
+        diffY = abs(attackingAnt.coords[1] - attackCoord[1])
+
+        # pythagoras would be proud
+        if range >= diffX + diffY:
+            # return True if within range
+            return True
+        else:
+            return False
+
+    ##
+    # isValidCoord
+    # Description: Retruns whether this coord represents a valid board location.
+    #
+    # Parameters:
+    #   coord - The coord to be checked trying to be checked ((int, int))
+    #
+    # Returns: True if the coordinate is between (0,0) and (9,9)
+    ##
+    def isValidCoord(self, coord):
+        # check for well-formed coord
+        if type(coord) != tuple or len(coord) != 2 or type(coord[0]) != int or type(coord[1]) != int:
+            return False
+
+        # check boundaries
+        if coord[0] < 0 or coord[1] < 0 or coord[0] >= BOARD_LENGTH or coord[1] >= BOARD_LENGTH:
+            return False
+
+        return True
+
+    ##
+    # isInHomeTerritory
+    #
+    # Description: determines whether the position is in the player's
+    # home territory
+    #
+    # Parameters:
+    #   coord - The coord to be checked trying to be checked ((int, int))
+    #
+    # Returns: True if it is and False otherwise
+    #
+    ##
+    def isInHomeTerritory(self, coord):
+        if not self.isValidCoord(coord):
+            return False
+        if not (coord[1] >= 0 and coord[1] < BOARD_LENGTH / 2 - 1):
+            return False
+        return True
+
+    ##
+    # isInEnemyTerritory
+    #
+    # Description: determines whether the position is in the player's
+    # enemy's territory
+    #
+    # Parameters:
+    #   coord - The coord to be checked trying to be checked ((int, int))
+    #
+    # Returns: True if it is and False otherwise
+    #
+    ##
+    def isInEnemyTerritory(self, coord):
+        if not self.isValidCoord(coord):
+            return False
+        if not (coord[1] < BOARD_LENGTH and coord[1] >= BOARD_LENGTH / 2 + 1):
+            return False
+        return True
+
+    ##
+    # checkMoveStart
+    # Description: Checks if the location is valid to move from.
+    #  (bounds and ant ownership)
+    #
+    # Parameters:
+    #   coord - The starting point for the move ((int, int))
+    #
+    # Returns: True if it is a valid starting point for a move and false if not
+    ##
+    def checkMoveStart(self, coord):
+        # check location is on board
+        if self.isValidCoord(coord):
+            antToMove = self.state.board[coord[0]][coord[1]].ant
+            # check that an ant exists at the loc
+            if antToMove != None:
+                # check that it's the player's ant and that it hasn't moved
+                if antToMove.player == self.state.whoseTurn and not antToMove.hasMoved:
+                    return True
+
+        return False
+
+    ##
+    # checkMovePath
+    # Description: Checks if the location is valid to move to.
+    #  (clear path, adjacent locations)
+    #
+    # Parameters:
+    #   fromCoord - The Ant's current coordinate ((int, int))
+    #   toCoord - The coorinate to move the Ant to ((int, int))
+    #
+    # Returns: True if it is a valid move and false otherwise
+    #
+    # Note: fromCoord must always have been checked by the time it's passed
+    #  (either in checkMoveStart or previous checkMovePath call)
+    ##
+    def checkMovePath(self, fromCoord, toCoord):
+        # check location is on board
+        if self.isValidCoord(toCoord):
+            # check that squares are adjacent (difference on only one axis is 1)
+            if ((abs(fromCoord[0] - toCoord[0]) == 1 and abs(fromCoord[1] - toCoord[1]) == 0) or
+                    (abs(fromCoord[0] - toCoord[0]) == 0 and abs(fromCoord[1] - toCoord[1]) == 1)):
+                antAtLoc = self.state.board[toCoord[0]][toCoord[1]].ant
+                # check if an ant exists at the loc
+                if antAtLoc == None:
+                    return True
+
+        return False
+
+    ##
+    # checkBuildStart
+    # Description: Checks if the location is valid to build from.
+    #  (bounds and building ownership)
+    #
+    # Parameters:
+    #   coord - The coordinate trying to be used to build ((int, int))
+    #
+    # Returns: True if it is a valid build location and false otherwise
+    ##
+    def checkBuildStart(self, coord):
+        # check location is on board
+        if self.isValidCoord(coord):
+            loc = self.state.board[coord[0]][coord[1]]
+            # check that an empty anthill exists at the loc
+            if loc.constr != None and loc.constr.type == ANTHILL and loc.ant == None:
+                # check that it's the player's anthill
+                if loc.constr.player == self.state.whoseTurn:
+                    return True
+            # check that an ant exists at an empty location
+            elif loc.ant != None and loc.ant.type == WORKER and loc.constr == None:
+                # check that it's the player's ant and it hasn't moved
+                if loc.ant.player == self.state.whoseTurn and not loc.ant.hasMoved:
+                    return True
+
+        return False
+
+    ##
+    # victoryReason(int)
+    # Description: Determines whether the game has ended in victory for the given player, and how.
+    #
+    # Parameters:
+    #   playerId - The ID of the player being checked for winning (int)
+    #
+    # Returns: the reason the player has won (str), or None if they have not
+    ##
+    def victoryReason(self, playerId):
+        opponentId = 1 - playerId
+
+        if self.state.phase != PLAY_PHASE:
+            return None
+        if self.state.inventories[opponentId].getQueen() == None:
+            return QUEEN_KILLED
+        if self.state.inventories[opponentId].getAnthill().captureHealth <= 0:
+            return ANTHILL_CAPTURED
+        if self.state.inventories[playerId].foodCount >= FOOD_GOAL:
+            return FOOD_GOAL_REACHED
+        if (self.state.inventories[opponentId].foodCount == 0 and
+                len(self.state.inventories[opponentId].ants) == 1):
+            return OUT_OF_ANTS
+        return None
+
+    ##
+    # hasWon(int)
+    # Description: Determines whether the game has ended in victory for the given player.
+    #
+    # Parameters:
+    #   playerId - The ID of the player being checked for winning (int)
+    #
+    # Returns: True if the player with playerId has won the game.
+    ##
+    def hasWon(self, playerId):
+        return self.victoryReason(playerId) is not None
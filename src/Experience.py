@@ -0,0 +1,338 @@
+import os, sys, time, argparse, importlib
+from array import array
+from GameRecord import writeVarint, readVarint
+
+#
+# Experience.py
+#
+# An append-only log of what a learning agent saw in each game it played
+# (its experience), and an offline trainer that learns a utility table from
+# the log alone, without playing any games.
+#
+# An episode is one game from one player's side: the category index (see
+# the HW6 agent's categoryIndex) and reward of every state the player moved
+# in, then the outcome, +1 for a win and -1 otherwise.  A log starts with
+# MAGIC and then holds episodes one after another, each:
+#
+#   step count (varint), outcome, then per step: category index (varint),
+#   reward
+#
+# Rewards and outcomes are zigzag varints of the value times REWARD_SCALE,
+# rounded, so the HW6 rewards (-0.001 a move, +-1) take a byte or two.  An
+# episode is written with a single write and flushed, so a log can be read
+# while it is being added to; an episode cut short at the end of the file
+# is ignored.
+#
+# From the command line, for a sweep over the settings:
+#
+#   python Experience.py experience.log                     train with the defaults
+#   python Experience.py experience.log -l 0.5 0.8 0.95     one run per lambda
+#   python Experience.py experience.log -o table.bin        save the table (HW6 format)
+#
+
+MAGIC = b"ANTEXP1\n"
+REWARD_SCALE = 1000
+
+# the agent whose UtilityTable a trained table is saved as
+DEFAULT_AGENT = "martinsi26_leda27_HW6"
+
+
+def writeSigned(out, value):
+    n = int(round(value * REWARD_SCALE))
+    writeVarint(out, n * 2 if n >= 0 else -n * 2 - 1)
+
+
+def readSigned(data, pos):
+    zigzag, pos = readVarint(data, pos)
+    n = -(zigzag + 1) // 2 if zigzag & 1 else zigzag // 2
+    return n / REWARD_SCALE, pos
+
+
+##
+# ExperienceWriter
+# Description: Appends episodes to a log.
+#
+# Variables:
+#   path - the log file
+#   file - the log, open for appending
+##
+class ExperienceWriter(object):
+    ##
+    # __init__
+    # Description: Opens a log for appending, creating it if need be.
+    #
+    # Parameters:
+    #   path - the log file (str)
+    ##
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+            self.file.flush()
+
+    ##
+    # episode
+    # Description: Adds one episode to the log.
+    #
+    # Parameters:
+    #   steps - (category index, reward) of each state moved in, in order
+    #   outcome - +1 if the player won, -1 otherwise (float)
+    ##
+    def episode(self, steps, outcome):
+        out = bytearray()
+        writeVarint(out, len(steps))
+        writeSigned(out, outcome)
+        for index, reward in steps:
+            writeVarint(out, index)
+            writeSigned(out, reward)
+        self.file.write(out)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+##
+# ExperienceLog
+# Description: A whole log read into flat arrays: the steps of every episode
+#   one after another, and where each episode starts.
+#
+# Variables:
+#   indices - category index of every step (array of Q)
+#   rewards - reward of every step (array of d)
+#   starts - the first step of every episode, and then the number of steps
+#       (array of Q, one longer than the number of episodes)
+#   outcomes - outcome of every episode (array of d)
+##
+class ExperienceLog(object):
+    ##
+    # __init__
+    # Description: Reads a log.
+    #
+    # Parameters:
+    #   path - the log file (str)
+    ##
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError("%s is not an experience log" % path)
+        self.indices = array("Q")
+        self.rewards = array("d")
+        self.starts = array("Q", [0])
+        self.outcomes = array("d")
+
+        pos = len(MAGIC)
+        while pos < len(data):
+            try:
+                count, pos = readVarint(data, pos)
+                outcome, pos = readSigned(data, pos)
+                steps = []
+                for i in range(count):
+                    index, pos = readVarint(data, pos)
+                    reward, pos = readSigned(data, pos)
+                    steps.append((index, reward))
+            except IndexError:
+                # an episode still being written
+                break
+            for index, reward in steps:
+                self.indices.append(index)
+                self.rewards.append(reward)
+            self.starts.append(len(self.indices))
+            self.outcomes.append(outcome)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    ##
+    # episode
+    # Description: The steps of an episode as (category index, reward) and
+    #   its outcome.
+    ##
+    def episode(self, i):
+        start, end = self.starts[i], self.starts[i + 1]
+        return list(zip(self.indices[start:end], self.rewards[start:end])), self.outcomes[i]
+
+
+##
+# BatchTD
+# Description: Learns utilities from a log by forward-view TD(lambda).  The
+#   categories in the log are numbered 0..n-1 and their utilities kept in a
+#   flat array.  Each pass works through the episodes a batch at a time:
+#   with the utilities held still, it works out the lambda-return of every
+#   step of the batch, from the end of each episode back,
+#
+#       G = r + discount * ((1 - lambda) * U(next state) + lambda * G(next step))
+#
+#   where the last step's return is r + discount * outcome, and then moves
+#   the utility of each category alpha of the way toward the mean return of
+#   its steps.
+#
+# Variables:
+#   log - the ExperienceLog
+#   categories - category index by number (list)
+#   steps - the number of each step's category (array of L)
+#   visits - how many steps each category has (array of Q)
+#   utilities - utility by number (array of d)
+##
+class BatchTD(object):
+    ##
+    # __init__
+    # Description: Numbers the categories in a log.
+    #
+    # Parameters:
+    #   log - the ExperienceLog
+    #   initial - starting utilities by category index (dict), or None for 0
+    ##
+    def __init__(self, log, initial=None):
+        self.log = log
+        numbers = {}
+        self.steps = array("L")
+        for index in log.indices:
+            number = numbers.get(index)
+            if number is None:
+                number = numbers[index] = len(numbers)
+            self.steps.append(number)
+        self.categories = list(numbers)
+        self.visits = array("Q", bytes(8 * len(numbers)))
+        for number in self.steps:
+            self.visits[number] += 1
+        initial = initial or {}
+        self.utilities = array("d", [initial.get(index, 0.0) for index in self.categories])
+
+    ##
+    # returns
+    # Description: The lambda-return of every step of episodes first..last-1,
+    #   in step order, with the current utilities.
+    ##
+    def returns(self, first, last, discount, lambda_):
+        steps = self.steps
+        rewards = self.log.rewards
+        U = self.utilities
+        starts = self.log.starts
+        G = array("d", bytes(8 * (starts[last] - starts[first])))
+        base = starts[first]
+        for e in range(first, last):
+            start, end = starts[e], starts[e + 1]
+            if start == end:
+                continue
+            g = rewards[end - 1] + discount * self.log.outcomes[e]
+            G[end - 1 - base] = g
+            for t in range(end - 2, start - 1, -1):
+                g = rewards[t] + discount * ((1 - lambda_) * U[steps[t + 1]] + lambda_ * g)
+                G[t - base] = g
+        return G
+
+    ##
+    # train
+    # Description: Passes over the log.
+    #
+    # Parameters:
+    #   alpha, discount, lambda_ - as the agent uses them
+    #   epochs - the number of passes (int)
+    #   batch - episodes per update, or None for the whole log at once
+    ##
+    def train(self, alpha=0.1, discount=0.9, lambda_=0.8, epochs=20, batch=None):
+        episodes = len(self.log)
+        batch = batch or max(1, episodes)
+        starts = self.log.starts
+        U = self.utilities
+        for epoch in range(epochs):
+            for first in range(0, episodes, batch):
+                last = min(first + batch, episodes)
+                G = self.returns(first, last, discount, lambda_)
+                error = {}
+                count = {}
+                base = starts[first]
+                for t in range(starts[first], starts[last]):
+                    number = self.steps[t]
+                    error[number] = error.get(number, 0.0) + G[t - base] - U[number]
+                    count[number] = count.get(number, 0) + 1
+                for number, total in error.items():
+                    U[number] += alpha * total / count[number]
+
+    ##
+    # error
+    # Description: The mean squared difference between each step's
+    #   lambda-return and its utility, how far training has left to go.
+    ##
+    def error(self, discount=0.9, lambda_=0.8):
+        if not len(self.steps):
+            return 0.0
+        G = self.returns(0, len(self.log), discount, lambda_)
+        U = self.utilities
+        return sum((g - U[number]) ** 2 for g, number in zip(G, self.steps)) / len(self.steps)
+
+    ##
+    # items
+    # Description: (category index, utility, visits) of every category.
+    ##
+    def items(self):
+        return zip(self.categories, self.utilities, self.visits)
+
+
+##
+# saveTable
+# Description: Writes learned utilities as an agent's UtilityTable file,
+#   replacing whatever is there.
+#
+# Parameters:
+#   items - (category index, utility, visits) of every category
+#   path - the table file (str)
+#   agent - the agent module whose UtilityTable is written (str)
+##
+def saveTable(items, path, agent=DEFAULT_AGENT):
+    if "AI" not in sys.path:
+        sys.path.insert(0, "AI")
+    module = importlib.import_module(agent)
+    partial = "%s.%d" % (path, os.getpid())
+    table = module.UtilityTable(partial, True)
+    table.load(items)
+    table.close()
+    os.replace(partial, path)
+
+
+##
+# main
+# Description: The command line described at the top of this file.
+##
+def main(argv):
+    parser = argparse.ArgumentParser(description="Learn a utility table from an experience log.")
+    parser.add_argument("log", help="an experience log written by a training agent")
+    parser.add_argument("-a", "--alpha", type=float, nargs="+", default=[0.1])
+    parser.add_argument("-d", "--discount", type=float, nargs="+", default=[0.9])
+    parser.add_argument("-l", "--lambda", dest="lambda_", type=float, nargs="+", default=[0.8])
+    parser.add_argument("-n", "--epochs", type=int, default=20, help="passes over the log")
+    parser.add_argument("-b", "--batch", type=int, help="episodes per update (default: all)")
+    parser.add_argument("-o", "--out", help="save the table here (only with one setting of each)")
+    parser.add_argument("--agent", default=DEFAULT_AGENT, help="the agent whose table format is saved")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    log = ExperienceLog(args.log)
+    print("%d episodes, %d steps, read in %.2fs" % (len(log), len(log.indices), time.perf_counter() - start))
+    settings = [(alpha, discount, lambda_) for alpha in args.alpha
+                for discount in args.discount for lambda_ in args.lambda_]
+    if args.out and len(settings) > 1:
+        parser.error("--out needs a single alpha, discount and lambda")
+
+    for alpha, discount, lambda_ in settings:
+        start = time.perf_counter()
+        learner = BatchTD(log)
+        learner.train(alpha, discount, lambda_, args.epochs, args.batch)
+        print("alpha %-5g discount %-5g lambda %-5g  %d categories  error %.6f  %.2fs"
+              % (alpha, discount, lambda_, len(learner.categories), learner.error(discount, lambda_),
+                 time.perf_counter() - start))
+        if args.out:
+            saveTable(learner.items(), args.out, args.agent)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
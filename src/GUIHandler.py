@@ -1,5 +1,6 @@
 import tkinter
 import os
+import threading
 from sys import platform
 from Game import *
 from GameState import *
@@ -147,6 +148,12 @@ class GUIHandler:
         #self.setSeasonalGraphics()
         self.setup = True
 
+        # states posted by the game thread wait here, one at a time, to be
+        # drawn by the Tk thread at the next frame
+        self.frameLock = threading.Lock()
+        self.frame = None
+        self.root.after(0, self.renderFrame)
+
     # def menuPressed(self):
     #     print("Omg a menu button was pressed!")
 
@@ -162,6 +169,7 @@ class GUIHandler:
         for r in resets:
             self.gameHandler.textures[r] = tkinter.PhotoImage(file="Textures/"+r+".gif")
         self.gameHandler.textures["hat"] = None
+        self.gameHandler.sprites.clear()
         self.reDrawBoard()
 
     def loadSecret(self, secret):
@@ -170,6 +178,7 @@ class GUIHandler:
             for key in info.keys():
                 self.gameHandler.textures[key] = tkinter.PhotoImage(data=info[key])
 
+        self.gameHandler.sprites.clear()
         self.reDrawBoard()
 
     def secretPressed(self, event = None):
@@ -266,11 +275,56 @@ class GUIHandler:
     # updates the current gameState of the GUI and updates the
     # GUI itself if appropriate to do so
     #
-    def showState(self, state):
+    # dirty - the cells that changed since the last state shown, or None
+    #         to redraw the whole board
+    #
+    def showState(self, state, dirty=None):
         self.currentState = state
 
         if self.currentFrame == 2 and self.currentState is not None:
-            self.gameHandler.setToGameState(state)
+            self.gameHandler.setToGameState(state, dirty)
+
+    ##
+    # postState
+    #
+    # called from the game thread: leaves a state in the mailbox for the
+    # next frame.  A state still waiting there is replaced, and the cells it
+    # changed are added to this one's.
+    #
+    # state - a GameState the game thread will not touch again
+    # dirty - the cells changed since the last state posted, or None
+    # text - instruction text to show with it, or None
+    #
+    def postState(self, state, dirty, text = None):
+        with self.frameLock:
+            if self.frame is not None:
+                waitingDirty = self.frame[1]
+                dirty = None if dirty is None or waitingDirty is None else waitingDirty | dirty
+            self.frame = (state, dirty, text)
+
+    ##
+    # framePending
+    #
+    # whether a posted state is still waiting to be drawn
+    #
+    def framePending(self):
+        return self.frame is not None
+
+    ##
+    # renderFrame
+    #
+    # runs on the Tk thread, game.fps times a second: draws the state
+    # waiting in the mailbox, if there is one
+    #
+    def renderFrame(self):
+        with self.frameLock:
+            frame, self.frame = self.frame, None
+        if frame is not None:
+            state, dirty, text = frame
+            self.showState(state, dirty)
+            if text is not None:
+                self.gameHandler.setInstructionText(text)
+        self.root.after(max(1, int(1000 / self.game.fps)), self.renderFrame)
 
     ##
     # setPlayers
@@ -9,18 +9,21 @@ from Location import *
 from Ant import *
 from Move import *
 from Player import Player
+from Engine import Engine, BAD_PLACEMENT, BAD_MOVE, BAD_ATTACK
+from RemotePlayer import RemotePlayer
 import traceback
 from GUIHandler import *
 import threading
 import time
 import importlib
 import argparse
-from threading import Thread
 import functools
 
 from functools import partial
 import copy
 import InfoScraper as Is
+import Tournament
+from GameRecord import GameRecorder
 
 
 class GameData:
@@ -32,9 +35,11 @@ class GameData:
 
 ##
 # Game
-# Description: Keeps track of game logic and manages the play loop.
+# Description: Keeps track of game logic and manages the play loop.  The
+#   rules themselves are inherited from Engine; Game adds the UI, human
+#   players and tournaments on top.
 ##
-class Game(object):
+class Game(Engine):
     ##
     # __init__
     # Description: Initializes the game's attributes and UI.
@@ -89,6 +94,19 @@ class Game(object):
         self.pauseOnStart    = False
         self.pauseConditions = []
         self.pauseOnIllegalMove = False
+        self.workers         = 1  # processes to play AI vs AI games in
+        self.warnedSequential = False  # told that the timeout rules out workers
+        self.remotePlayers   = {}  # AIs running in their own process, for the timeout
+        self.recorder        = None  # GameRecorder the games are logged to (--record)
+        self.thinkTime       = 0.0
+        self.firstSeed       = None  # seed of the first game (--seed), the next game gets the next one
+        self.gamesSeeded     = 0
+        self.seed            = None  # seed of the current game, or None for a new one
+        self.seedModule      = False  # seed the random module too (--seed-module)
+        self.random          = None
+        self.dirtyCells      = None  # cells to redraw, see Engine.takeDirtyCells
+        self.fps             = 30.0  # how often the board is drawn in AI games
+        self.renderGameEndsOnly = False  # only draw the board at the end of AI games
 
         # other
         self.ee_seasonal = False
@@ -100,6 +118,7 @@ class Game(object):
         # setup GUI
         # this has to be done in the main thread because Tkinter is dumb
         if testing:
+            self.UI = None
             return
 
         # Initializes the UI variables
@@ -415,6 +434,7 @@ class Game(object):
     #
     #           Useful Command Flags:
     #           -v >> Verbose print out game records to console
+    #           -w >> Number of processes to play AI vs AI games in
     #           -h >> Print the command option help page
     #
     #           Example:
@@ -448,6 +468,14 @@ class Game(object):
                             help='February, March, October, December')
         parser.add_argument('-r', '--rules', action='store_true', dest='rules_request', default=False,
                             help='print the rules for the game (includes unit stats, hot keys...)')
+        parser.add_argument('-w', '--workers', metavar='N', type=int, dest='workers', default=1,
+                            help='play AI vs AI games in N processes at once (not with the timeout on)')
+        parser.add_argument('--seed', metavar='N', type=int, dest='seed', default=None,
+                            help='play the games with seeds N, N+1, ... so the run can be repeated')
+        parser.add_argument('--seed-module', action='store_true', dest='seed_module', default=False,
+                            help="also seed Python's random module with each game's seed, for AIs that use it directly")
+        parser.add_argument('--record', metavar='FILE', type=str, dest='record', default=None,
+                            help='append every game played to the game log FILE (see GameRecord.py)')
 
         args = parser.parse_args()
         self.parser_args["numgames"] = args.numgames
@@ -472,6 +500,13 @@ class Game(object):
             parser.error('NumGames must be a positive number')
         if args.verbose:
             self.verbose = True
+        if args.workers < 1:
+            parser.error('Workers must be a positive number')
+        self.workers = args.workers
+        self.firstSeed = args.seed
+        self.seedModule = args.seed_module
+        if args.record is not None:
+            self.recorder = GameRecorder(args.record)
         if args.seasonal_graphics:
             self.ee_seasonal = True
         if (args.RR or args.RRall or args.self or args.all or args.twoP) and args.numgames is None:
@@ -552,6 +587,8 @@ class Game(object):
         self.autorestart = additional['autorestart']
         self.pauseOnStart = additional['pause']
         self.pauseOnIllegalMove = additional['pauseIllegal']
+        self.renderGameEndsOnly = additional.get('endsOnly', False)
+        self.fps = additional.get('fps', self.fps)
         
         if self.timeoutOn:
             self.timeout_limit = float(additional['timeout_limit'])
@@ -616,50 +653,54 @@ class Game(object):
                 self.restartGameList = list(self.gamesToPlay)
 
             self.UI.statsHandler.timeLabel.Start()
-            self.UI.statsHandler.addLogItem()
             if self.UI.paused:
                 self.UI.pausePressed()
             self.running = True
 
-            self.gamesToPlayLock.acquire()
-            game = self.gamesToPlay.pop(0)
-            self.gamesToPlayLock.release()
+            if self.workers > 1 and self.canPlayInParallel(self.gamesToPlay[0]):
+                self.startParallel()
+            else:
+                self.UI.statsHandler.addLogItem()
 
-            self.hasHumanPlayer = game.p1.author == "Human" or game.p2.author == "Human"
+                self.gamesToPlayLock.acquire()
+                game = self.gamesToPlay.pop(0)
+                self.gamesToPlayLock.release()
 
-            # pause on start -- only for the first game
-            # don't pause if a human is playing because that feels awkward
-            if self.pauseOnStart and not self.hasHumanPlayer:
-                self.UI.pausePressed()
-                self.pauseOnStart = False
+                self.hasHumanPlayer = game.p1.author == "Human" or game.p2.author == "Human"
 
-            self.currentPlayerScores = []
-            self.currentPlayerScores.append([self.truncateName(game.p1.author, 24), 0, 0])
-            self.currentPlayerScores.append([self.truncateName(game.p2.author, 24), 0, 0])
+                # pause on start -- only for the first game
+                # don't pause if a human is playing because that feels awkward
+                if self.pauseOnStart and not self.hasHumanPlayer:
+                    self.UI.pausePressed()
+                    self.pauseOnStart = False
 
-            for j in range(game.n):
-                self.UI.statsHandler.updateCurLogItem(self.tournamentStr(True))
-                self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
-                if self.verbose: print(self.tournamentStr(True), "\n")
-                self.setup(game, j)
-                self.UI.setPlayers(self.truncateName(self.currentPlayers[0].author),
-                                   self.truncateName(self.currentPlayers[1].author))
-                self.runGame()
+                self.currentPlayerScores = []
+                self.currentPlayerScores.append([self.truncateName(game.p1.author, 24), 0, 0])
+                self.currentPlayerScores.append([self.truncateName(game.p2.author, 24), 0, 0])
 
-                if self.goToSettings or self.ended:
-                    self.killed = False
-                    break
+                for j in range(game.n):
+                    self.UI.statsHandler.updateCurLogItem(self.tournamentStr(True))
+                    self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
+                    if self.verbose: print(self.tournamentStr(True), "\n")
+                    self.setup(game, j)
+                    self.UI.setPlayers(self.truncateName(self.currentPlayers[0].author),
+                                       self.truncateName(self.currentPlayers[1].author))
+                    self.runGame()
 
-                if self.killed:
-                    self.killed = False
-                    continue
-                self.resolveEndGame()
+                    if self.goToSettings or self.ended:
+                        self.killed = False
+                        break
 
-            self.UI.statsHandler.updateCurLogItem(self.tournamentStr(True))
-            self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
-            if self.verbose: print(self.tournamentStr(True), "\n")
+                    if self.killed:
+                        self.killed = False
+                        continue
+                    self.resolveEndGame()
 
-            self.UI.statsHandler.stopCurLogItem(True)
+                self.UI.statsHandler.updateCurLogItem(self.tournamentStr(True))
+                self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
+                if self.verbose: print(self.tournamentStr(True), "\n")
+
+                self.UI.statsHandler.stopCurLogItem(True)
 
             if len(self.gamesToPlay) == 0 and self.autorestart:
                 # self.UI.restartPressed()
@@ -674,7 +715,112 @@ class Game(object):
         self.UI.statsHandler.stopCurLogItem()
         self.UI.statsHandler.timeLabel.Stop()
 
-            
+    ##
+    # startParallel
+    #
+    # Description: Plays the AI vs AI game sets at the front of the queue in
+    #   a pool of self.workers processes (see Tournament.py).  Every game is
+    #   sent out on its own, so all the pairings are played at once; each
+    #   pairing gets its own entry in the game log and the scores are
+    #   updated as the results come back.  As in the sequential loop, game j
+    #   of a set is played with the players swapped if playerSwap is on and j
+    #   is odd.
+    #
+    #   The agents live in the worker processes, so the Player objects here
+    #   are not told about wins and losses.
+    ##
+    def startParallel(self):
+        self.gamesToPlayLock.acquire()
+        games = []
+        while len(self.gamesToPlay) > 0 and self.canPlayInParallel(self.gamesToPlay[0]):
+            games.append(self.gamesToPlay.pop(0))
+        self.gamesToPlayLock.release()
+        self.hasHumanPlayer = False
+
+        # scores for each pairing, kept in (p1, p2) order
+        pairScores = []
+        logItems = []
+        tasks = []
+        for pairIndex, game in enumerate(games):
+            pairScores.append([[self.truncateName(game.p1.author, 24), 0, 0],
+                               [self.truncateName(game.p2.author, 24), 0, 0]])
+            if self.UI is not None:
+                logItems.append(self.UI.statsHandler.addLogItem())
+                self.UI.statsHandler.updateLogItem(logItems[-1], self.scoresStr(pairScores[-1]))
+            for j in range(game.n):
+                order = [game.p1, game.p2]
+                if self.playerSwap and j % 2 == 1:
+                    order = order[::-1]
+                tasks.append((pairIndex, j, self.agentSpec(order[0]), self.agentSpec(order[1]), self.nextSeed()))
+        if self.UI is not None:
+            self.UI.setPlayers("", "")
+            self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
+
+        remaining = [game.n for game in games]
+        played = 0
+        pool = Tournament.makePool(self.workers, "AI", self.seedModule)
+        try:
+            for pairIndex, j, winner, message in pool.imap_unordered(Tournament.playGame, tasks):
+                game = games[pairIndex]
+                flipped = self.playerSwap and j % 2 == 1
+                order = [game.p2, game.p1] if flipped else [game.p1, game.p2]
+                if winner is not None:
+                    if message is not None:
+                        print("AI ERROR: " + order[1 - winner].author + ": " + message)
+                    side = 1 - winner if flipped else winner
+                    pairScores[pairIndex][side][1] += 1
+                    pairScores[pairIndex][1 - side][2] += 1
+                    self.tallyResult(order[winner].playerId, order[1 - winner].playerId)
+                remaining[pairIndex] -= 1
+                played += 1
+
+                if self.verbose: print(self.scoresStr(pairScores[pairIndex]), "\n")
+                if self.UI is not None:
+                    self.UI.statsHandler.updateLogItem(logItems[pairIndex], self.scoresStr(pairScores[pairIndex]))
+                    self.UI.statsHandler.setScoreRecord(self.tournamentStr(False))
+                    self.UI.gameHandler.setInstructionText("%d of %d games played." % (played, len(tasks)))
+                    if remaining[pairIndex] == 0:
+                        self.UI.statsHandler.stopLogItem(logItems[pairIndex], True)
+
+                if self.killed or self.goToSettings or self.ended:
+                    self.killed = False
+                    break
+        finally:
+            pool.terminate()
+
+        if self.UI is not None:
+            for item in logItems:
+                self.UI.statsHandler.stopLogItem(item, True)
+        return pairScores
+
+    ##
+    # canPlayInParallel
+    #
+    # Description: Whether a game set can be sent to worker processes, which
+    #   is the case when both players are AIs loaded from the AI folder and
+    #   the timeout is off.  The pool's processes cannot start the agents'
+    #   own processes that enforce the timeout (see isolate), so with it on
+    #   the games are played here, one at a time, with a warning.
+    ##
+    def canPlayInParallel(self, game):
+        if not (game.p1 in self.playerModules and game.p2 in self.playerModules):
+            return False
+        if self.timeoutOn:
+            if not self.warnedSequential:
+                print("WARNING: --workers is ignored while the timeout is on; "
+                      "games are played one at a time so the time limit can be enforced")
+                self.warnedSequential = True
+            return False
+        return True
+
+    ##
+    # agentSpec
+    #
+    # Description: What a worker process needs to create its own copy of a
+    #   player: (module name, player ID, whether it is a copy)
+    ##
+    def agentSpec(self, player):
+        return (self.playerModules[player], player.playerId, player.playerId == COPY)
 
     def setup(self, game, count):
         self.state = GameState.getBlankState()
@@ -691,9 +837,47 @@ class Game(object):
             self.currentPlayers = self.currentPlayers[::-1]
             self.flipped = True
 
+        # enforce the timeout by running the AIs in processes of their own
+        if self.timeoutOn:
+            self.currentPlayers = [self.isolate(player) for player in self.currentPlayers]
+
         self.gameOver = False
         self.winner = None
         self.loser = None
+        self.seed = self.nextSeed()
+        self.dirtyCells = None
+
+    ##
+    # nextSeed
+    #
+    # Description: The seed for the next game: the one after the last if a
+    #   first seed was given on the command line, otherwise None (a new seed
+    #   for every game, see Engine.seedGame).
+    ##
+    def nextSeed(self):
+        if self.firstSeed is None:
+            return None
+        self.gamesSeeded += 1
+        return self.firstSeed + self.gamesSeeded - 1
+
+    ##
+    # isolate
+    #
+    # Description: Returns the stand-in for an AI that runs it in a process of
+    #   its own under the current time limit, for both wall-clock and CPU
+    #   time (see RemotePlayer).  The process is started the first time and
+    #   kept from game to game.  Human players are returned as they are.
+    ##
+    def isolate(self, player):
+        if player not in self.playerModules:
+            return player
+        remote = self.remotePlayers.get(player)
+        if remote is None:
+            remote = RemotePlayer(self.playerModules[player], player.playerId, isCopy=player.playerId == COPY)
+            self.remotePlayers[player] = remote
+        remote.timeLimit = self.timeout_limit
+        remote.cpuLimit = self.timeout_limit
+        return remote
 
     ##
     # kill
@@ -737,10 +921,10 @@ class Game(object):
     def runGame(self):
         # build a list of things to place for player 1 in setup phase 1
         # 1 anthill/queen, 1 tunnel/worker, 9 obstacles
-        constrsToPlace = []
-        constrsToPlace += [Building(None, ANTHILL, PLAYER_ONE)]
-        constrsToPlace += [Building(None, TUNNEL, PLAYER_ONE)]
-        constrsToPlace += [Construction(None, GRASS) for i in range(0, 9)]
+        constrsToPlace = self.constrsFor(SETUP_PHASE_1, PLAYER_ONE)
+        seed = self.seedGame(self.seed)
+        if self.recorder is not None:
+            self.recorder.startGame((self.currentPlayers[0].author, self.currentPlayers[1].author), seed)
 
         while not self.gameOver:
             if self.killed:
@@ -749,8 +933,7 @@ class Game(object):
             theState = self.state.clone()
 
             # I think this is where it should go
-            if self.UI is not None:
-                self.UI.showState(theState)
+            self.showBoard()
 
             # if the player is player two, flip the board
             if theState.whoseTurn == PLAYER_TWO:
@@ -764,11 +947,11 @@ class Game(object):
                 # do auto-random setup for human player if required
                 if self.randomSetup and isinstance(currentPlayer, HumanPlayer.HumanPlayer):
                     if constrsToPlace[0].type != FOOD:
-                        coord = (random.randint(0, 9), random.randint(0, 3))
+                        coord = (self.random.randint(0, 9), self.random.randint(0, 3))
                         if self.state.board[coord[0]][coord[1]].constr is None:
                             targets.append(coord)
                     elif constrsToPlace[0].type == FOOD:
-                        coord = (random.randint(0, 9), random.randint(6, 9))
+                        coord = (self.random.randint(0, 9), self.random.randint(6, 9))
                         if self.state.board[coord[0]][coord[1]].constr is None:
                             targets.append(coord)
 
@@ -779,94 +962,44 @@ class Game(object):
                 # get the placement from the player
                 if isinstance(currentPlayer, HumanPlayer.HumanPlayer) and not self.randomSetup:
                     self.UI.getHumanMove(theState.phase)
-                    self.condWait()
+                    self.ask(self.condWait)
                     if self.killed:
                         return
                     targets += self.submittedSetup
                     self.submittedSetup = None
                 else:
-                    targets += currentPlayer.getPlacement(theState)
+                    # anything but a list (such as the None of an AI that
+                    # ran out of time) is an invalid placement
+                    placement = self.ask(currentPlayer.getPlacement, theState)
+                    if type(placement) == list:
+                        targets += placement
+                    else:
+                        targets = placement
 
                 # only want to place as many targets as constructions to place
-                if len(targets) > len(constrsToPlace):
+                if type(targets) == list and len(targets) > len(constrsToPlace):
                     targets = targets[:len(constrsToPlace)]
 
                 validPlace = self.isValidPlacement(constrsToPlace, targets)
                 if validPlace:
-                    for target in targets:
-                        # translate coords to match player
-                        target = self.state.coordLookup(target, self.state.whoseTurn)
-                        # get construction to place
-                        constr = constrsToPlace.pop(0)
-                        # give constr its coords
-                        constr.coords = target
-                        # put constr on board
-                        self.state.board[target[0]][target[1]].constr = constr
-                        if constr.type == ANTHILL or constr.type == TUNNEL:
-                            # update the inventory
-                            self.state.inventories[self.state.whoseTurn].constrs.append(constr)
-                        else:  # grass and food
-                            self.state.inventories[NEUTRAL].constrs.append(constr)
+                    self.placeConstrs(constrsToPlace, targets)
 
                     # if AI mode, pause to observe move until next or continue is clicked
                     self.pauseGame()
 
                     if not constrsToPlace:
-                        constrsToPlace = []
-                        if self.state.phase == SETUP_PHASE_1:
-                            if self.state.whoseTurn == PLAYER_ONE:
-                                constrsToPlace += [Building(None, ANTHILL, PLAYER_TWO)]
-                                constrsToPlace += [Building(None, TUNNEL, PLAYER_TWO)]
-                                constrsToPlace += [Construction(None, GRASS) for i in range(0, 9)]
-                            elif self.state.whoseTurn == PLAYER_TWO:
-                                constrsToPlace += [Construction(None, FOOD) for i in range(0, 2)]
-                                self.state.phase = SETUP_PHASE_2
-                        elif self.state.phase == SETUP_PHASE_2:
-                            if self.state.whoseTurn == PLAYER_ONE:
-                                constrsToPlace += [Construction(None, FOOD) for i in range(0, 2)]
-                            elif self.state.whoseTurn == PLAYER_TWO:
-                                # if we're finished placing, add in queens and move to play phase
-                                p1inventory = self.state.inventories[PLAYER_ONE]
-                                p2inventory = self.state.inventories[PLAYER_TWO]
-                                # get anthill coords
-                                p1AnthillCoords = p1inventory.constrs[0].coords
-                                p2AnthillCoords = p2inventory.constrs[0].coords
-                                # get tunnel coords
-                                p1TunnelCoords = p1inventory.constrs[1].coords
-                                p2TunnelCoords = p2inventory.constrs[1].coords
-                                # create queen and worker ants
-                                p1Queen = Ant(p1AnthillCoords, QUEEN, PLAYER_ONE)
-                                p2Queen = Ant(p2AnthillCoords, QUEEN, PLAYER_TWO)
-                                p1Worker = Ant(p1TunnelCoords, WORKER, PLAYER_ONE)
-                                p2Worker = Ant(p2TunnelCoords, WORKER, PLAYER_TWO)
-                                # put ants on board
-                                self.state.board[p1Queen.coords[0]][p1Queen.coords[1]].ant = p1Queen
-                                self.state.board[p2Queen.coords[0]][p2Queen.coords[1]].ant = p2Queen
-                                self.state.board[p1Worker.coords[0]][p1Worker.coords[1]].ant = p1Worker
-                                self.state.board[p2Worker.coords[0]][p2Worker.coords[1]].ant = p2Worker
-                                # add the queens to the inventories
-                                p1inventory.ants.append(p1Queen)
-                                p2inventory.ants.append(p2Queen)
-                                p1inventory.ants.append(p1Worker)
-                                p2inventory.ants.append(p2Worker)
-                                # give the players the initial food
-                                p1inventory.foodCount = 1
-                                p2inventory.foodCount = 1
-                                # change to play phase
-                                self.state.phase = PLAY_PHASE
-
-                        # change player turn in state
-                        self.state.whoseTurn = (self.state.whoseTurn + 1) % 2
+                        constrsToPlace = self.advanceSetup()
 
                 else:
                     if not type(currentPlayer) is HumanPlayer.HumanPlayer:
                         # cause current player to lose game because AIs aren't allowed to make mistakes.
                         code = self.error(INVALID_PLACEMENT, targets, currentPlayer)
-                        self.setWinner(1 - self.state.whoseTurn)
-                        self.UI.gameHandler.setInstructionText(code)
-                        # pause for the illegal move
-                        if self.pauseOnIllegalMove and not self.UI.paused:
-                            self.UI.pausePressed()
+                        self.setWinner(1 - self.state.whoseTurn, BAD_PLACEMENT, "invalid placement: " + str(targets))
+                        if self.UI is not None:
+                            self.UI.gameHandler.setInstructionText(code)
+                            # pause for the illegal move
+                            if self.pauseOnIllegalMove and not self.UI.paused:
+                                self.UI.pausePressed()
 
             elif self.state.phase == PLAY_PHASE:
                 currentPlayer = self.currentPlayers[self.state.whoseTurn]
@@ -874,31 +1007,18 @@ class Game(object):
                 if isinstance(currentPlayer, HumanPlayer.HumanPlayer):
                     # alert the UI that we need a move, then wait until it gives one to us
                     self.UI.getHumanMove(theState.phase)
-                    self.condWait()
+                    self.ask(self.condWait)
                     if self.killed:
                         return
                     self.move = self.submittedMove
                     self.submittedMove = None
                 else:
-                    if self.timeoutOn:
-                        t = Thread(target=self.get_move, args=(currentPlayer, theState))
-                        t.daemon = True
-                        try:
-                            t.start()
-                            t.join(self.timeout_limit)
-                            if t.isAlive():
-                                raise Exception('function [get_move] timeout [%s seconds] exceeded!' % self.timeout_limit)
-                        except Exception as je:
-                            traceback.print_exc(limit=0)
-                            self.setWinner(1 - self.state.whoseTurn)
-                            return
-                    else:
-                        self.get_move(currentPlayer, theState)
+                    # with the timeout on, an AI that runs out of time is
+                    # killed and its move comes back as None (see isolate)
+                    self.get_move(currentPlayer, theState)
 
-                if self.move != None and self.move.coordList != None:
-                    for i in range(0, len(self.move.coordList)):
-                        # translate coords of move to match player
-                        self.move.coordList[i] = self.state.coordLookup(self.move.coordList[i], self.state.whoseTurn)
+                # translate coords of move to match player
+                self.translateMove(self.move)
 
                 # make sure it's a valid move
                 validMove = self.isValidMove(self.move)
@@ -910,21 +1030,7 @@ class Game(object):
                         # record state in undo before applying move
                         if self.hasHumanPlayer:
                             self.undoStates.append(self.state.clone())
-                        startCoord = self.move.coordList[0]
-                        endCoord = self.move.coordList[-1]
-
-                        # take ant from start coord
-                        antToMove = self.state.board[startCoord[0]][startCoord[1]].ant
-
-                        # change ant's coords and hasMoved status
-                        antToMove.coords = (endCoord[0], endCoord[1])
-                        antToMove.hasMoved = True
-
-                        # remove ant from location
-                        self.state.board[startCoord[0]][startCoord[1]].ant = None
-
-                        # put ant at last loc in coordList
-                        self.state.board[endCoord[0]][endCoord[1]].ant = antToMove
+                        antToMove = self.applyMoveAnt(self.move)
 
                         # if AI mode, pause to observe move until next or continue is clicked
                         self.pauseGame()
@@ -937,22 +1043,7 @@ class Game(object):
                         # record state in undo before applying move
                         if self.hasHumanPlayer:
                             self.undoStates.append(self.state.clone())
-                        coord = self.move.coordList[0]
-                        currentPlayerInv = self.state.inventories[self.state.whoseTurn]
-
-                        # subtract the cost of the item from the player's food count
-                        if self.move.buildType == TUNNEL:
-                            currentPlayerInv.foodCount -= CONSTR_STATS[self.move.buildType][BUILD_COST]
-
-                            tunnel = Building(coord, TUNNEL, self.state.whoseTurn)
-                            self.state.board[coord[0]][coord[1]].constr = tunnel
-                        else:
-                            currentPlayerInv.foodCount -= UNIT_STATS[self.move.buildType][COST]
-
-                            ant = Ant(coord, self.move.buildType, self.state.whoseTurn)
-                            ant.hasMoved = True
-                            self.state.board[coord[0]][coord[1]].ant = ant
-                            self.state.inventories[self.state.whoseTurn].ants.append(ant)
+                        self.applyBuild(self.move)
 
                         # if AI mode, pause to observe move until next or continue is clicked
                         self.pauseGame()
@@ -965,56 +1056,38 @@ class Game(object):
                         # reset undo moves on each turn change
                         self.undoStates = []
 
-                        # take care of end of turn business for ants and constructions
-                        for ant in self.state.inventories[self.state.whoseTurn].ants:
-                            constrUnderAnt = self.state.board[ant.coords[0]][ant.coords[1]].constr
-                            if constrUnderAnt != None:
-                                # if constr is enemy's and ant hasnt moved, affect capture health of buildings
-                                if type(
-                                        constrUnderAnt) is Building and not constrUnderAnt.player == self.state.whoseTurn:
-                                    constrUnderAnt.captureHealth -= 1
-                                # have all worker ants on food sources gather food
-                                elif constrUnderAnt.type == FOOD and ant.type == WORKER:
-                                    ant.carrying = True
-                                # deposit carried food (only workers carry)
-                                elif (
-                                        constrUnderAnt.type == ANTHILL or constrUnderAnt.type == TUNNEL) and ant.carrying == True:
-                                    self.state.inventories[self.state.whoseTurn].foodCount += 1
-                                    ant.carrying = False
-
-                            # reset hasMoved on all ants of player
-                            ant.hasMoved = False
-
-                        # clear any currently highlighted squares
-                        # self.ui.coordList = []
-
-                        # switch whose turn it is
-                        self.state.whoseTurn = (self.state.whoseTurn + 1) % 2
+                        # end of turn business for ants and constructions, then switch whose turn it is
+                        self.endTurn()
 
-                        # notify player which AI is acting
+                        # notify player which AI is acting (AI games show it with the next frame)
                         nextPlayerName = self.currentPlayers[self.state.whoseTurn].author
-                        self.UI.gameHandler.setInstructionText(nextPlayerName + "'s turn.")
+                        if self.UI is not None and self.hasHumanPlayer:
+                            self.UI.gameHandler.setInstructionText(nextPlayerName + "'s turn.")
 
                         # if AI mode, pause to observe move until next or continue is clicked
                         self.pauseGame()
                     elif self.move.moveType == UNDO and len(self.undoStates) > 0:
                         self.state = self.undoStates.pop()
+                        self.dirtyCells = None
+                        if self.recorder is not None:
+                            self.recorder.undo(self.state.whoseTurn)
                 else:
                     # human can give None move, AI can't
                     if not type(currentPlayer) is HumanPlayer.HumanPlayer:
                         code = self.error(INVALID_MOVE, self.move, currentPlayer)
-                        self.setWinner(1 - self.state.whoseTurn)
-                        self.UI.gameHandler.setInstructionText(code)
-                        # pause for the illegal move
-                        if self.pauseOnIllegalMove and not self.UI.paused:
-                            self.UI.pausePressed()
+                        self.setWinner(1 - self.state.whoseTurn, BAD_MOVE, "invalid move: " + str(self.move))
+                        if self.UI is not None:
+                            self.UI.gameHandler.setInstructionText(code)
+                            # pause for the illegal move
+                            if self.pauseOnIllegalMove and not self.UI.paused:
+                                self.UI.pausePressed()
                     elif validMove != None:
                         # if validMove is False and not None, clear move
                         currentPlayer.coordList = []
                         # self.ui.coordList = []
                         
                 # check for pause condition
-                if self.pauseConditionReached() and not self.UI.paused:
+                if self.UI is not None and self.pauseConditionReached() and not self.UI.paused:
                     self.UI.pausePressed()
                 
             # determine if if someone is a winner.
@@ -1024,12 +1097,36 @@ class Game(object):
             elif self.hasWon(PLAYER_TWO):
                 self.setWinner(PLAYER_TWO)
 
+    ##
+    # showBoard
+    # Description: Gets the board on screen.  With a human playing the GUI
+    #   is updated straight away, since it works from the state shown.  In
+    #   AI games the state goes to the GUI's mailbox to be drawn at its next
+    #   frame (see GUIHandler.renderFrame).  Nothing is posted while a state
+    #   is still waiting there (or, with "show game ends only", at all); the
+    #   changed cells add up until the next state is.
+    #
+    # Parameters:
+    #   force - post even so, e.g. the end of a game or before pausing (bool)
+    ##
+    def showBoard(self, force = False):
+        if self.UI is None:
+            return
+        if self.hasHumanPlayer:
+            self.UI.showState(self.state, self.takeDirtyCells())
+        elif force or not (self.renderGameEndsOnly or self.UI.framePending()):
+            text = None
+            if self.state.phase == PLAY_PHASE and not self.gameOver:
+                text = self.currentPlayers[self.state.whoseTurn].author + "'s turn."
+            self.UI.postState(self.state.clone(), self.takeDirtyCells(), text)
+
     def get_move(self, currentPlayer, theState):
-        self.move = currentPlayer.getMove(theState)
+        self.move = self.ask(currentPlayer.getMove, theState)
 
     def resolveEndGame(self):
         if self.UI is not None:
-            self.UI.showState(self.state)
+            self.dirtyCells = None
+            self.showBoard(True)
             # notify the user of the winner
             winnerName = "Copy"
             if self.winner > -1:
@@ -1044,17 +1141,28 @@ class Game(object):
             else:
                 self.UI.gameHandler.setInstructionText("%s has won!" % winnerName)
 
+        self.tallyResult(self.winner, self.loser)
+
+    ##
+    # tallyResult
+    # Description: Adds a game to the tournament wins and losses.
+    #
+    # Parameters:
+    #   winner - the player ID of the winner (int)
+    #   loser - the player ID of the loser (int)
+    ##
+    def tallyResult(self, winner, loser):
         # adjust the wins and losses of players
         # because of how human and copies are handled currently, problems
 
-        if self.winner >= 0:
+        if winner >= 0:
             try:
-                self.playerScores[self.winner][1] += 1
+                self.playerScores[winner][1] += 1
             except:
                 pass
-        if self.loser >= 0:
+        if loser >= 0:
             try:
-                self.playerScores[self.loser][2] += 1
+                self.playerScores[loser][2] += 1
             except:
                 pass
 
@@ -1064,12 +1172,17 @@ class Game(object):
     #
     # Parameters:
     #   id - the current player ID. (int)
+    #   reason - why the game ended, if not won on the board (str)
+    #   message - details of the loser's illegal action (str)
     ##
-    def setWinner(self, id):
+    def setWinner(self, id, reason=None, message=None):
         self.gameOver = True
         self.winner = self.currentPlayers[id].playerId
         self.loser = self.currentPlayers[1 - id].playerId
 
+        if self.recorder is not None:
+            self.recorder.endGame(id, reason or self.victoryReason(id), message)
+
         # tell the players if they won or lost
         self.currentPlayers[id].registerWin(True)
         self.currentPlayers[1 - id].registerWin(False)
@@ -1091,17 +1204,11 @@ class Game(object):
     ##
     def resolveAttack(self, attackingAnt, currentPlayer):
         # check if player wants to attack
-        validAttackCoords = []
-        opponentId = (self.state.whoseTurn + 1) % 2
-        for ant in self.state.inventories[opponentId].ants:
-            if self.isValidAttack(attackingAnt, ant.coords):
-                # keep track of valid attack coords (flipped for player two)
-                validAttackCoords.append(self.state.coordLookup(ant.coords, self.state.whoseTurn))
+        validAttackCoords = self.validAttackCoords(attackingAnt)
         if validAttackCoords != []:
             theState = self.state.clone()
 
-            if self.UI is not None:
-                self.UI.showState(theState)
+            self.showBoard()
 
             if theState.whoseTurn == PLAYER_TWO:
                 theState.flipBoard()
@@ -1109,26 +1216,30 @@ class Game(object):
             if isinstance(currentPlayer, HumanPlayer.HumanPlayer):
                 # have to swap ant back for the GUI if its player 2
                 self.UI.getHumanAttack(self.state.coordLookup(attackingAnt.coords, theState.whoseTurn))
-                self.condWait()
+                self.ask(self.condWait)
                 if self.killed:
                     return
 
                 attackCoord = self.submittedAttack
                 self.submittedAttack = None
             else:
-                attackCoord = self.state.coordLookup(
-                    currentPlayer.getAttack(theState, attackingAnt.clone(), validAttackCoords), theState.whoseTurn)
-
-            # decrement ants health
-            attackedAnt = self.state.board[attackCoord[0]][attackCoord[1]].ant
-            attackedAnt.health -= UNIT_STATS[attackingAnt.type][ATTACK]
+                attackCoord = self.ask(currentPlayer.getAttack, theState, attackingAnt.clone(), validAttackCoords)
+                if self.isValidCoord(attackCoord):
+                    attackCoord = self.state.coordLookup(attackCoord, theState.whoseTurn)
+
+                # AIs aren't allowed to make mistakes, as in Engine.resolveAttack
+                if not self.isValidAttack(attackingAnt, attackCoord):
+                    code = self.error(INVALID_ATTACK, attackCoord, currentPlayer)
+                    self.setWinner(1 - self.state.whoseTurn, BAD_ATTACK, "invalid attack: " + str(attackCoord))
+                    if self.UI is not None:
+                        self.UI.gameHandler.setInstructionText(code)
+                        # pause for the illegal attack
+                        if self.pauseOnIllegalMove and not self.UI.paused:
+                            self.UI.pausePressed()
+                    return
 
-            # check for dead ant
-            if attackedAnt.health <= 0:
-                # remove dead ant from board
-                self.state.board[attackCoord[0]][attackCoord[1]].ant = None
-                # remove dead ant from inventory
-                self.state.inventories[opponentId].ants.remove(attackedAnt)
+            # decrement ants health, removing it if it dies
+            self.applyAttack(attackingAnt, attackCoord)
 
             # if AI mode, pause to observe attack until next or continue is clicked
             self.pauseGame()
@@ -1145,6 +1256,8 @@ class Game(object):
         # Reset the player list in case some have been loaded already
         self.players = []
         self.playerScores = []
+        # the module each AI was loaded from, for the worker processes
+        self.playerModules = {}
 
         # self.addPlayer(HumanPlayer.HumanPlayer(0))
 
@@ -1163,7 +1276,9 @@ class Game(object):
                 # Check to see if the file is already loaded.
                 # temp = __import__(moduleName, globals(), locals(), [], -1)
                 temp = importlib.import_module(moduleName)
-                self.addPlayer(temp.AIPlayer(i))
+                player = temp.AIPlayer(i)
+                self.playerModules[player] = moduleName
+                self.addPlayer(player)
                 i += 1
         # Remove current directory from python's import search order.
         sys.path.pop(0)
@@ -1180,7 +1295,8 @@ class Game(object):
                 temp = importlib.import_module(moduleName)
                 copy = temp.AIPlayer(COPY)
                 if copy.author == player:
-                    copy.author += "@@"
+                    copy.markAsCopy()
+                    self.playerModules[copy] = moduleName
                     break
         sys.path.pop(0)
         os.chdir('..')
@@ -1213,440 +1329,6 @@ class Game(object):
             return
         print(msg)
 
-    ##
-    # isValidMove(Move)
-    # Description: Checks to see if the move is valid for the current player.
-    #
-    # Parameters:
-    #   move - The Move to check (Move)
-    #
-    # Returns: None if no move is given, true if the given move is valid, or false if the given move is invalid
-    ##
-    def isValidMove(self, move):
-        # check for no move
-        if move == None:
-            self.errorReport("ERROR: Invalid Move: " + str(move))
-            return None
-
-        # check that the move is well-formed typewise (tuples, ints, etc)
-        if type(move) != Move:
-            self.errorReport("ERROR: Invalid Move: " + str(move))
-            self.errorReport("ERROR:  player did not supply an object of type 'Move'")
-            return False
-        if type(move.moveType) != int:
-            self.errorReport("ERROR: Invalid Move: " + str(move))
-            self.errorReport("       Move type must be an integer.")
-            return False
-        # for END or UNDO type moves, lots we don't need to check
-        if move.moveType == END or move.moveType == UNDO:
-            return True
-        if move.coordList == None or type(move.coordList) != list or len(move.coordList) == 0:
-            self.errorReport("ERROR: Invalid Move: " + str(move))
-            self.errorReport("       The coordinate list is empty!")
-            return False
-        index = 0
-        for coord in move.coordList:
-            if (type(coord) != tuple):
-                self.errorReport("ERROR: Invalid Move: " + str(move))
-                self.errorReport("       Coordinate at index " + str(index) + " is not a tuple.")
-                return False
-            if (len(coord) != 2):
-                self.errorReport("ERROR: Invalid Move: " + str(move))
-                self.errorReport(
-                    "       Coordinate at index " + str(index) + " has " + str(len(coord)) + "entries instead of 2.")
-                return False
-            if (type(coord[0]) != int) or (type(coord[1]) != int):
-                self.errorReport("ERROR: Invalid Move: " + str(move))
-                self.errorReport("       Coordinate at index " + str(index) + " contains a value that is not an int.")
-                return False
-            index += 1
-        if type(move.buildType) != type(None) and type(move.buildType) != int:
-            return False
-
-        # for MOVE_ANT and BUILD type moves
-        if move.moveType == MOVE_ANT:
-            firstCoord = move.coordList[0]
-            # check valid start location (good coords and ant ownership)
-            if self.checkMoveStart(firstCoord):
-                # get ant to move
-                antToMove = self.state.board[firstCoord[0]][firstCoord[1]].ant
-                movePoints = UNIT_STATS[antToMove.type][MOVEMENT]
-                previousCoord = None
-
-                index = 0
-                for coord in move.coordList:
-                    # if first runthough, need to set up previous coord
-                    if previousCoord == None:
-                        previousCoord = coord
-                        continue
-                    # if any to-coords are invalid, return invalid move
-                    if not self.checkMovePath(previousCoord, coord):
-                        self.errorReport("ERROR: Invalid Move: " + str(move))
-                        self.errorReport("       Illegal movement path at index" + str(index))
-                        return False
-
-                    # subtract cost of loc from movement points
-                    constrAtLoc = self.state.board[coord[0]][coord[1]].constr
-                    if constrAtLoc == None or UNIT_STATS[antToMove.type][IGNORES_GRASS]:
-                        movePoints -= 1
-                    else:
-                        movePoints -= CONSTR_STATS[constrAtLoc.type][MOVE_COST]
-
-                    previousCoord = coord
-                    index += 1
-
-                # Check for Queen ant trying to leave her territory
-                if (antToMove.type == QUEEN):
-                    for coord in move.coordList:
-                        if (coord[1] == BOARD_LENGTH / 2 - 1) \
-                                or (coord[1] == BOARD_LENGTH / 2):
-                            self.errorReport("ERROR: Invalid Move: " + str(move))
-                            self.errorReport("       Queen ant may not leave her own territory")
-                            return False
-
-                # within movement range and hasn't moved yet?
-                if (movePoints < 0):
-                    self.errorReport("ERROR: Invalid Move: " + str(move))
-                    self.errorReport("       Ant has insufficient movement points for this move")
-                    return False
-                if antToMove.hasMoved:
-                    self.errorReport("ERROR: Invalid Move: " + str(move))
-                    self.errorReport("       Ant has already made a move this turn")
-                    return False
-                else:
-                    return True
-
-        elif move.moveType == BUILD:
-            # coord list must contain one point for build
-            if len(move.coordList) != 1:
-                self.errorReport("ERROR: Invalid Move: " + str(move))
-                self.errorReport("       for a BUILD move, the coordinate list should contain exactly 1 coordinate")
-                return False
-
-            buildCoord = move.coordList[0]
-            # check valid start location
-            if self.checkBuildStart(buildCoord):
-                # we're building either an ant or constr for sure ->
-                # -> no longer able to build tunnels, so can only build ants.
-
-                if self.state.board[buildCoord[0]][buildCoord[1]].ant == None:
-                    # we know we're building an ant
-                    buildCost = None
-                    # check buildType for valid ant
-                    if move.buildType == WORKER:
-                        buildCost = UNIT_STATS[WORKER][COST]
-                    elif move.buildType == DRONE:
-                        buildCost = UNIT_STATS[DRONE][COST]
-                    elif move.buildType == SOLDIER:
-                        buildCost = UNIT_STATS[SOLDIER][COST]
-                    elif move.buildType == R_SOLDIER:
-                        buildCost = UNIT_STATS[R_SOLDIER][COST]
-                    else:
-                        self.errorReport("ERROR: Invalid Move: " + str(move))
-                        self.errorReport("       the buildType must be one of:  WORKER, DRONE, SOLDIER or R_SOLDIER.")
-                        return False
-
-                    # check the player has enough food
-                    currFood = self.state.inventories[self.state.whoseTurn].foodCount
-                    if currFood >= buildCost:
-                        # self.ui.notify("")
-                        return True
-                    else:
-                        self.errorReport("ERROR: Invalid Move: " + str(move))
-                        self.errorReport("       Player has " + str(currFood) + " food but needs " + str(
-                            buildCost) + " to build this ant")
-                        return False
-
-
-                # Below is the code that allows a player to build more tunnels during the course of a game,
-                # in case it is ever desired to be a part of the game again.
-
-                # else:
-                #     # we know we're building a construction
-                #     adjacentCoords = []
-                #     adjacentCoords.append(addCoords(buildCoord, (0, -1)))
-                #     adjacentCoords.append(addCoords(buildCoord, (0, 1)))
-                #     adjacentCoords.append(addCoords(buildCoord, (-1, 0)))
-                #     adjacentCoords.append(addCoords(buildCoord, (1, 0)))
-                #
-                #     # check that there's no food in adjacent locations
-                #     for aCoord in adjacentCoords:
-                #         if aCoord[0] >= 0 and aCoord[0] < 10 and aCoord[1] >= 0 and aCoord[1] < 10:
-                #             if (self.state.board[aCoord[0]][aCoord[1]].constr != None and
-                #                         self.state.board[aCoord[0]][aCoord[1]].constr.type == FOOD):
-                #                 self.errorReport("ERROR: Invalid Move: " + str(move))
-                #                 self.errorReport("       Cannot tunnel build next to food.")
-                #                 return False
-                #
-                #     buildCost = CONSTR_STATS[TUNNEL][BUILD_COST]
-                #     if self.state.inventories[self.state.whoseTurn].foodCount >= buildCost:
-                #         # self.ui.notify("")
-                #         return True
-                #     else:
-                #         self.errorReport("ERROR: Invalid Move: " + str(move))
-                #         self.errorReport("       Must have at least " + str(buildCost) + " food to build a tunnel.")
-                #         return False
-
-
-            else:  # invalid build start
-                self.errorReport("ERROR: Invalid Move: " + str(move))
-                self.errorReport("       Build location invalid.  Possible cause:")
-                loc = self.state.board[buildCoord[0]][buildCoord[1]]
-                if loc.ant == None:  # building ant
-                    self.errorReport("         - Anthill does not belong to current player")
-                else:
-                    if (move.buildType != TUNNEL):
-                        self.errorReport("         - Anthill is already occupied")
-                    elif (loc.ant.hasMoved):
-                        self.errorReport("         - Worker ant has already moved this turn")
-                    else:
-                        self.errorReport("         - Worker ant does not belong to current player")
-        else:
-            # invalid numeric move type
-            return False
-
-    ##
-    # isValidPlacement
-    # Description: Checks that the given placement of Constructions is valid
-    #
-    # Paramters:
-    #   items - The items to place (Construction[])
-    #   targets - A list of the coordinates to place the items at ((int,int)[])
-    #
-    # Returns None if no target is given, true if it is a valid placement, or false if it is an invalid placement
-    ##
-    def isValidPlacement(self, items, targets):
-        # check for well-formed input of targets (from players)
-        if type(targets) == type(None) or type(targets) != list:
-            return False
-            # If no target, return None (human vs ai caught by caller)
-        if len(targets) == 0:
-            return None
-        for coord in targets:
-            if not self.isValidCoord(coord):
-                return False
-
-        for i in range(0, len(targets)):
-            # Nobody can place in the center two rows of the board or on their opponents side
-
-            # check item type
-            if items[i].type == ANTHILL or items[i].type == TUNNEL or items[i].type == GRASS:
-                # check targets[i] is within proper boundaries y-wise
-                # must be on own side
-                if not self.isInHomeTerritory(targets[i]):
-                    return False
-            # check item type
-            elif items[i].type == FOOD:
-                # check targets[i] is within proper boundaries y-wise
-                # must be on opponent's side
-                if not self.isInEnemyTerritory(targets[i]):
-                    return False
-            else:
-                # I don't know what this type is.
-                return False
-
-            # change target to access appropriate players locations
-            aTarget = self.state.coordLookup(targets[i], self.state.whoseTurn)
-            # make sure nothing is there yet
-            if self.state.board[aTarget[0]][aTarget[1]].constr:
-                return False
-            # This item should be placed and this location becomes occupied
-            self.state.board[aTarget[0]][aTarget[1]].constr = items[i]
-
-        return True
-
-    ##
-    # isValidAttack
-    # Description: Determines whether the attack with the given parameters is valid
-    #   Attacking ant is assured to exist and belong to the player whose turn it is
-    #
-    # Parameters:
-    #   attackingAnt - The Ant that is attacking (Ant)
-    #   attackCoord - The coordinates of the Ant that is being attacked ((int,int))
-    #
-    # Returns: None if there is no attackCoord, true if valid attack, or false if invalid attack
-    ##
-    def isValidAttack(self, attackingAnt, attackCoord):
-        if attackCoord == None:
-            return None
-
-        # check for well-formed input from players
-        if not self.isValidCoord(attackCoord):
-            return False
-
-        attackLoc = self.state.board[attackCoord[0]][attackCoord[1]]
-
-        if attackLoc.ant == None or attackLoc.ant.player == attackingAnt.player:
-            return False
-
-        # we know we have an enemy ant
-        range = UNIT_STATS[attackingAnt.type][RANGE]
-        diffX = abs(attackingAnt.coords[0] - attackCoord[0])
-        diffY = abs(attackingAnt.coords[1] - attackCoord[1])
-
-        # pythagoras would be proud
-        if range >= diffX + diffY:
-            # return True if within range
-            return True
-        else:
-            return False
-
-    ##
-    # isValidCoord
-    # Description: Retruns whether this coord represents a valid board location.
-    #
-    # Parameters:
-    #   coord - The coord to be checked trying to be checked ((int, int))
-    #
-    # Returns: True if the coordinate is between (0,0) and (9,9)
-    ##
-    def isValidCoord(self, coord):
-        # check for well-formed coord
-        if type(coord) != tuple or len(coord) != 2 or type(coord[0]) != int or type(coord[1]) != int:
-            return False
-
-        # check boundaries
-        if coord[0] < 0 or coord[1] < 0 or coord[0] >= BOARD_LENGTH or coord[1] >= BOARD_LENGTH:
-            return False
-
-        return True
-
-    ##
-    # isInHomeTerritory
-    #
-    # Description: determines whether the position is in the player's
-    # home territory
-    #
-    # Parameters:
-    #   coord - The coord to be checked trying to be checked ((int, int))
-    #
-    # Returns: True if it is and False otherwise
-    #
-    ##
-    def isInHomeTerritory(self, coord):
-        if not self.isValidCoord(coord):
-            return False
-        if not (coord[1] >= 0 and coord[1] < BOARD_LENGTH / 2 - 1):
-            return False
-        return True
-
-    ##
-    # isInEnemyTerritory
-    #
-    # Description: determines whether the position is in the player's
-    # enemy's territory
-    #
-    # Parameters:
-    #   coord - The coord to be checked trying to be checked ((int, int))
-    #
-    # Returns: True if it is and False otherwise
-    #
-    ##
-    def isInEnemyTerritory(self, coord):
-        if not self.isValidCoord(coord):
-            return False
-        if not (coord[1] < BOARD_LENGTH and coord[1] >= BOARD_LENGTH / 2 + 1):
-            return False
-        return True
-
-    ##
-    # checkMoveStart
-    # Description: Checks if the location is valid to move from.
-    #  (bounds and ant ownership)
-    #
-    # Parameters:
-    #   coord - The starting point for the move ((int, int))
-    #
-    # Returns: True if it is a valid starting point for a move and false if not
-    ##
-    def checkMoveStart(self, coord):
-        # check location is on board
-        if self.isValidCoord(coord):
-            antToMove = self.state.board[coord[0]][coord[1]].ant
-            # check that an ant exists at the loc
-            if antToMove != None:
-                # check that it's the player's ant and that it hasn't moved
-                if antToMove.player == self.state.whoseTurn and not antToMove.hasMoved:
-                    return True
-
-        return False
-
-    ##
-    # checkMovePath
-    # Description: Checks if the location is valid to move to.
-    #  (clear path, adjacent locations)
-    #
-    # Parameters:
-    #   fromCoord - The Ant's current coordinate ((int, int))
-    #   toCoord - The coorinate to move the Ant to ((int, int))
-    #
-    # Returns: True if it is a valid move and false otherwise
-    #
-    # Note: fromCoord must always have been checked by the time it's passed
-    #  (either in checkMoveStart or previous checkMovePath call)
-    ##
-    def checkMovePath(self, fromCoord, toCoord):
-        # check location is on board
-        if self.isValidCoord(toCoord):
-            # check that squares are adjacent (difference on only one axis is 1)
-            if ((abs(fromCoord[0] - toCoord[0]) == 1 and abs(fromCoord[1] - toCoord[1]) == 0) or
-                    (abs(fromCoord[0] - toCoord[0]) == 0 and abs(fromCoord[1] - toCoord[1]) == 1)):
-                antAtLoc = self.state.board[toCoord[0]][toCoord[1]].ant
-                # check if an ant exists at the loc
-                if antAtLoc == None:
-                    return True
-
-        return False
-
-    ##
-    # checkBuildStart
-    # Description: Checks if the location is valid to build from.
-    #  (bounds and building ownership)
-    #
-    # Parameters:
-    #   coord - The coordinate trying to be used to build ((int, int))
-    #
-    # Returns: True if it is a valid build location and false otherwise
-    ##
-    def checkBuildStart(self, coord):
-        # check location is on board
-        if self.isValidCoord(coord):
-            loc = self.state.board[coord[0]][coord[1]]
-            # check that an empty anthill exists at the loc
-            if loc.constr != None and loc.constr.type == ANTHILL and loc.ant == None:
-                # check that it's the player's anthill
-                if loc.constr.player == self.state.whoseTurn:
-                    return True
-            # check that an ant exists at an empty location
-            elif loc.ant != None and loc.ant.type == WORKER and loc.constr == None:
-                # check that it's the player's ant and it hasn't moved
-                if loc.ant.player == self.state.whoseTurn and not loc.ant.hasMoved:
-                    return True
-
-        return False
-
-    ##
-    # hasWon(int)
-    # Description: Determines whether the game has ended in victory for the given player.
-    #
-    # Parameters:
-    #   playerId - The ID of the player being checked for winning (int)
-    #
-    # Returns: True if the player with playerId has won the game.
-    ##
-    def hasWon(self, playerId):
-        opponentId = 1 - playerId
-
-        if ((self.state.phase == PLAY_PHASE) and
-                ((self.state.inventories[opponentId].getQueen() == None) or
-                     (self.state.inventories[opponentId].getAnthill().captureHealth <= 0) or
-                     (self.state.inventories[playerId].foodCount >= FOOD_GOAL) or
-                     (self.state.inventories[opponentId].foodCount == 0 and
-                              len(self.state.inventories[opponentId].ants) == 1))):
-            return True
-        else:
-            return False
-
     ##
     # pauseGame
     # Description: Will pause the game if set to AI mode until user clicks next or continue
@@ -1662,6 +1344,7 @@ class Game(object):
 
         # pause using this wait condition
         # The GUI thread will wake
+        self.showBoard(True)
         self.waitingOnAI = True
         self.condWait()
         self.waitingOnAI = False
@@ -1713,7 +1396,14 @@ class Game(object):
             scores = self.currentPlayerScores
         else:
             scores = self.playerScores
+        return self.scoresStr(scores)
 
+    ##
+    # scoresStr
+    # Description: formats a list of [name, wins, losses] as a table
+    #
+    ##
+    def scoresStr(self, scores):
         transposedList = list(map(list, zip(*scores)))
         strTransList = [[str(n) for n in i] for i in transposedList]
 
@@ -1749,12 +1439,12 @@ class Game(object):
             errorMsg += player.author + ": "
 
         if errorCode == INVALID_PLACEMENT:
-            # info is a coord list
+            # info is a coord list, or whatever was given instead
             errorMsg += "invalid placement\nCoords given: "
-            lastCoord = info.pop()
-            for coord in info:
-                errorMsg += "(" + str(coord[0]) + ", " + str(coord[1]) + "), "
-            errorMsg += "(" + str(lastCoord[0]) + ", " + str(lastCoord[1]) + ")"
+            if type(info) == list and info:
+                errorMsg += ", ".join(str(coord) for coord in info)
+            else:
+                errorMsg += str(info)
 
         elif errorCode == INVALID_MOVE:
             # info is a move
@@ -1773,9 +1463,8 @@ class Game(object):
                 pass
 
         else:  # INVALID_ATTACK
-            # info is a coord
-            errorMsg += "invalid attack\n"
-            errorMsg += "(" + str(info[0]) + ", " + str(info[1]) + ")"
+            # info is a coord, or whatever was given instead
+            errorMsg += "invalid attack\n" + str(info)
 
         print(errorMsg)
         return errorMsg
@@ -1785,6 +1474,9 @@ class Game(object):
     # pauseConditionReached
     # returns True if a pause condition has been reached
     def pauseConditionReached(self):
+        if not self.pauseConditions:
+            return False
+
         # gather state data
         data = {}
 
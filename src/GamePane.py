@@ -8,9 +8,15 @@ from Ant import *
 from GUIHandler import *
 from AIPlayerUtils import *
 from functools import partial
+from collections import OrderedDict
 import random
 import os
 
+# size of a board tile's picture, in pixels
+TILE_SIZE = 64
+# how many finished tile pictures are kept (see TileSprites)
+SPRITE_CACHE_SIZE = 512
+
 #
 # class GamePane
 #
@@ -41,6 +47,7 @@ class GamePane:
                 self.textures[s1] = tkinter.PhotoImage(file = "Textures/" + f)
         # don't worry about this
         self.textures["hat"] = None
+        self.sprites = TileSprites(self.textures)
 
 
     def giveGame(self, the_game):
@@ -52,6 +59,9 @@ class GamePane:
         self.boardFrame = tkinter.Frame(self.parent)
         self.boardFrame.config(bd = 1, bg = 'black')
         self.boardIcons = []
+        # cells drawn with something other than the game state (highlights,
+        # a human's setup) since the last setToGameState
+        self.staleCells = set()
 
         
         # game board is based on a 10*10 grid of tiles
@@ -181,27 +191,29 @@ class GamePane:
     # hey look its a unit test
     #
     def randomBoard(self):
+        # its own generator, so the seeded game is not disturbed
+        rng = random.Random()
         for y in range(10):
             for x in range(10):
-                r = random.randint(1, 10)
+                r = rng.randint(1, 10)
                 if r <= 4:
                     cons = -r
                 else:
                     cons = -9
 
-                r = random.randint(0, 19)
+                r = rng.randint(0, 19)
                 if r <= 4:
                     ant = r
                 else:
                     ant = -9
 
-                r = random.randint(0, 1)
+                r = rng.randint(0, 1)
                 if r == 0:
                     team = PLAYER_ONE
                 else:
                     team = PLAYER_TWO
 
-                r = random.randint(1, 10)
+                r = rng.randint(1, 10)
                 if r == 1:
                     moved = True
                     highlight = False
@@ -212,18 +224,18 @@ class GamePane:
                     moved = False
                     highlight = False
 
-                r = random.randint(1,5)
+                r = rng.randint(1,5)
                 if r == 1:
                     carrying = True
                 else:
                     carrying = False
 
-                r = random.randint(1, 8)
-                r2 = random.randint(1, r)
+                r = rng.randint(1, 8)
+                r2 = rng.randint(1, r)
                 health = (r, r2)
 
-                r = random.randint(1, 8)
-                r2 = random.randint(1, r)
+                r = rng.randint(1, 8)
+                r2 = rng.randint(1, r)
                 healthConst = (r, r2)
 
                 self.boardIcons[y][x].setImage(construct = cons, ant = ant, antTeam = team, moved = moved,
@@ -234,48 +246,58 @@ class GamePane:
     #
     # sets the board elements to reflect a given game state
     #
-    def setToGameState(self, state: GameState):
+    # dirty - the cells (x, y) that changed since the last state shown, or
+    #         None to go over the whole board.  Cells drawn on since then
+    #         by anything else are redrawn as well.
+    #
+    def setToGameState(self, state: GameState, dirty = None):
         self.p1Food.set(state.inventories[PLAYER_ONE].foodCount)
         self.p2Food.set(state.inventories[PLAYER_TWO].foodCount)
-        for col in range(BOARD_LENGTH):
-            for row in range(BOARD_LENGTH):
-                loc: Location = state.board[col][row]
-                ant = loc.ant
-                construction = loc.constr
-                antTeam = PLAYER_ONE
-                constTeam = PLAYER_ONE
-
-                if construction is not None:
-                    cType = construction.type
-                    if isinstance(construction, Building):
-                        constTeam = construction.player
-
-                    if type(construction) is Building and cType == ANTHILL:
-                        cCurHP = construction.captureHealth
-                        cMaxHP = CONSTR_STATS[cType][1]
-                        healthConst = (cMaxHP, cCurHP)
-                    else:
-                        healthConst = None
+        if dirty is None:
+            cells = [(col, row) for col in range(BOARD_LENGTH) for row in range(BOARD_LENGTH)]
+        else:
+            cells = dirty | self.staleCells
+        board = state.board
+        for col, row in cells:
+            loc: Location = board[col][row]
+            ant = loc.ant
+            construction = loc.constr
+            antTeam = PLAYER_ONE
+            constTeam = PLAYER_ONE
+
+            if construction is not None:
+                cType = construction.type
+                if isinstance(construction, Building):
+                    constTeam = construction.player
+
+                if type(construction) is Building and cType == ANTHILL:
+                    cCurHP = construction.captureHealth
+                    cMaxHP = CONSTR_STATS[cType][1]
+                    healthConst = (cMaxHP, cCurHP)
                 else:
-                    cType = None
                     healthConst = None
+            else:
+                cType = None
+                healthConst = None
+
+            if ant is not None:
+                curHP = ant.health
+                maxHP = UNIT_STATS[ant.type][1]
+                health = (maxHP, curHP)
+                moved = ant.hasMoved
+                carrying = ant.carrying
+                aType = ant.type
+                antTeam = ant.player
+            else:
+                health = None
+                moved = False
+                carrying = False
+                aType = None
 
-                if ant is not None:
-                    curHP = ant.health
-                    maxHP = UNIT_STATS[ant.type][1]
-                    health = (maxHP, curHP)
-                    moved = ant.hasMoved
-                    carrying = ant.carrying
-                    aType = ant.type
-                    antTeam = ant.player
-                else:
-                    health = None
-                    moved = False
-                    carrying = False
-                    aType = None
-
-                # sets highlights to false
-                self.boardIcons[row][col].setImage(cType, aType, antTeam, constTeam, moved, health, False, False, carrying, healthConst)
+            # sets highlights to false
+            self.boardIcons[row][col].setImage(cType, aType, antTeam, constTeam, moved, health, False, False, carrying, healthConst)
+        # all of those now show the state
+        self.staleCells.clear()
 
     ##
     # showSetupConstructions
@@ -718,6 +740,10 @@ class BoardButton:
         self.attackHighlight = False
         self.carrying = False
 
+        # the finished picture shown (see TileSprites) and its canvas item
+        self.sprite = None
+        self.spriteItem = None
+
         # draw initial tile
         self.reDraw()
 
@@ -776,6 +802,7 @@ class BoardButton:
             changed = True
 
         if changed:
+            self.handler.staleCells.add((self.x, self.y))
             self.reDraw()
 
     ##
@@ -784,68 +811,72 @@ class BoardButton:
     # re draws this tile based on its internal values
     #
     def reDraw(self):
-        # general offset
-        loc = (2, 2)
+        sprite = self.handler.sprites.get(self)
+        if sprite is self.sprite:
+            return
+        # keep a reference, or Tk drops the image once the cache does
+        self.sprite = sprite
+        if self.spriteItem is None:
+            self.spriteItem = self.label.create_image((2, 2), anchor=tkinter.N + tkinter.W, image=sprite)
+        else:
+            self.label.itemconfigure(self.spriteItem, image=sprite)
 
-        # clear canvas
-        self.label.delete("all")
-        
-        # important vals/refs
-        NW = tkinter.N + tkinter.W
+    ##
+    # look
+    #
+    # everything that decides what this tile looks like
+    #
+    def look(self):
+        return (self.construct, self.ant, self.antTeam, self.constTeam, self.moved, self.health,
+                self.highlight, self.attackHighlight, self.carrying, self.healthConst)
+
+    ##
+    # layers
+    #
+    # the textures that make up this tile, bottom first, each with where it
+    # goes in the tile
+    #
+    def layers(self):
         my_textures = self.handler.textures
-        
+        layers = []
+
         # draw base
         if self.highlight:
-            self.label.create_image(loc, anchor=NW, image=my_textures["terrain_green"])
+            layers.append(("terrain_green", (0, 0)))
         elif self.attackHighlight:
-            self.label.create_image(loc, anchor=NW, image=my_textures["terrain_red"])
+            layers.append(("terrain_red", (0, 0)))
         elif self.moved:
-            self.label.create_image(loc, anchor=NW, image=my_textures["terrain_grey"])
+            layers.append(("terrain_grey", (0, 0)))
         else:
-            self.label.create_image(loc, anchor=NW, image=my_textures["terrain"])
+            layers.append(("terrain", (0, 0)))
 
         # team color
         team = "Blue" if self.constTeam == PLAYER_ONE else "Red"
 
         # draw construct
         if self.construct == GRASS:
-            self.label.create_image(loc, anchor=NW, image=my_textures["grass"])
+            layers.append(("grass", (0, 0)))
         elif self.construct == FOOD:
-            self.label.create_image(loc, anchor=NW, image=my_textures["food"])
+            layers.append(("food", (0, 0)))
         elif self.construct == ANTHILL:
-            self.label.create_image(loc, anchor=NW, image=my_textures["anthill" + team])
+            layers.append(("anthill" + team, (0, 0)))
         elif self.construct == TUNNEL:
-            self.label.create_image(loc, anchor=NW, image=my_textures["tunnel" + team])
+            layers.append(("tunnel" + team, (0, 0)))
 
         # team color
         team = "Blue" if self.antTeam == PLAYER_ONE else "Red"
 
-        # draw ant
-        if self.ant == WORKER:
-            self.label.create_image(loc, anchor=NW, image=my_textures["worker" + team])
-            if my_textures["hat"] is not None:
-                self.label.create_image((24, 9), anchor=NW, image=my_textures["hat"])
-        elif self.ant == SOLDIER:
-            self.label.create_image(loc, anchor=NW, image=my_textures["soldier" + team])
+        # draw ant, and its hat if it's that time of year
+        hats = {WORKER: (22, 7), SOLDIER: (21, 7), QUEEN: (23, 5), R_SOLDIER: (21, 3), DRONE: (21, 5)}
+        names = {WORKER: "worker", SOLDIER: "soldier", QUEEN: "queen", R_SOLDIER: "rsoldier", DRONE: "drone"}
+        if self.ant in names:
+            layers.append((names[self.ant] + team, (0, 0)))
             if my_textures["hat"] is not None:
-                self.label.create_image((23, 9), anchor=NW, image=my_textures["hat"])
-        elif self.ant == QUEEN:
-            self.label.create_image(loc, anchor=NW, image=my_textures["queen" + team])
-            if my_textures["hat"] is not None:
-                self.label.create_image((25, 7), anchor=NW, image=my_textures["hat"])
-        elif self.ant == R_SOLDIER:
-            self.label.create_image(loc, anchor=NW, image=my_textures["rsoldier" + team])
-            if my_textures["hat"] is not None:
-                self.label.create_image((23, 5), anchor=NW, image=my_textures["hat"])
-        elif self.ant == DRONE:
-            self.label.create_image(loc, anchor=NW, image=my_textures["drone" + team])
-            if my_textures["hat"] is not None:
-                self.label.create_image((23, 7), anchor=NW, image=my_textures["hat"])
+                layers.append(("hat", hats[self.ant]))
 
         # carrying mark
         if self.carrying:
-            self.label.create_image((loc[0] + 48, loc[1] + 48), anchor=NW, image=my_textures["carrying"])
-
+            layers.append(("carrying", (48, 48)))
 
         # draw health
         if self.health:
@@ -860,25 +891,61 @@ class BoardButton:
 
             count = 0
             for j in range(blue):
-                self.label.create_image((loc[0] + 3, loc[1] + count * 8), 
-                                         anchor=NW, image=my_textures["healthDouble"])
+                layers.append(("healthDouble", (3, count * 8)))
                 count += 1
             for j in range(green):
-                self.label.create_image((loc[0] + 3, loc[1] + count * 8), 
-                                         anchor=NW, image=my_textures["healthFull"])
+                layers.append(("healthFull", (3, count * 8)))
                 count += 1
             for j in range(red):
-                self.label.create_image((loc[0] + 3, loc[1] + count * 8), 
-                                         anchor=NW, image=my_textures["healthEmpty"])
+                layers.append(("healthEmpty", (3, count * 8)))
                 count += 1
 
         if self.healthConst:
             for k in range(self.healthConst[0]):
                 if k < self.healthConst[1]:
-                    self.label.create_image((loc[0] + 55, loc[1] + k * 8), 
-                                             anchor=NW, image=my_textures["healthFull"])
+                    layers.append(("healthFull", (55, k * 8)))
                 else:
-                    self.label.create_image((loc[0] + 55, loc[1] + k * 8), 
-                                             anchor=NW, image=my_textures["healthEmpty"])
+                    layers.append(("healthEmpty", (55, k * 8)))
 
+        return layers
 
+
+##
+# TileSprites
+#
+# finished tile images, one for each look a tile can have (BoardButton.look),
+# composited from the textures the first time that look is needed and then
+# reused, so redrawing a tile is a single image swap.  The least recently
+# used are dropped once there are more than maxSize.  Has to be cleared when
+# the textures change.
+#
+class TileSprites:
+
+    def __init__(self, textures, maxSize = SPRITE_CACHE_SIZE):
+        self.textures = textures
+        self.maxSize = maxSize
+        self.sprites = OrderedDict()
+
+    def clear(self):
+        self.sprites.clear()
+
+    ##
+    # get
+    #
+    # the image for a tile as it looks now
+    #
+    def get(self, button):
+        key = button.look()
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = tkinter.PhotoImage(width = TILE_SIZE, height = TILE_SIZE)
+        for name, (x, y) in button.layers():
+            # copy overlays, so transparent pixels let the layers below show
+            sprite.tk.call(sprite, "copy", self.textures[name], "-to", x, y)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.maxSize:
+            self.sprites.popitem(last = False)
+        return sprite
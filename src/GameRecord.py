@@ -0,0 +1,456 @@
+from array import array
+from Constants import *
+from Move import Move
+
+#
+# GameRecord.py
+#
+# A compact binary log of played games.  A GameRecorder hooked into a game
+# (Engine.recorder) streams each game to the end of a log file as it is
+# played: who played, the setup placements, every move and attack, and the
+# result.  GameLog reads the games back one at a time.
+#
+# A log file starts with MAGIC and then holds the games one after another.
+# Each game is a run of events, each a tag byte ((kind << 1) | playerId)
+# followed by its fields:
+#
+#   START       player 1, player 2 (strings), seed (flag byte, then a
+#               zigzag varint if the flag is set)
+#   PLACE       count, that many cells, think time
+#   MOVE_ANT    path length, that many cells, think time
+#   BUILD       cell, build type, think time
+#   END_TURN    think time
+#   ATTACK      cell, think time
+#   UNDO        (nothing)
+#   RESULT      winner (0, 1 or 2 for nobody), reason, message (strings)
+#
+# Cells are one byte (x * 10 + y) on the real board, that is, as player one
+# sees it.  Think times are how long the player took to decide, as a varint
+# of microseconds.  Strings are a varint length followed by UTF-8.
+#
+# Next to the log, <path>.idx holds the offset of every finished game as
+# 8-byte unsigned integers.  A game is only indexed once its RESULT has been
+# written, so games cut short (the GUI was closed, the process died) are
+# skipped by the reader.
+#
+
+MAGIC = b"ANTREC1\n"
+
+# event kinds
+START = 0
+PLACE = 1
+MOVE_ANT_EVENT = 2
+BUILD_EVENT = 3
+END_TURN = 4
+ATTACK = 5
+UNDO_EVENT = 6
+RESULT = 7
+
+NO_WINNER = 2
+
+
+##
+# GameRecorder
+# Description: Streams games to a log file.  The game calls startGame, then
+#   the event methods as actions are carried out, then endGame.
+#
+# Variables:
+#   path - the log file
+#   file - the log, open for appending
+#   index - the index file, open for appending
+#   offset - where the game being recorded starts in the log, or None
+##
+class GameRecorder(object):
+    ##
+    # __init__
+    # Description: Opens a log for appending, creating it if need be.
+    #
+    # Parameters:
+    #   path - the log file (str)
+    ##
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.index = open(indexPath(path), "ab")
+        self.offset = None
+
+    def close(self):
+        self.file.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    ##
+    # startGame
+    # Description: Starts a new game.  A game left unfinished before it is
+    #   simply not indexed.
+    #
+    # Parameters:
+    #   players - the authors of player one and player two (str, str)
+    #   seed - the seed the game was played with, or None (int)
+    ##
+    def startGame(self, players, seed=None):
+        self.offset = self.file.tell()
+        out = bytearray([START << 1])
+        writeString(out, players[0])
+        writeString(out, players[1])
+        if seed is None:
+            out.append(0)
+        else:
+            out.append(1)
+            writeVarint(out, seed * 2 if seed >= 0 else -seed * 2 - 1)
+        self.file.write(out)
+
+    ##
+    # placement
+    # Description: Records constructions placed during setup.
+    #
+    # Parameters:
+    #   playerId - who placed them (int)
+    #   coords - where, on the real board ((int,int)[])
+    #   seconds - how long the player took (float)
+    ##
+    def placement(self, playerId, coords, seconds):
+        out = bytearray([PLACE << 1 | playerId, len(coords)])
+        out += bytes(x * BOARD_LENGTH + y for x, y in coords)
+        writeVarint(out, int(seconds * 1e6))
+        self.file.write(out)
+
+    ##
+    # move
+    # Description: Records a move that was carried out.
+    #
+    # Parameters:
+    #   playerId - who made it (int)
+    #   move - the Move, with coordinates on the real board (Move)
+    #   seconds - how long the player took (float)
+    ##
+    def move(self, playerId, move, seconds):
+        if move.moveType == MOVE_ANT:
+            out = bytearray([MOVE_ANT_EVENT << 1 | playerId, len(move.coordList)])
+            out += bytes(x * BOARD_LENGTH + y for x, y in move.coordList)
+        elif move.moveType == BUILD:
+            x, y = move.coordList[0]
+            out = bytearray([BUILD_EVENT << 1 | playerId, x * BOARD_LENGTH + y, move.buildType])
+        else:
+            out = bytearray([END_TURN << 1 | playerId])
+        writeVarint(out, int(seconds * 1e6))
+        self.file.write(out)
+
+    ##
+    # attack
+    # Description: Records an attack that was carried out.
+    #
+    # Parameters:
+    #   playerId - who attacked (int)
+    #   coord - the ant attacked, on the real board ((int,int))
+    #   seconds - how long the player took (float)
+    ##
+    def attack(self, playerId, coord, seconds):
+        out = bytearray([ATTACK << 1 | playerId, coord[0] * BOARD_LENGTH + coord[1]])
+        writeVarint(out, int(seconds * 1e6))
+        self.file.write(out)
+
+    ##
+    # undo
+    # Description: Records a human player taking back their last action.
+    ##
+    def undo(self, playerId):
+        self.file.write(bytes([UNDO_EVENT << 1 | playerId]))
+
+    ##
+    # endGame
+    # Description: Records the result and indexes the game.
+    #
+    # Parameters:
+    #   winner - the ID of the winning player, or None if nobody won (int)
+    #   reason - why the game ended (str)
+    #   message - details of an illegal action, or None (str)
+    ##
+    def endGame(self, winner, reason, message=None):
+        if self.offset is None:
+            return
+        out = bytearray([RESULT << 1, NO_WINNER if winner is None else winner])
+        writeString(out, reason or "")
+        writeString(out, message or "")
+        self.file.write(out)
+        self.file.flush()
+        self.index.write(array("Q", [self.offset]).tobytes())
+        self.index.flush()
+        self.offset = None
+
+
+##
+# GameRecord
+# Description: One game read back from a log.
+#
+# Variables:
+#   players - the authors of player one and player two
+#   seed - the seed the game was played with, or None
+#   winner - the ID of the winning player, or None if nobody won
+#   reason - why the game ended
+#   message - details of an illegal action, or None
+#   turns - the number of turns ended in the play phase
+#   events - the actions in the order they were carried out, each a tuple
+#       (kind, playerId, data, seconds) where data is the list of cells for
+#       PLACE, the Move for MOVE_ANT_EVENT, BUILD_EVENT and END_TURN, the
+#       cell for ATTACK and None for UNDO_EVENT (seconds is None too)
+##
+class GameRecord(object):
+    def __init__(self, players, seed, winner, reason, message, events):
+        self.players = players
+        self.seed = seed
+        self.winner = winner
+        self.reason = reason
+        self.message = message
+        self.events = events
+        self.turns = sum(1 for event in events if event[0] == END_TURN)
+
+    ##
+    # moveTimes
+    # Description: How long each player took over each of its decisions.
+    #
+    # Returns: a list of seconds for each player ([float[], float[]])
+    ##
+    def moveTimes(self):
+        times = ([], [])
+        for kind, playerId, data, seconds in self.events:
+            if seconds is not None:
+                times[playerId].append(seconds)
+        return times
+
+    def __str__(self):
+        if self.winner is None:
+            outcome = "no winner"
+        else:
+            outcome = "%s beat %s" % (self.players[self.winner], self.players[1 - self.winner])
+        return "%s (%s) after %d turns" % (outcome, self.reason, self.turns)
+
+
+##
+# GameLog
+# Description: Reads the games in a log lazily.  Only the index is read up
+#   front; each game is read and decoded when it is asked for.
+#
+#   log = GameLog("games.rec")
+#   for record in log:
+#       ...
+#   log[-1].winner
+##
+class GameLog(object):
+    ##
+    # __init__
+    # Description: Opens a log.  If the index is missing it is rebuilt by
+    #   scanning the log.
+    #
+    # Parameters:
+    #   path - the log file (str)
+    ##
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError("%s is not a game log" % path)
+        self.offsets = array("Q")
+        try:
+            with open(indexPath(path), "rb") as index:
+                self.offsets.frombytes(index.read())
+        except FileNotFoundError:
+            self.offsets = scanOffsets(self.file)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        offset = self.offsets[i]
+        self.file.seek(offset)
+        # a game ends where the next one in the file starts (there may be
+        # unfinished games in between, which the decoder never reaches)
+        i = i % len(self.offsets)
+        if i + 1 < len(self.offsets):
+            data = self.file.read(self.offsets[i + 1] - offset)
+        else:
+            data = self.file.read()
+        return decodeGame(data, 0)[0]
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self[i]
+
+
+##
+# indexPath
+# Description: The index file that goes with a log
+##
+def indexPath(path):
+    return path + ".idx"
+
+
+##
+# scanOffsets
+# Description: Finds the finished games in a log by decoding it from start
+#   to end, one chunk at a time.
+#
+# Parameters:
+#   file - the log, open for reading just past MAGIC
+#
+# Returns: the offsets of the finished games (array of int)
+##
+def scanOffsets(file):
+    offsets = array("Q")
+    data = b""
+    base = file.tell()
+    pos = 0
+    start = None
+    while True:
+        chunk = file.read(1 << 16)
+        data = data[pos:] + chunk
+        base += pos
+        pos = 0
+        while True:
+            try:
+                end = skipEvent(data, pos)
+            except IndexError:
+                break
+            tag = data[pos] >> 1
+            if tag == START:
+                start = base + pos
+            elif tag == RESULT and start is not None:
+                offsets.append(start)
+                start = None
+            pos = end
+        if not chunk:
+            return offsets
+
+
+##
+# skipEvent
+# Description: Finds where the event starting at pos ends.
+#
+# Raises: IndexError if the event runs past the end of data
+##
+def skipEvent(data, pos):
+    kind = data[pos] >> 1
+    pos += 1
+    if kind == START:
+        pos = skipString(data, skipString(data, pos))
+        if data[pos]:
+            pos = readVarint(data, pos + 1)[1]
+        else:
+            pos += 1
+    elif kind == PLACE or kind == MOVE_ANT_EVENT:
+        pos = readVarint(data, pos + 1 + data[pos])[1]
+    elif kind == BUILD_EVENT:
+        pos = readVarint(data, pos + 2)[1]
+    elif kind == END_TURN:
+        pos = readVarint(data, pos)[1]
+    elif kind == ATTACK:
+        pos = readVarint(data, pos + 1)[1]
+    elif kind == RESULT:
+        pos = skipString(data, skipString(data, pos + 1))
+    if pos > len(data):
+        raise IndexError(pos)
+    return pos
+
+
+##
+# decodeGame
+# Description: Decodes the game starting at pos.
+#
+# Returns: the GameRecord and the position after it
+##
+def decodeGame(data, pos):
+    if data[pos] >> 1 != START:
+        raise ValueError("no game at this offset")
+    pos += 1
+    player1, pos = readString(data, pos)
+    player2, pos = readString(data, pos)
+    seed = None
+    pos += 1
+    if data[pos - 1]:
+        zigzag, pos = readVarint(data, pos)
+        seed = -(zigzag + 1) // 2 if zigzag & 1 else zigzag // 2
+
+    events = []
+    while True:
+        tag = data[pos]
+        kind, playerId = tag >> 1, tag & 1
+        pos += 1
+        if kind == PLACE or kind == MOVE_ANT_EVENT:
+            count = data[pos]
+            cells = [divmod(cell, BOARD_LENGTH) for cell in data[pos + 1:pos + 1 + count]]
+            micros, pos = readVarint(data, pos + 1 + count)
+            if kind == PLACE:
+                events.append((PLACE, playerId, cells, micros / 1e6))
+            else:
+                events.append((MOVE_ANT_EVENT, playerId, Move(MOVE_ANT, cells, None), micros / 1e6))
+        elif kind == BUILD_EVENT:
+            move = Move(BUILD, [divmod(data[pos], BOARD_LENGTH)], data[pos + 1])
+            micros, pos = readVarint(data, pos + 2)
+            events.append((BUILD_EVENT, playerId, move, micros / 1e6))
+        elif kind == END_TURN:
+            micros, pos = readVarint(data, pos)
+            events.append((END_TURN, playerId, Move(END, None, None), micros / 1e6))
+        elif kind == ATTACK:
+            cell = divmod(data[pos], BOARD_LENGTH)
+            micros, pos = readVarint(data, pos + 1)
+            events.append((ATTACK, playerId, cell, micros / 1e6))
+        elif kind == UNDO_EVENT:
+            events.append((UNDO_EVENT, playerId, None, None))
+        elif kind == RESULT:
+            winner = None if data[pos] == NO_WINNER else data[pos]
+            reason, pos = readString(data, pos + 1)
+            message, pos = readString(data, pos)
+            return GameRecord((player1, player2), seed, winner, reason, message or None, events), pos
+        else:
+            raise ValueError("unexpected event %d in game" % kind)
+
+
+def writeVarint(out, n):
+    while n > 0x7f:
+        out.append(n & 0x7f | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def readVarint(data, pos):
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def writeString(out, s):
+    encoded = s.encode("utf-8")
+    writeVarint(out, len(encoded))
+    out += encoded
+
+
+def readString(data, pos):
+    length, pos = readVarint(data, pos)
+    return data[pos:pos + length].decode("utf-8"), pos + length
+
+
+def skipString(data, pos):
+    length, pos = readVarint(data, pos)
+    return pos + length
@@ -1,9 +1,95 @@
 import copy
+import random
+from array import array
 from Constants import *
 from Inventory import Inventory
+from Construction import Construction
 from Building import Building
 from Location import *
-from Ant import Ant
+from Ant import Ant, UNIT_STATS
+from Terrain import Terrain
+
+#Layout of the packed buffer used by GameState.clone (see GameState._pack)
+#header: (food for player one, food for player two, number of ants)
+PACK_HEADER = 3
+#one record per ant: (type, player, x, y, health, carrying, hasMoved)
+ANT_RECORD = 7
+
+#Zobrist keys used by GameState.zobristHash, indexed by board cell (x*10+y)
+#and feature.  A fixed seed keeps hashes identical across runs and processes.
+_zobristRandom = random.Random(0x2A17)
+def _zobristKeys(count):
+    return [_zobristRandom.getrandbits(64) for i in range(count)]
+#ants: [cell][player][type], plus health (mod 16), carrying and hasMoved
+ZOBRIST_ANT = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH * 3 * 5)
+ZOBRIST_HEALTH = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH * 16)
+ZOBRIST_CARRYING = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH)
+ZOBRIST_MOVED = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH)
+#constructions: [cell][inventory][type], plus building capture health (mod 8)
+ZOBRIST_CONSTR = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH * 3 * 4)
+ZOBRIST_CAPTURE = _zobristKeys(BOARD_LENGTH * BOARD_LENGTH * 8)
+#food count per player (mod 32), phase and whose turn
+ZOBRIST_FOOD = _zobristKeys(2 * 32)
+ZOBRIST_PHASE = _zobristKeys(4)
+ZOBRIST_TURN = _zobristKeys(2)
+
+##
+#antKey
+#Description: The Zobrist key of an ant with the given fields
+##
+def antKey(antType, player, x, y, health, carrying, hasMoved):
+    cell = x * BOARD_LENGTH + y
+    key = ZOBRIST_ANT[cell * 15 + player * 5 + antType] ^ ZOBRIST_HEALTH[cell * 16 + (health & 15)]
+    if carrying:
+        key ^= ZOBRIST_CARRYING[cell]
+    if hasMoved:
+        key ^= ZOBRIST_MOVED[cell]
+    return key
+
+##
+#constrKey
+#Description: The Zobrist key of a construction placed at (x, y)
+##
+def constrKey(invIndex, constrType, x, y):
+    return ZOBRIST_CONSTR[(x * BOARD_LENGTH + y) * 12 + invIndex * 4 + constrType - ANTHILL]
+
+##
+#captureKey
+#Description: The Zobrist key of a building's capture health
+##
+def captureKey(coords, captureHealth):
+    return ZOBRIST_CAPTURE[(coords[0] * BOARD_LENGTH + coords[1]) * 8 + (captureHealth & 7)]
+
+##
+#_antCells
+#Description: The offset of each ant record in a packed buffer by its
+#   coordinates, the first one listed winning as in GameState.getAntAt
+##
+def _antCells(buf):
+    end = PACK_HEADER + buf[2] * ANT_RECORD
+    cells = list(zip(buf[PACK_HEADER + 2:end:ANT_RECORD], buf[PACK_HEADER + 3:end:ANT_RECORD]))
+    offsets = range(PACK_HEADER, end, ANT_RECORD)
+    return dict(zip(reversed(cells), reversed(offsets)))
+
+##
+#_setAnt
+#Description: Sets (field, value) pairs of the ant record at an offset in a
+#   packed buffer, updating a Zobrist key (unless it is None) to match
+#
+#Return: the updated key
+##
+def _setAnt(buf, offset, fields, zobrist):
+    if zobrist is not None:
+        zobrist ^= antKey(*buf[offset:offset + ANT_RECORD])
+    for field, value in fields:
+        buf[offset + field] = value
+    if zobrist is not None:
+        zobrist ^= antKey(*buf[offset:offset + ANT_RECORD])
+    return zobrist
+
+def _antKey(ant):
+    return antKey(ant.type, ant.player, ant.coords[0], ant.coords[1],
+                  ant.health, ant.carrying, ant.hasMoved)
 
 def addCoords(tuple1, tuple2):
     if len(tuple1) != len(tuple2):
@@ -17,11 +103,187 @@ def subtractCoords(tuple1, tuple2):
     else:
         return tuple([tuple1[i] - tuple2[i] for i in range(0, len(tuple1))])
 
+##
+# listAttackable
+#
+# lists the attackable coordinates from a start coordinate and attack range
+# coordinates from a taxicab square around start
+#
+# The result only depends on the arguments, so it is computed once (by
+# findAttackable) and cached.  Kept here rather than in AIPlayerUtils, which
+# imports it from this module, since the move generation below uses it.
+#
+# coord - the coordinate of the attacking ant
+# dist - the attack range of the attacking ant
+def listAttackable(coord, dist = 1):
+    key = (coord[0], coord[1], dist)
+    if key not in ATTACKABLE_COORDS:
+        ATTACKABLE_COORDS[key] = tuple(findAttackable(coord, dist))
+    return list(ATTACKABLE_COORDS[key])
+
+#results of listAttackable by (x, y, dist), filled in as they are asked for
+ATTACKABLE_COORDS = {}
+
+def findAttackable(coord, dist):
+    res = []
+
+    # goes L-R across board, offset by 1 for range()
+    for i in range(-dist, dist + 1):
+        # get allowed y variance given x variance
+        # offset by 1 for range()
+        yLen = dist - abs(i)
+        for j in range(-yLen, yLen + 1):
+            x = coord[0] + i
+            y = coord[1] + j
+            if 0 <= x < BOARD_LENGTH and 0 <= y < BOARD_LENGTH and (i != 0 or j != 0):
+                res.append(BOARD_COORDS[x][y])
+
+    return res
+
+##
+#ConstrLayout
+#
+#Description: The fixed part of a packed GameState.  Constructions never move
+#   once they have been placed, so their positions are stored once in this
+#   table and shared by every clone made from the same layout.  Only the
+#   capture health of buildings lives in the per-state buffer.
+#
+#Variables:
+#   records - A tuple with one (inventory, isBuilding, type, x, y) entry per
+#       construction, in inventory order.
+#   buildings - (inventory, index, coords, type) of every Building, in
+#       buffer order.
+#   shared - Per inventory, the list of grass and food Construction objects
+#       handed out to every state unpacked from this layout, with None in the
+#       slots of buildings (which are created per state).
+#   sharedIndex - The 100-slot occupancy index of the shared objects, which
+#       unpacked states copy and then fill in with their own buildings.
+#   zobrist - The Zobrist key of the construction placements.
+#   terrain - The Terrain built from these constructions (see getTerrain).
+##
+class ConstrLayout(object):
+
+    #recently used layouts by records, so that states built separately from
+    #the same constructions (e.g. both players' copies) share one Terrain
+    cache = {}
+    CACHE_SIZE = 16
+
+    ##
+    #get
+    #Description: Returns the layout for the given records, reusing a cached
+    #   one if possible
+    #
+    #Parameters:
+    #   records - as in ConstrLayout.records (tuple)
+    #   terrain - the Terrain of these records if it has already been built
+    #       (e.g. by the process that sent them), or None
+    ##
+    @staticmethod
+    def get(records, terrain = None):
+        layout = ConstrLayout.cache.get(records)
+        if layout is None:
+            if len(ConstrLayout.cache) >= ConstrLayout.CACHE_SIZE:
+                ConstrLayout.cache.clear()
+            layout = ConstrLayout.cache[records] = ConstrLayout(records)
+        if layout.terrain is None:
+            layout.terrain = terrain
+        return layout
+
+    def __init__(self, records):
+        self.records = records
+        self.buildings = []
+        counts = [0, 0, 0]
+        for invIndex, isBuilding, constrType, x, y in records:
+            if isBuilding:
+                coords = None if x < 0 else BOARD_COORDS[x][y]
+                self.buildings.append((invIndex, counts[invIndex], coords, constrType))
+            counts[invIndex] += 1
+        self.shared = None
+        self.sharedIndex = None
+        self.cells = None
+        self.anthills = None
+        self.zobrist = 0
+        for invIndex, isBuilding, constrType, x, y in records:
+            if x >= 0:
+                self.zobrist ^= constrKey(invIndex, constrType, x, y)
+        self.terrain = None
+
+    ##
+    #getTerrain
+    #Description: Returns the Terrain of these constructions, building it the
+    #   first time it is needed (or flipping the mirror-image layout's)
+    ##
+    def getTerrain(self):
+        if self.terrain is None:
+            #the other player's view of the same board is just as good
+            mirror = ConstrLayout.cache.get(tuple([
+                (invIndex, isBuilding, constrType, x, y) if x < 0 else
+                (invIndex, isBuilding, constrType, BOARD_LENGTH - 1 - x, BOARD_LENGTH - 1 - y)
+                for invIndex, isBuilding, constrType, x, y in self.records]))
+            if mirror is not None and mirror.terrain is not None:
+                self.terrain = mirror.terrain.flipped()
+            else:
+                self.terrain = Terrain(self.records)
+        return self.terrain
+
+    ##
+    #getShared
+    #Description: Returns the shared grass and food objects, creating them the
+    #   first time they are needed.
+    ##
+    def getShared(self):
+        if self.shared is None:
+            self.shared = ([], [], [])
+            self.sharedIndex = [None] * (BOARD_LENGTH * BOARD_LENGTH)
+            for invIndex, isBuilding, constrType, x, y in self.records:
+                constr = None
+                if not isBuilding:
+                    constr = Construction(None if x < 0 else BOARD_COORDS[x][y], constrType)
+                    cell = x * BOARD_LENGTH + y
+                    if x >= 0 and self.sharedIndex[cell] is None:
+                        self.sharedIndex[cell] = constr
+                self.shared[invIndex].append(constr)
+        return self.shared
+
+    ##
+    #getCells
+    #Description: Returns what nextState needs to know about the constructions
+    #   without creating them, building it the first time it is needed: the
+    #   (inventory, type) of the construction on each cell (the first one
+    #   listed if two share a cell), and the (buffer index, coords) of each
+    #   player's anthill, or None.
+    ##
+    def getCells(self):
+        if self.cells is None:
+            self.cells = {}
+            for invIndex, isBuilding, constrType, x, y in self.records:
+                if x >= 0 and (x, y) not in self.cells:
+                    self.cells[(x, y)] = (invIndex, constrType)
+            self.anthills = [None, None, None]
+            for index, (invIndex, position, coords, constrType) in enumerate(self.buildings):
+                if constrType == ANTHILL and self.anthills[invIndex] is None:
+                    self.anthills[invIndex] = (index, coords)
+        return self.cells
+
+
 ##
 #GameState
 #
 #Description: The current state of the game.
 #
+#   A GameState is stored in one of two forms.  A state produced by clone() or
+#   fastclone() starts out packed: a flat array buffer plus a shared
+#   ConstrLayout.  The board and inventories are only materialized into
+#   Location, Ant and Construction objects the first time they are accessed.
+#   Once materialized, the objects are the authoritative copy and the buffer
+#   is discarded.
+#
+#   GameStates are hashable (see zobristHash).  The hash is computed on first
+#   use and then kept current by applyMove and the moveAnt, addAnt, removeAnt,
+#   updateAnt, setCaptureHealth and addConstr helpers, and it is inherited by
+#   clones.  Code that changes ants or buildings by assigning their attributes
+#   directly must call invalidateHash afterwards.
+#
 #Variables:
 #   board - The game Board being used. A 2d array of Location.
 #   inventories - A tuple containing the Inventory for each player.
@@ -42,11 +304,56 @@ class GameState(object):
     #   inputTurn - The ID of the Player who's turn it is (int)
     ##
     def __init__(self, inputBoard, inputInventories, inputPhase, inputTurn):
+        self._packed = None
+        self._antIds = None
+        self._layout = None
+        self._constrObjs = None
+        self._antIndex = None
+        self._constrIndex = None
+        self._zobrist = None
+        self._sharesObjects = False
+        self._packedCells = None
         self.board = inputBoard
         self.inventories = inputInventories
         self.phase = inputPhase
         self.whoseTurn = inputTurn
 
+    ##
+    #board
+    #Description: The 2d array of Location, built from the inventories on first
+    #   access.  Always None for a state made by fastclone.
+    ##
+    @property
+    def board(self):
+        if self._board is None and not self._boardless:
+            self._board = self._buildBoard()
+        return self._board
+
+    @board.setter
+    def board(self, inputBoard):
+        self._board = inputBoard
+        self._boardless = inputBoard is None
+
+    ##
+    #inventories
+    #Description: The list of Inventory objects, unpacked on first access.
+    ##
+    @property
+    def inventories(self):
+        if self._inventories is None:
+            self._unpack()
+        return self._inventories
+
+    @inventories.setter
+    def inventories(self, inputInventories):
+        self._inventories = inputInventories
+        self._packed = None
+        self._antIds = None
+        self._antIndex = None
+        self._constrIndex = None
+        self._zobrist = None
+        self._sharesObjects = False
+
     ##
     #coordLookup
     #Description: Returns the appropriate coordinates for the given
@@ -69,6 +376,10 @@ class GameState(object):
     #
     ##
     def flipBoard(self):
+        if self._sharesObjects:
+            self._detach()
+        self._unshareConstrs()
+
         for col in self.board:
             col.reverse()
             
@@ -79,7 +390,36 @@ class GameState(object):
                 ant.coords = self.coordLookup(ant.coords, PLAYER_TWO)
             for constr in inv.constrs:
                 constr.coords = self.coordLookup(constr.coords, PLAYER_TWO)
+        #everything moved, so the layout table, the indexes and the hash are stale
+        self._layout = None
+        self._constrObjs = None
+        self._antIndex = None
+        self._constrIndex = None
+        self._zobrist = None
       
+    ##
+    #_unshareConstrs
+    #Description: Replaces the grass and food objects shared with other clones
+    #   by private copies (used before they are modified in place)
+    #
+    ##
+    def _unshareConstrs(self):
+        #unpacking first, since that is what hands out the shared objects
+        invs = self.inventories
+        if self._layout is None or self._layout.shared is None:
+            return
+        copies = {}
+        for inv in invs:
+            for i in range(len(inv.constrs)):
+                constr = inv.constrs[i]
+                if type(constr) is not Building:
+                    copies[id(constr)] = inv.constrs[i] = constr.clone()
+        if self._board is not None:
+            for col in self._board:
+                for loc in col:
+                    if loc.constr is not None and id(loc.constr) in copies:
+                        loc.constr = copies[id(loc.constr)]
+
     ##
     #clearConstrs
     #Description: Clears the board of all constructions (so Player Two doesn't see Player One's setup)
@@ -90,6 +430,557 @@ class GameState(object):
             for loc in col:
                 loc.constr = None
 
+    ##
+    #applyMove
+    #Description: Applies a move to this state in place, following the same
+    #   rules as AIPlayerUtils.getNextStateAdversarial, and returns a record
+    #   that undoMove uses to restore the exact prior state.  This lets a
+    #   search walk the game tree without cloning at every node.
+    #
+    #Parameters:
+    #   move - The move to apply (Move)
+    #   adversarial - If False, follow AIPlayerUtils.getNextState instead:
+    #       moved ants keep hasMoved False and END only wears down the anthill
+    #
+    #Return: an undo record (tuple) to pass to undoMove
+    ##
+    def applyMove(self, move, adversarial = True):
+        if self._sharesObjects:
+            self._detach()
+        me = self.whoseTurn
+        myInv = self.inventories[me]
+        hill = myInv.getAnthill()
+        hillHealth = hill.captureHealth
+        zobrist = self._zobrist
+
+        #an enemy ant sitting on my anthill wears it down
+        occupant = self.getAntAt(hill.coords)
+        if occupant is not None and occupant.player != me:
+            self.setCaptureHealth(hill, hillHealth - 1)
+
+        if move.moveType == BUILD:
+            if move.buildType == TUNNEL:
+                #ants are no longer allowed to build tunnels, so this is an error
+                print("Attempted tunnel build in applyMove()")
+                hill.captureHealth = hillHealth
+                self._zobrist = zobrist
+                return (BUILD, me, hillHealth, None, zobrist)
+            if move.buildType not in (WORKER, DRONE, SOLDIER, R_SOLDIER):
+                return (BUILD, me, hillHealth, None, zobrist)
+            foodBefore = myInv.foodCount
+            self.addAnt(Ant(hill.coords, move.buildType, me))
+            myInv.foodCount -= UNIT_STATS[move.buildType][COST]
+            return (BUILD, me, hillHealth, foodBefore, zobrist)
+
+        elif move.moveType == MOVE_ANT:
+            return (MOVE_ANT, me, hillHealth, self._applyAntMove(myInv, move.coordList, adversarial), zobrist)
+
+        elif move.moveType == END and adversarial:
+            hasMoved = tuple([ant.hasMoved for ant in myInv.ants])
+            for ant in myInv.ants:
+                self.updateAnt(ant, hasMoved = False)
+            self.whoseTurn = 1 - me
+            return (END, me, hillHealth, hasMoved, zobrist)
+
+        return (move.moveType, me, hillHealth, None, zobrist)
+
+    ##
+    #_applyAntMove
+    #Description: The MOVE_ANT part of applyMove: moves the ant, picks up or
+    #   drops food and makes the first attack in range.
+    #
+    #Return: the MOVE_ANT payload of the undo record (tuple)
+    ##
+    def _applyAntMove(self, myInv, coordList, adversarial):
+        me = myInv.player
+        start = coordList[0]
+        end = coordList[-1]
+        ant = self.getAntAt(start)
+        if ant is not None and ant.player != me:
+            ant = None
+
+        oldState = None
+        victim = None
+        victimHealth = None
+        victimIndex = -1
+        foodBefore = myInv.foodCount
+        if ant is not None:
+            oldState = (ant.coords, ant.hasMoved, ant.carrying)
+            self.moveAnt(ant, end)
+
+            #drop food on the anthill or a tunnel, pick it up from food
+            carrying = ant.carrying
+            constr = self.getConstrAt(end)
+            if carrying and constr is not None and constr in myInv.constrs:
+                myInv.foodCount += 1
+                carrying = False
+            if not carrying and ant.type == WORKER and constr is not None and constr.type == FOOD:
+                carrying = True
+            self.updateAnt(ant, carrying = carrying, hasMoved = False)
+
+            #attack the first enemy in range
+            for coord in listAttackable(end, UNIT_STATS[ant.type][RANGE]):
+                foundAnt = self.getAntAt(coord)
+                if foundAnt is not None and foundAnt.player != me:
+                    victim = foundAnt
+                    victimHealth = foundAnt.health
+                    self.updateAnt(foundAnt, health = victimHealth - UNIT_STATS[ant.type][ATTACK])
+                    if foundAnt.health <= 0:
+                        victimIndex = self.removeAnt(foundAnt)
+                    break
+
+        #the ant that ends on the last coordinate has now moved
+        marked = None
+        markedHasMoved = None
+        if adversarial:
+            marked = self.getAntAt(end)
+            if marked is not None and marked.player == me:
+                markedHasMoved = marked.hasMoved
+                self.updateAnt(marked, hasMoved = True)
+            else:
+                marked = None
+
+        return (ant, oldState, foodBefore, victim, victimHealth, victimIndex, marked, markedHasMoved)
+
+    ##
+    #undoMove
+    #Description: Reverts the move that produced the given record.  Records
+    #   must be undone in the reverse order they were applied.
+    #
+    #Parameters:
+    #   record - A record returned by applyMove (tuple)
+    ##
+    def undoMove(self, record):
+        moveType, me, hillHealth, payload, zobrist = record
+        myInv = self.inventories[me]
+        #the record holds the prior hash, so skip updating it along the way
+        self._zobrist = None
+
+        if moveType == BUILD and payload is not None:
+            self.removeAnt(myInv.ants[-1])
+            myInv.foodCount = payload
+
+        elif moveType == MOVE_ANT:
+            ant, oldState, foodBefore, victim, victimHealth, victimIndex, marked, markedHasMoved = payload
+            if marked is not None:
+                marked.hasMoved = markedHasMoved
+            if victim is not None:
+                victim.health = victimHealth
+                if victimIndex >= 0:
+                    self.addAnt(victim, victimIndex)
+            if ant is not None:
+                oldCoords, ant.hasMoved, ant.carrying = oldState
+                self.moveAnt(ant, oldCoords)
+            myInv.foodCount = foodBefore
+
+        elif moveType == END and payload is not None:
+            self.whoseTurn = me
+            for ant, hasMoved in zip(myInv.ants, payload):
+                ant.hasMoved = hasMoved
+
+        myInv.getAnthill().captureHealth = hillHealth
+        self._zobrist = zobrist
+
+    ##
+    #nextStates
+    #Description: Returns the result of each of the given moves as a new
+    #   boardless state, like applyMove on a fastclone but in one batch.  The
+    #   work that only depends on this state (the occupancy indexes, whether
+    #   the anthill is under attack, which cells are in reach of an enemy) is
+    #   done once, and each result only copies the objects its move changes:
+    #   the mover's inventory, the anthill if it is being captured and the
+    #   enemy's inventory if the move attacks.
+    #
+    #   CAVEAT: the objects a result does not copy are shared with this state
+    #   and with the other results.  applyMove and flipBoard on any of them
+    #   copy the shared objects first, but anything else that changes one of
+    #   them in place (including the moveAnt and updateAnt helpers) must be
+    #   given a clone() instead.
+    #
+    #Parameters:
+    #   moves - The moves to apply (list of Move)
+    #   adversarial - As in applyMove (bool)
+    #
+    #Return: the resulting states, in the order of the moves (list of GameState)
+    ##
+    def nextStates(self, moves, adversarial = True):
+        me = self.whoseTurn
+        invs = self.inventories
+        myInv = invs[me]
+        enemy = 1 - me
+        hill = myInv.getAnthill()
+        occupant = self.getAntAt(hill.coords)
+        hillAttacked = occupant is not None and occupant.player != me
+        self.getConstrAt(hill.coords)
+        antIndex = self._antIndex
+
+        #whether an ant with the given range attacks after ending on a cell
+        inReach = {}
+        def attacks(end, reach):
+            key = (end, reach)
+            if key not in inReach:
+                inReach[key] = False
+                for coord in listAttackable(end, reach):
+                    foundAnt = antIndex[coord[0] * BOARD_LENGTH + coord[1]]
+                    if foundAnt is not None and foundAnt.player != me:
+                        inReach[key] = True
+                        break
+            return inReach[key]
+
+        results = []
+        for move in moves:
+            copyEnemy = False
+            if move.moveType == MOVE_ANT:
+                start = move.coordList[0]
+                ant = self.getAntAt(start)
+                if ant is not None and ant.player == me:
+                    copyEnemy = attacks(move.coordList[-1], UNIT_STATS[ant.type][RANGE])
+            nextState = self._sharedCopy(me, hillAttacked, copyEnemy)
+            nextState.applyMove(move, adversarial)
+            nextState._sharesObjects = True
+            results.append(nextState)
+        if results:
+            self._sharesObjects = True
+        return results
+
+    ##
+    #_sharedCopy
+    #Description: A boardless copy for nextStates that copies the mover's
+    #   inventory and, as asked, the anthill and the enemy's inventory, and
+    #   shares everything else with this state
+    ##
+    def _sharedCopy(self, me, copyHill, copyEnemy):
+        invs = self._inventories
+        antIndex = list(self._antIndex)
+        newInvs = list(invs)
+        for player in (me, 1 - me) if copyEnemy else (me,):
+            inv = invs[player]
+            ants = []
+            for ant in inv.ants:
+                newAnt = Ant.make(ant.coords, ant.type, ant.player, ant.health,
+                                  ant.carrying, ant.hasMoved, ant.UniqueID)
+                cell = ant.coords[0] * BOARD_LENGTH + ant.coords[1]
+                if antIndex[cell] is ant:
+                    antIndex[cell] = newAnt
+                ants.append(newAnt)
+            newInvs[player] = Inventory(inv.player, ants, inv.constrs, inv.foodCount)
+
+        constrIndex = self._constrIndex
+        constrObjs = self._constrObjs
+        if copyHill:
+            myInv = newInvs[me]
+            myInv.constrs = list(myInv.constrs)
+            for i in range(len(myInv.constrs)):
+                if myInv.constrs[i].type == ANTHILL:
+                    hill = myInv.constrs[i] = myInv.constrs[i].clone()
+                    constrIndex = list(constrIndex)
+                    cell = hill.coords[0] * BOARD_LENGTH + hill.coords[1]
+                    constrIndex[cell] = hill
+                    constrObjs = None
+                    break
+
+        newState = GameState.__new__(GameState)
+        newState._packed = None
+        newState._antIds = None
+        newState._layout = self._layout
+        newState._constrObjs = constrObjs
+        newState._antIndex = antIndex
+        newState._constrIndex = constrIndex
+        newState._zobrist = self._zobrist
+        newState._sharesObjects = False
+        newState._packedCells = None
+        newState._board = None
+        newState._boardless = True
+        newState._inventories = newInvs
+        newState.phase = self.phase
+        newState.whoseTurn = self.whoseTurn
+        return newState
+
+    ##
+    #_detach
+    #Description: Replaces objects shared by nextStates with private copies
+    #   (used before the state is modified in place)
+    ##
+    def _detach(self):
+        self._packed, self._antIds = self._pack()
+        self._inventories = None
+        self._board = None
+        self._antIndex = None
+        self._constrIndex = None
+        self._unpack()
+
+    ##
+    #getAntAt
+    #Description: Returns the ant at the given coordinates in O(1) using the
+    #   occupancy index (built from the inventories on first use)
+    #
+    #Parameters:
+    #   coords - The board position to look at ((int, int))
+    #
+    #Return: the Ant or None if the cell is empty or off the board
+    ##
+    def getAntAt(self, coords):
+        x, y = coords
+        if x < 0 or y < 0 or x >= BOARD_LENGTH or y >= BOARD_LENGTH:
+            return None
+        if self._antIndex is None:
+            self._antIndex = self._buildIndex([inv.ants for inv in self.inventories])
+        return self._antIndex[x * BOARD_LENGTH + y]
+
+    ##
+    #getConstrAt
+    #Description: Returns the construction at the given coordinates in O(1)
+    #   using the occupancy index (built from the inventories on first use)
+    #
+    #Parameters:
+    #   coords - The board position to look at ((int, int))
+    #
+    #Return: the Construction or None if the cell is empty or off the board
+    ##
+    def getConstrAt(self, coords):
+        x, y = coords
+        if x < 0 or y < 0 or x >= BOARD_LENGTH or y >= BOARD_LENGTH:
+            return None
+        if self._constrIndex is None:
+            self._constrIndex = self._buildIndex([inv.constrs for inv in self.inventories])
+        return self._constrIndex[x * BOARD_LENGTH + y]
+
+    ##
+    #_buildIndex
+    #Description: Builds a 100-slot occupancy index from lists of ants or
+    #   constructions.  If two share a cell, the first one listed wins.
+    ##
+    def _buildIndex(self, lists):
+        index = [None] * (BOARD_LENGTH * BOARD_LENGTH)
+        for items in reversed(lists):
+            for item in reversed(items):
+                if item.coords is not None:
+                    index[item.coords[0] * BOARD_LENGTH + item.coords[1]] = item
+        return index
+
+    ##
+    #moveAnt
+    #Description: Moves an ant to new coordinates, keeping the board and the
+    #   occupancy index current.  Code that moves ants in a GameState should
+    #   use this rather than assigning ant.coords.
+    #
+    #Parameters:
+    #   ant - The ant to move (Ant)
+    #   coords - Where to put it ((int, int))
+    ##
+    def moveAnt(self, ant, coords):
+        self._clearAntCell(ant)
+        ant.coords = coords
+        self._fillAntCell(ant)
+
+    ##
+    #addAnt
+    #Description: Adds an ant to its owner's inventory, board and index
+    #
+    #Parameters:
+    #   ant - The ant to add (Ant)
+    #   position - Where to insert it in the inventory (default: at the end)
+    ##
+    def addAnt(self, ant, position = None):
+        ants = self.inventories[ant.player].ants
+        if position is None:
+            ants.append(ant)
+        else:
+            ants.insert(position, ant)
+        self._fillAntCell(ant)
+
+    ##
+    #removeAnt
+    #Description: Removes an ant from its owner's inventory, board and index
+    #
+    #Parameters:
+    #   ant - The ant to remove (Ant)
+    #
+    #Return: the position it had in the inventory (int)
+    ##
+    def removeAnt(self, ant):
+        ants = self.inventories[ant.player].ants
+        position = ants.index(ant)
+        del ants[position]
+        self._clearAntCell(ant)
+        return position
+
+    ##
+    #addConstr
+    #Description: Places a construction on the board and in an inventory
+    #
+    #Parameters:
+    #   constr - The construction, with its coords already set (Construction)
+    #   invIndex - The inventory it belongs to (int)
+    ##
+    def addConstr(self, constr, invIndex):
+        self.board[constr.coords[0]][constr.coords[1]].constr = constr
+        self.inventories[invIndex].constrs.append(constr)
+        self._constrIndex = None
+        if self._zobrist is not None:
+            self._zobrist ^= constrKey(invIndex, constr.type, constr.coords[0], constr.coords[1])
+            if type(constr) is Building:
+                self._zobrist ^= captureKey(constr.coords, constr.captureHealth)
+
+    ##
+    #updateAnt
+    #Description: Changes an ant's health, carrying or hasMoved status, keeping
+    #   the hash current.  Arguments left as None are not changed.
+    #
+    #Parameters:
+    #   ant - The ant to change (Ant)
+    #   health - Its new health (int)
+    #   carrying - Whether it is now carrying food (bool)
+    #   hasMoved - Whether it has now moved (bool)
+    ##
+    def updateAnt(self, ant, health = None, carrying = None, hasMoved = None):
+        tracked = self._zobrist is not None
+        if tracked:
+            self._zobrist ^= _antKey(ant)
+        if health is not None:
+            ant.health = health
+        if carrying is not None:
+            ant.carrying = carrying
+        if hasMoved is not None:
+            ant.hasMoved = hasMoved
+        if tracked:
+            self._zobrist ^= _antKey(ant)
+
+    ##
+    #setCaptureHealth
+    #Description: Changes a building's capture health, keeping the hash current
+    #
+    #Parameters:
+    #   building - A building in one of the inventories (Building)
+    #   captureHealth - Its new capture health (int)
+    ##
+    def setCaptureHealth(self, building, captureHealth):
+        if self._zobrist is not None and building.coords is not None:
+            self._zobrist ^= (captureKey(building.coords, building.captureHealth) ^
+                              captureKey(building.coords, captureHealth))
+        building.captureHealth = captureHealth
+
+    def _clearAntCell(self, ant):
+        x, y = ant.coords
+        if self._board is not None and self._board[x][y].ant is ant:
+            self._board[x][y].ant = None
+        if self._antIndex is not None and self._antIndex[x * BOARD_LENGTH + y] is ant:
+            self._antIndex[x * BOARD_LENGTH + y] = None
+        if self._zobrist is not None:
+            self._zobrist ^= _antKey(ant)
+
+    def _fillAntCell(self, ant):
+        x, y = ant.coords
+        if self._board is not None:
+            self._board[x][y].ant = ant
+        if self._antIndex is not None:
+            self._antIndex[x * BOARD_LENGTH + y] = ant
+        if self._zobrist is not None:
+            self._zobrist ^= _antKey(ant)
+
+    ##
+    #zobristHash
+    #Description: Returns a 64-bit Zobrist hash of the ants, constructions,
+    #   capture health, food counts, phase and whose turn it is.  The part
+    #   covering ants and constructions is computed once and then updated
+    #   incrementally, so after the first call this is O(1).
+    #
+    #Return: the hash (int)
+    ##
+    def zobristHash(self):
+        if self._zobrist is None:
+            self._zobrist = self._computeZobrist()
+        if self._inventories is None:
+            food = self._packed[PLAYER_ONE], self._packed[PLAYER_TWO]
+        else:
+            food = self._inventories[PLAYER_ONE].foodCount, self._inventories[PLAYER_TWO].foodCount
+        return (self._zobrist ^ ZOBRIST_FOOD[food[0] & 31] ^ ZOBRIST_FOOD[32 + (food[1] & 31)] ^
+                ZOBRIST_PHASE[self.phase & 3] ^ ZOBRIST_TURN[self.whoseTurn & 1])
+
+    ##
+    #invalidateHash
+    #Description: Discards the cached hash after ants or buildings have been
+    #   changed without going through the GameState helpers
+    ##
+    def invalidateHash(self):
+        self._zobrist = None
+
+    def __hash__(self):
+        return self.zobristHash()
+
+    ##
+    #__eq__
+    #Description: Two states are equal if they hold the same ants (ignoring
+    #   their UniqueID and inventory order), constructions, food, phase and
+    #   turn.
+    ##
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.zobristHash() == other.zobristHash() and self._signature() == other._signature()
+
+    ##
+    #_computeZobrist
+    #Description: Computes the ant and construction part of the hash from
+    #   scratch, reading the packed buffer directly if there is one
+    ##
+    def _computeZobrist(self):
+        if self._inventories is None:
+            values = self._packed.tolist()
+            key = self._layout.zobrist
+            end = PACK_HEADER + values[2] * ANT_RECORD
+            fields = iter(values[PACK_HEADER:end])
+            for record in zip(*[fields] * ANT_RECORD):
+                key ^= antKey(*record)
+            for building, capHealth in zip(self._layout.buildings, values[end:]):
+                if building[2] is not None:
+                    key ^= captureKey(building[2], capHealth)
+            return key
+
+        key = 0
+        for invIndex in range(len(self._inventories)):
+            inv = self._inventories[invIndex]
+            for ant in inv.ants:
+                key ^= _antKey(ant)
+            for constr in inv.constrs:
+                if constr.coords is not None:
+                    key ^= constrKey(invIndex, constr.type, constr.coords[0], constr.coords[1])
+                    if type(constr) is Building:
+                        key ^= captureKey(constr.coords, constr.captureHealth)
+        return key
+
+    ##
+    #_signature
+    #Description: The contents compared by __eq__, as a tuple of the phase,
+    #   turn, food counts and frozensets of ant and construction records
+    ##
+    def _signature(self):
+        if self._inventories is None:
+            values = self._packed.tolist()
+            end = PACK_HEADER + values[2] * ANT_RECORD
+            fields = iter(values[PACK_HEADER:end])
+            ants = frozenset(zip(*[fields] * ANT_RECORD))
+            capture = iter(values[end:])
+            constrs = frozenset([(invIndex, constrType, x, y, next(capture) if isBuilding else None)
+                                 for invIndex, isBuilding, constrType, x, y in self._layout.records])
+            return (self.phase, self.whoseTurn, values[0], values[1], ants, constrs)
+
+        ants = []
+        constrs = []
+        for invIndex in range(len(self._inventories)):
+            inv = self._inventories[invIndex]
+            for ant in inv.ants:
+                ants.append((ant.type, ant.player, ant.coords[0], ant.coords[1],
+                             ant.health, ant.carrying, ant.hasMoved))
+            for constr in inv.constrs:
+                coords = constr.coords if constr.coords is not None else (-1, -1)
+                constrs.append((invIndex, constr.type, coords[0], coords[1],
+                                constr.captureHealth if type(constr) is Building else None))
+        return (self.phase, self.whoseTurn, self._inventories[PLAYER_ONE].foodCount,
+                self._inventories[PLAYER_TWO].foodCount, frozenset(ants), frozenset(constrs))
+
     ##
     # getBlankState
     #
@@ -101,7 +992,7 @@ class GameState(object):
         for y in range(10):
             tmp = []
             for x in range(10):
-                tmp.append(Location((x, y)))
+                tmp.append(Location(BOARD_COORDS[x][y]))
             board.append(tmp)
 
         invents = [Inventory(PLAYER_ONE, [], [], 0),
@@ -126,7 +1017,7 @@ class GameState(object):
         p1Hill = Building((0, 0), ANTHILL, 0)
         p1Tunnel = Building((9, 0), TUNNEL, 0)
         state.board[0][0].constr = p1Hill
-        state.board[0][9].contrs = p1Tunnel
+        state.board[9][0].constr = p1Tunnel
         state.inventories[0].constrs += [p1Hill, p1Tunnel]
 
         #player 2
@@ -137,7 +1028,7 @@ class GameState(object):
         p1Hill = Building((9, 9), ANTHILL, 1)
         p1Tunnel = Building((0, 9), TUNNEL, 1)
         state.board[9][9].constr = p1Hill
-        state.board[9][0].contrs = p1Tunnel
+        state.board[0][9].constr = p1Tunnel
         state.inventories[1].constrs += [p1Hill, p1Tunnel]
 
         return state
@@ -145,40 +1036,14 @@ class GameState(object):
 
     ##
     #clone
-    #Description: Returns a deep copy of itself
+    #Description: Returns a deep copy of itself.  The copy is packed, so the
+    #   cost is one pass over the ants and buildings; Location and Ant objects
+    #   are only created if the copy's board or inventories are used.
     #
     #Return: The GameState identical to the original
     ##
     def clone(self):
-        newBoard = []
-        ants1 = []
-        ants2 = []
-        cons1 = []
-        cons2 = []
-        cons3 = []
-        food1 = self.inventories[PLAYER_ONE].foodCount
-        food2 = self.inventories[PLAYER_TWO].foodCount
-        for col in range(0, len(self.board)):
-            newBoard.append([])
-            for row in range(0, len(self.board)):
-                newLoc = self.board[col][row].clone()
-                newBoard[col].append(newLoc)
-                #Organize constructions into inventories
-                if newLoc.constr != None and type(newLoc.constr) is Building and newLoc.constr.player == PLAYER_ONE:
-                    cons1.append(newLoc.constr)
-                elif newLoc.constr != None and type(newLoc.constr) is Building and newLoc.constr.player == PLAYER_TWO:
-                    cons2.append(newLoc.constr)
-                #Organize ants into inventories
-                if newLoc.ant != None and newLoc.ant.player == PLAYER_ONE:
-                    ants1.append(newLoc.ant)
-                elif newLoc.ant != None and newLoc.ant.player == PLAYER_TWO:
-                    ants2.append(newLoc.ant)
-        for constr in self.inventories[NEUTRAL].constrs:
-            cons3.append(constr.clone())
-        newInventories = [Inventory(PLAYER_ONE, ants1, cons1, food1),
-                          Inventory(PLAYER_TWO, ants2, cons2, food2),
-                          Inventory(NEUTRAL, [], cons3, 0)]
-        return GameState(newBoard, newInventories, self.phase, self.whoseTurn)
+        return self._packedCopy(False)
 
 
     ##
@@ -188,44 +1053,314 @@ class GameState(object):
     # to None).  Omitting the board makes the clone run much faster and, if
     # necessary, the board can be reconstructed from the inventories.
     #
+    # CAVEAT: grass and food never change once placed, so clones made from the
+    # same layout share those Construction objects.
+    #
     #Return: a GameState object _almost_ identical to the original
     ##
     def fastclone(self):
-        newBoard = None
-        #For speed, preallocate the lists at their eventual size 
-        ants1 = [ None ] * len(self.inventories[PLAYER_ONE].ants)
-        ants2 = [ None ] * len(self.inventories[PLAYER_TWO].ants)
-        cons1 = [ None ] * len(self.inventories[PLAYER_ONE].constrs)
-        cons2 = [ None ] * len(self.inventories[PLAYER_TWO].constrs)
-        cons3 = [ None ] * len(self.inventories[NEUTRAL].constrs)
-        antIndex1 = 0
-        antIndex2 = 0
-        conIndex1 = 0
-        conIndex2 = 0
-        conIndex3 = 0
-
-        #clone all the entries in the inventories
-        for ant in self.inventories[PLAYER_ONE].ants:
-            ants1[antIndex1] = ant.clone()
-            antIndex1 += 1
-        for ant in self.inventories[PLAYER_TWO].ants:
-            ants2[antIndex2] = ant.clone()
-            antIndex2 += 1
-        for constr in self.inventories[PLAYER_ONE].constrs:
-            cons1[conIndex1] = constr.clone()
-            conIndex1 += 1
-        for constr in self.inventories[PLAYER_TWO].constrs:
-            cons2[conIndex2] = constr.clone()
-            conIndex2 += 1
-        for constr in self.inventories[NEUTRAL].constrs:
-            cons3[conIndex3] = constr.clone()
-            conIndex3 += 1
-
-        #clone the list of inventory objects
-        food1 = self.inventories[PLAYER_ONE].foodCount
-        food2 = self.inventories[PLAYER_TWO].foodCount
-        newInventories = [ Inventory(PLAYER_ONE, ants1, cons1, food1),
-                           Inventory(PLAYER_TWO, ants2, cons2, food2),
-                           Inventory(NEUTRAL, [], cons3, 0) ]
-        
-        return GameState(newBoard, newInventories, self.phase, self.whoseTurn)
+        return self._packedCopy(True)
+
+    ##
+    #nextState
+    #Description: Returns the state after a move as a new boardless state,
+    #   worked out on a copy of the packed buffer, so no Ant, Construction or
+    #   Location objects are created.  Follows the same rules as applyMove.
+    #   Builds, which need a UniqueID for the new ant, fall back to applyMove
+    #   on a fastclone.
+    #
+    #   Where the ants are is worked out once per state and shared by all the
+    #   moves made from it.  A state whose board or inventories have been used
+    #   is packed again first, which takes several times as long as the move
+    #   itself; searches that work on unpacked states are faster with
+    #   applyMove and undoMove.
+    #
+    #Parameters:
+    #   move - The move to make (Move)
+    #   adversarial - As in applyMove (bool)
+    #
+    #Return: the next state (GameState)
+    ##
+    def nextState(self, move, adversarial = True):
+        newState = self._packedCopy(True)
+        layout = newState._layout
+        cells = layout.getCells()
+        me = newState.whoseTurn
+        hill = layout.anthills[me]
+        if move.moveType == BUILD or hill is None:
+            newState.applyMove(move, adversarial)
+            return newState
+
+        #where the ants were, shared by all the moves made from this state
+        parent = newState._packed
+        if self._packedCells is None or self._packedCells[0] is not parent:
+            self._packedCells = (parent, _antCells(parent))
+        at = self._packedCells[1]
+        buf = parent[:]
+        antIds = newState._antIds
+        zobrist = newState._zobrist
+
+        #an enemy ant sitting on my anthill wears it down
+        hillIndex, hillCoords = hill
+        occupant = at.get(hillCoords)
+        if occupant is not None and buf[occupant + 1] != me:
+            capture = PACK_HEADER + buf[2] * ANT_RECORD + hillIndex
+            if zobrist is not None:
+                zobrist ^= captureKey(hillCoords, buf[capture]) ^ captureKey(hillCoords, buf[capture] - 1)
+            buf[capture] -= 1
+
+        if move.moveType == MOVE_ANT:
+            start = move.coordList[0]
+            end = move.coordList[-1]
+            offset = at.get(start)
+            removed = None
+            if offset is not None and buf[offset + 1] == me:
+                antType = buf[offset]
+
+                #drop food on the anthill or a tunnel, pick it up from food
+                carrying = buf[offset + 5]
+                constr = cells.get(end)
+                if carrying and constr is not None and constr[0] == me:
+                    buf[me] += 1
+                    carrying = 0
+                if not carrying and antType == WORKER and constr is not None and constr[1] == FOOD:
+                    carrying = 1
+                zobrist = _setAnt(buf, offset, ((2, end[0]), (3, end[1]), (5, carrying), (6, 0)), zobrist)
+
+                #attack the first enemy in range.  Only the moving ant has
+                #changed cells, and its old cell can't hold an enemy nor its
+                #new one be in range, so the old positions still hold.
+                for coord in listAttackable(end, UNIT_STATS[antType][RANGE]):
+                    found = at.get(coord)
+                    if found is not None and buf[found + 1] != me:
+                        health = buf[found + 4] - UNIT_STATS[antType][ATTACK]
+                        zobrist = _setAnt(buf, found, ((4, health),), zobrist)
+                        if health <= 0:
+                            if zobrist is not None:
+                                zobrist ^= antKey(*buf[found:found + ANT_RECORD])
+                            del buf[found:found + ANT_RECORD]
+                            buf[2] -= 1
+                            position = (found - PACK_HEADER) // ANT_RECORD
+                            antIds = antIds[:position] + antIds[position + 1:]
+                            removed = found
+                        break
+                marked = offset
+            else:
+                marked = at.get(end)
+
+            #the ant that ends on the last coordinate has now moved
+            if adversarial and marked is not None:
+                if removed is not None and marked > removed:
+                    marked -= ANT_RECORD
+                if buf[marked + 1] == me:
+                    zobrist = _setAnt(buf, marked, ((6, 1),), zobrist)
+
+        elif move.moveType == END and adversarial:
+            for offset in range(PACK_HEADER, PACK_HEADER + buf[2] * ANT_RECORD, ANT_RECORD):
+                if buf[offset + 1] == me and buf[offset + 6]:
+                    zobrist = _setAnt(buf, offset, ((6, 0),), zobrist)
+            newState.whoseTurn = 1 - me
+
+        newState._packed = buf
+        newState._antIds = antIds
+        newState._zobrist = zobrist
+        return newState
+
+    ##
+    #__reduce__
+    #Description: Pickles the state in its packed form plus the construction
+    #   records, a few hundred bytes in all.  The receiving side looks the
+    #   layout (and with it the Terrain) up in its own cache, so a process
+    #   that is sent one state per move only builds them once per game.
+    ##
+    def __reduce__(self):
+        return (unpickleState, self.packedParts())
+
+    ##
+    #packedParts
+    #Description: The state in its packed form, as unpickleState takes it:
+    #   (buffer bytes, ant UniqueIDs, construction records, boardless, phase,
+    #   whoseTurn)
+    ##
+    def packedParts(self):
+        copy = self._packedCopy(self._boardless)
+        return (copy._packed.tobytes(), copy._antIds, copy._layout.records,
+                copy._boardless, copy.phase, copy.whoseTurn)
+
+    ##
+    #_packedCopy
+    #Description: Creates a new packed GameState holding the same contents.
+    #   The buffer of a state that has not been unpacked is never modified, so
+    #   it is shared rather than copied.
+    #
+    #Parameters:
+    #   boardless - True if the copy should have no board (bool)
+    ##
+    def _packedCopy(self, boardless):
+        newState = GameState.__new__(GameState)
+        if self._inventories is None:
+            newState._packed = self._packed
+            newState._antIds = self._antIds
+        else:
+            newState._packed, newState._antIds = self._pack()
+        newState._layout = self._layout
+        newState._constrObjs = None
+        newState._antIndex = None
+        newState._constrIndex = None
+        newState._zobrist = self._zobrist
+        newState._sharesObjects = False
+        newState._packedCells = None
+        newState._board = None
+        newState._boardless = boardless
+        newState._inventories = None
+        newState.phase = self.phase
+        newState.whoseTurn = self.whoseTurn
+        return newState
+
+    ##
+    #_pack
+    #Description: Encodes the inventories into a packed buffer, bringing the
+    #   layout table up to date first (see _updateLayout)
+    #
+    #Return: the buffer and the tuple of ant UniqueIDs (array, tuple)
+    ##
+    def _pack(self):
+        invs = self._inventories
+        constrObjs = self._updateLayout()
+        ants = invs[PLAYER_ONE].ants + invs[PLAYER_TWO].ants + invs[NEUTRAL].ants
+        buf = array('h', (invs[PLAYER_ONE].foodCount, invs[PLAYER_TWO].foodCount, len(ants)))
+        for ant in ants:
+            coords = ant.coords
+            buf.extend((ant.type, ant.player, coords[0], coords[1],
+                        ant.health, ant.carrying, ant.hasMoved))
+        buf.extend([constrObjs[invIndex][index].captureHealth
+                    for invIndex, index, coords, constrType in self._layout.buildings])
+        return buf, tuple([ant.UniqueID for ant in ants])
+
+    ##
+    #_updateLayout
+    #Description: Makes sure the layout table matches the construction
+    #   objects of a materialized state.  It is only rebuilt when the objects
+    #   differ from the ones it was made from, so grass and food objects stay
+    #   shared across generations of clones.
+    #
+    #Return: the construction objects of each inventory (tuple of tuples)
+    ##
+    def _updateLayout(self):
+        invs = self._inventories
+        constrObjs = (tuple(invs[PLAYER_ONE].constrs), tuple(invs[PLAYER_TWO].constrs),
+                      tuple(invs[NEUTRAL].constrs))
+        if self._layout is None or constrObjs != self._constrObjs:
+            records = []
+            for invIndex in range(len(constrObjs)):
+                for constr in constrObjs[invIndex]:
+                    coords = constr.coords if constr.coords is not None else (-1, -1)
+                    records.append((invIndex, type(constr) is Building, constr.type, coords[0], coords[1]))
+            records = tuple(records)
+            if self._layout is None or self._layout.records != records:
+                self._layout = ConstrLayout.get(records)
+            self._constrObjs = constrObjs
+        return self._constrObjs
+
+    ##
+    #getTerrain
+    #Description: Returns the Terrain (movement costs and all-pairs distances)
+    #   of this state's constructions.  It is built once per layout and shared
+    #   by every state with the same constructions.
+    #
+    #Parameters:
+    #   build - whether to build it if it has not been built yet (bool)
+    #
+    #Return: the Terrain, or None if it has not been built and build is False
+    ##
+    def getTerrain(self, build = True):
+        if self._inventories is not None:
+            self._updateLayout()
+        if not build:
+            return self._layout.terrain
+        return self._layout.getTerrain()
+
+    ##
+    #_unpack
+    #Description: Materializes the inventories from the packed buffer.  After
+    #   this the objects are authoritative and the buffer is dropped.
+    ##
+    def _unpack(self):
+        values = self._packed.tolist()
+        layout = self._layout
+        shared = layout.getShared()
+
+        ants = ([], [], [])
+        end = PACK_HEADER + values[2] * ANT_RECORD
+        fields = iter(values[PACK_HEADER:end])
+        for record, uniqueId in zip(zip(*[fields] * ANT_RECORD), self._antIds):
+            antType, player, x, y, health, carrying, hasMoved = record
+            ants[player].append(Ant.make(BOARD_COORDS[x][y], antType, player, health,
+                                         carrying == 1, hasMoved == 1, uniqueId))
+
+        constrs = (list(shared[PLAYER_ONE]), list(shared[PLAYER_TWO]), list(shared[NEUTRAL]))
+        constrIndex = list(layout.sharedIndex)
+        for building, capHealth in zip(layout.buildings, values[end:]):
+            invIndex, index, coords, constrType = building
+            constr = constrs[invIndex][index] = Building.make(coords, constrType, invIndex, capHealth)
+            if coords is not None:
+                constrIndex[coords[0] * BOARD_LENGTH + coords[1]] = constr
+
+        self._inventories = [Inventory(PLAYER_ONE, ants[PLAYER_ONE], constrs[PLAYER_ONE], values[0]),
+                             Inventory(PLAYER_TWO, ants[PLAYER_TWO], constrs[PLAYER_TWO], values[1]),
+                             Inventory(NEUTRAL, ants[NEUTRAL], constrs[NEUTRAL], 0)]
+        self._constrObjs = tuple([tuple(c) for c in constrs])
+        self._constrIndex = constrIndex
+        self._packed = None
+        self._antIds = None
+        self._sharesObjects = False
+
+    ##
+    #_buildBoard
+    #Description: Builds a board of Locations from the inventories
+    #
+    #Return: a 2d array of Location (accessed by board[x][y])
+    ##
+    def _buildBoard(self):
+        board = [[Location(BOARD_COORDS[y][x]) for y in range(BOARD_LENGTH)] for x in range(BOARD_LENGTH)]
+        for inv in self.inventories:
+            for constr in inv.constrs:
+                if constr.coords is not None:
+                    board[constr.coords[0]][constr.coords[1]].constr = constr
+            for ant in inv.ants:
+                board[ant.coords[0]][ant.coords[1]].ant = ant
+        return board
+
+
+##
+#unpickleState
+#Description: Rebuilds a GameState pickled by GameState.__reduce__.  The
+#   Terrain of the records can be passed along if the sender has built it.
+##
+def unpickleState(packed, antIds, records, boardless, phase, whoseTurn, terrain = None):
+    return packedState(packed, antIds, ConstrLayout.get(records, terrain), boardless, phase, whoseTurn)
+
+##
+#packedState
+#Description: A GameState from the bytes of a packed buffer and the
+#   ConstrLayout it goes with, for a receiver that keeps the layout between
+#   states rather than looking up its records each time.
+##
+def packedState(packed, antIds, layout, boardless, phase, whoseTurn):
+    state = GameState.__new__(GameState)
+    state._packed = array('h')
+    state._packed.frombytes(packed)
+    state._antIds = antIds
+    state._layout = layout
+    state._constrObjs = None
+    state._antIndex = None
+    state._constrIndex = None
+    state._zobrist = None
+    state._sharesObjects = False
+    state._packedCells = None
+    state._board = None
+    state._boardless = boardless
+    state._inventories = None
+    state.phase = phase
+    state.whoseTurn = whoseTurn
+    return state
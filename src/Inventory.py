@@ -13,6 +13,7 @@ from Constants import *
 #   foodCount - The amount of food that the player has to use
 ##
 class Inventory(object):
+    __slots__ = ('player', 'ants', 'constrs', 'foodCount')
 
     ##
     #__init__
@@ -8,6 +8,7 @@
 #   coords - The coordinates of this location
 ##
 class Location(object):
+    __slots__ = ('ant', 'constr', 'coords')
 
     ##
     #__init__
@@ -10,6 +10,7 @@ from Constants import *
 #   buildType - This identifies the type of a unit(only relevant to Moves of type build)
 ##
 class Move(object):
+    __slots__ = ('moveType', 'coordList', 'buildType')
 
     ##
     #__init__
@@ -24,6 +25,14 @@ class Move(object):
         self.moveType = inputMoveType
         self.coordList = inputCoordList
         self.buildType = inputBuildType
+
+    ##
+    #__reduce__
+    #Description: Pickles a Move as the call that makes it, which is smaller
+    #   and quicker to load than the default for a class with __slots__
+    ##
+    def __reduce__(self):
+        return (Move, (self.moveType, self.coordList, self.buildType))
     
 
     ##
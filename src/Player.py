@@ -1,3 +1,9 @@
+import random
+
+# added to the name of a copy of an agent playing itself, so the two can be
+# told apart
+COPY_SUFFIX = "@@"
+
 ##
 #Player
 #Description: The responsbility of this class is to interact with the game by
@@ -6,6 +12,8 @@
 #
 #Variables:
 #   playerId - The id of the player.
+#   random - The player's own random number generator, reseeded by the game
+#       before each game (see seedRandom).
 ##
 class Player(object):
 
@@ -21,6 +29,7 @@ class Player(object):
     def __init__(self, inputPlayerId, inputAuthor):
         self.playerId = inputPlayerId
         self.author = inputAuthor
+        self.random = random.Random()
     
     ##
     #getPlacement
@@ -72,3 +81,24 @@ class Player(object):
     def registerWin(self, hasWon):
         #method templaste, not implemented
         pass
+
+    ##
+    #seedRandom
+    #Description: Called by the game before each game with the seed for the
+    #   player's random numbers in that game.  A player that draws them from
+    #   self.random plays the same way whenever the game is played again with
+    #   the same seed.
+    #
+    #Parameters:
+    #   seed - The seed for this game (int)
+    #
+    def seedRandom(self, seed):
+        self.random = random.Random(seed)
+
+    ##
+    #markAsCopy
+    #Description: Renames the player as the copy of an agent playing itself
+    #   (see Game.createAICopy).
+    #
+    def markAsCopy(self):
+        self.author += COPY_SUFFIX
@@ -4,6 +4,7 @@ from functools import partial
 from tkinter import ttk
 from tkinter import messagebox
 import time
+import threading
 
 ####
 # COLORS - dimmed to be lighter on the eyes
@@ -103,72 +104,161 @@ class ScrollableFrame ( tk.Frame ) :
         """ Set the scroll region on the canvas"""
         self.canvas.configure(scrollregion=new_bbox)
 
+# how often running stop watches are redrawn, in milliseconds
+TICK_MS = 50
+
+##
+# formatTime
+#
+# elapsed seconds as Hours:Minutes:Seconds.Hundredths
+#
+def formatTime(elap):
+    hours = int(elap/3600)
+    minutes = int(elap/60 - hours*60)
+    seconds = int(elap - hours*3600 - minutes*60.0)
+    hseconds = int((elap - hours*3600 - minutes*60.0 - seconds)*100)
+    return '%02d:%02d:%02d.%02d' % (hours, minutes, seconds, hseconds)
+
+##
+# Clock
+#
+# the time kept by a stop watch, without anything to show it, so that lots
+# of them can be kept (one per game log entry) and only the ones on screen
+# get a StopWatch widget
+#
+class Clock:
+    def __init__(self):
+        self._start = 0.0
+        self._elapsedtime = 0.0
+        self.running = False
+        self.game_over = False
+
+    def elapsed(self):
+        if self.running:
+            return time.time() - self._start
+        return self._elapsedtime
+
+    def Start(self):
+        """ Start the clock, ignore if running, or the game/event is over. """
+        if self.running or self.game_over:
+            return
+        self._start = time.time() - self._elapsedtime
+        self.running = True
+
+    def Stop(self):
+        """ Stop the clock, ignore if stopped. """
+        if not self.running:
+            return
+        self._elapsedtime = time.time() - self._start
+        self.running = False
+
+    def Reset(self):
+        """ Reset the clock. """
+        self._start = time.time()
+        self._elapsedtime = 0.0
+        self.game_over = False
+
+    def PermanentlyStop(self):
+        self.game_over = True
+
+##
+# Ticker
+#
+# the one timer behind every StopWatch of a window.  Watches are added while
+# they are on screen, and every TICK_MS the running ones are redrawn; the
+# timer only runs while at least one of them is running.
+#
+class Ticker:
+    def __init__(self, root):
+        self.root = root
+        self.watches = set()
+        self.pending = None
+        self.lock = threading.Lock()
+
+    ##
+    # of
+    #
+    # the ticker of the window a widget is in
+    #
+    @staticmethod
+    def of(widget):
+        root = widget._root()
+        if not hasattr(root, "ticker"):
+            root.ticker = Ticker(root)
+        return root.ticker
+
+    def add(self, watch):
+        with self.lock:
+            self.watches.add(watch)
+        self.wake()
+
+    def discard(self, watch):
+        with self.lock:
+            self.watches.discard(watch)
+
+    ##
+    # wake
+    #
+    # makes sure the timer is running, called whenever a watch may have
+    # been started
+    #
+    def wake(self):
+        with self.lock:
+            if self.pending is None:
+                self.pending = self.root.after(TICK_MS, self.tick)
+
+    def tick(self):
+        with self.lock:
+            self.pending = None
+            running = [watch for watch in self.watches if watch.clock.running]
+        for watch in running:
+            watch.refresh()
+        if running:
+            self.wake()
+
 # https://stackoverflow.com/questions/46287270/trying-to-grab-current-time-from-a-stopwatch-widget-when-i-hit-a-button-tkinte
 class StopWatch(tk.Frame):
-    """ Implements a stop watch frame widget. """
-    def __init__(self, parent=None, **kw):
+    """ Implements a stop watch frame widget showing a Clock. """
+    def __init__(self, parent=None, clock=None, **kw):
         tk.Frame.__init__(self, parent, kw)
-        self._start = 0.0
-        self._elapsedtime = 0
-        self._running = 0
+        self.clock = clock if clock is not None else Clock()
         self.timestr = tk.StringVar()
         self.label = None
+        self.ticker = Ticker.of(self)
         self.makeWidgets()
-        self._timer = None
-        self.game_over = False
+        self.ticker.add(self)
+        self.bind("<Destroy>", lambda event: self.ticker.discard(self))
 
     def makeWidgets(self):
         """ Make the time label. """
         self.label  = tk.Label(self, textvariable=self.timestr)
-        self._setTime(self._elapsedtime, self.timestr)
+        self.refresh()
         self.label.pack(fill=tk.X, expand=tk.NO, pady=2, padx=2)
 
-
-    def _update(self, string_obj, rate):
+    def refresh(self):
         """ Update the label with elapsed time. """
-        self._elapsedtime = time.time() - self._start
-        self._setTime(self._elapsedtime * rate, string_obj)
-        if self._running:
-           self._timer = self.after(50, self._update, string_obj, rate)
-
-    def _setTime(self, elap, string_obj):
-        """ Set the time string to Minutes:Seconds:Hundreths """
-        hours = int(elap/3600)                                           #without the hours below
-        minutes = int(elap/60 - hours*60)                                #int(elap/60)
-        seconds = int(elap - hours*3600 - minutes*60.0)                  #int(elap - minutes*60.0)
-        hseconds = int((elap - hours*3600 - minutes*60.0 - seconds)*100) #int((elap - minutes*60.0 - seconds)*100)
-        string_obj.set('%02d:%02d:%02d.%02d' % (hours, minutes, seconds, hseconds))
+        self.timestr.set(formatTime(self.clock.elapsed()))
+
+    def setClock(self, clock):
+        """ Show a different clock. """
+        self.clock = clock
+        self.refresh()
+        self.ticker.wake()
 
     def Start(self):
-        """ Start the stopwatch, ignore if running, or the game/event is over. """
-        if self._running or self.game_over:
-            return
-            #''' make self.start the time now - zero'''
-        self._start = time.time() - self._elapsedtime
-            
-        self._running = 1
-        self._update(self.timestr, 1.0)
+        self.clock.Start()
+        self.ticker.wake()
 
     def Stop(self):
-        #print("in stop")
-        """ Stop the stopwatch, ignore if stopped or the game/event is over. """
-        if not self._running:
-            return
-        self.after_cancel(self._timer)
-        self._timer = None
-        self._elapsedtime = time.time() - self._start
-        self._setTime(self._elapsedtime,self.timestr)
-        self._running = 0
+        self.clock.Stop()
+        self.refresh()
 
     def Reset(self):
-        """ Reset the stopwatch. """
-        self._start = time.time()
-        self._elapsedtime = 0.0
-        self._setTime(self._elapsedtime,self.timestr)
-        self.game_over = False
+        self.clock.Reset()
+        self.refresh()
 
     def PermanentlyStop(self) :
-        self.game_over = True
+        self.clock.PermanentlyStop()
 
 ###########################################################################
 # standard message dialogs... showinfo, showwarning, showerror
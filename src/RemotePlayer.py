@@ -0,0 +1,293 @@
+import os, sys, math, random, pickle, select, importlib, traceback, multiprocessing
+from Player import Player
+from Constants import *
+from GameState import GameState, ConstrLayout, packedState
+try:
+    import resource
+except ImportError:
+    # not on Windows, where only the wall-clock limit is enforced
+    resource = None
+
+
+##
+# AgentError
+# Description: Raised in the game when an agent running in its own process
+#   raises an exception.  The message is the agent's traceback.
+##
+class AgentError(Exception):
+    pass
+
+
+##
+# RemotePlayer
+# Description: Stands in for an AI that runs in its own, persistent process.
+#   The game calls getPlacement, getMove, getAttack and registerWin on it as
+#   on any Player; each call is sent to the agent's process over a pipe and
+#   the answer sent back.
+#
+#   Every call can be given a wall-clock and a CPU-time budget.  An agent
+#   that goes over either is killed and a fresh one started in its place,
+#   and the call returns None, which the game then rejects as an illegal
+#   placement, move or attack.  The CPU limit is enforced by the operating
+#   system (RLIMIT_CPU), in whole seconds, and is not available on Windows.
+#
+#   A call is one message each way, pickled by hand rather than through
+#   Connection.send, and waited on with a poll object kept for the life of
+#   the process.  The state passed to getPlacement, getMove and getAttack
+#   is sent as its packed buffer (see GameState.packedParts); its ant ids
+#   and construction records only when they differ from the last state
+#   sent, since the agent's process keeps those (and the ConstrLayout of
+#   the records).  New records come with their Terrain when it has been
+#   built here, so that the agent does not have to build its own.
+#
+#   What is left of the cost is the two process switches of every call,
+#   which a per-agent process cannot avoid: on one CPU about 100-150us a
+#   move against about 200us for FoodGatherer and Random playing in the
+#   game's own process (see the "remote" benchmark).  The agent's own time
+#   is the same either way.  That is only paid with the timeout on, where
+#   it buys the hard per-move limit; without it the agents run in the game's
+#   process as before.
+#
+# Variables:
+#   moduleName - the agent's module in the AI folder
+#   isCopy - whether this is a copy of an agent playing itself
+#   timeLimit - seconds of wall-clock time allowed per call, or None
+#   cpuLimit - seconds of CPU time allowed per call, or None
+#   sentAntIds, sentRecords - the ant ids and construction records of the
+#       last state sent to the agent's process
+##
+class RemotePlayer(Player):
+    ##
+    # __init__
+    # Description: Starts the agent's process and waits until it is ready.
+    #
+    # Parameters:
+    #   moduleName - the agent's module in the AI folder (str)
+    #   inputPlayerId - the id to give the agent (int)
+    #   timeLimit - wall-clock seconds allowed per call (float)
+    #   cpuLimit - CPU seconds allowed per call (float)
+    #   isCopy - whether this is a copy of an agent playing itself (bool)
+    #   aiDir - the folder the agents are loaded from (str)
+    ##
+    def __init__(self, moduleName, inputPlayerId, timeLimit=None, cpuLimit=None, isCopy=False, aiDir="AI"):
+        super(RemotePlayer, self).__init__(inputPlayerId, None)
+        self.moduleName = moduleName
+        self.isCopy = isCopy
+        self.timeLimit = timeLimit
+        self.cpuLimit = cpuLimit
+        self.aiDir = os.path.abspath(aiDir)
+        self.process = None
+        self.conn = None
+        self.poller = None
+        self.start()
+
+    ##
+    # start
+    # Description: Starts the agent's process.  It is spawned rather than
+    #   forked, since the game is running Tk and several threads.
+    ##
+    def start(self):
+        context = multiprocessing.get_context("spawn")
+        self.conn, childConn = context.Pipe()
+        self.process = context.Process(target=serve, daemon=True,
+                                       args=(childConn, self.aiDir, self.moduleName, self.playerId, self.isCopy))
+        self.process.start()
+        childConn.close()
+        ok, reply = self.conn.recv()
+        if not ok:
+            raise AgentError(reply)
+        self.author = reply
+        self.sentAntIds = None
+        self.sentRecords = None
+        if hasattr(select, "poll"):
+            self.poller = select.poll()
+            self.poller.register(self.conn.fileno(), select.POLLIN)
+
+    ##
+    # stop
+    # Description: Shuts the agent's process down.
+    ##
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.conn.send_bytes(pickle.dumps(None))
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+
+    ##
+    # restart
+    # Description: Kills the agent's process and starts a fresh one.
+    ##
+    def restart(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.start()
+
+    ##
+    # call
+    # Description: Calls a method of the agent in its process.
+    #
+    # Returns: what the method returned, or None if the agent went over its
+    #   time or was killed
+    ##
+    def call(self, method, *args):
+        if self.process is None:
+            self.start()
+        try:
+            self.conn.send_bytes(self.request(method, args))
+        except OSError:
+            # the process died between calls
+            self.restart()
+            self.conn.send_bytes(self.request(method, args))
+        if self.timeLimit is not None and not self.ready(self.timeLimit):
+            print("AI ERROR: %s: %s took longer than %s seconds" % (self.author, method, self.timeLimit))
+            self.restart()
+            return None
+        try:
+            ok, reply = pickle.loads(self.conn.recv_bytes())
+        except EOFError:
+            # the operating system killed it for going over its CPU time
+            print("AI ERROR: %s: %s used more than %s seconds of CPU time" % (self.author, method, self.cpuLimit))
+            self.restart()
+            return None
+        if not ok:
+            raise AgentError(reply)
+        return reply
+
+    ##
+    # request
+    # Description: The message that asks the agent's process to call a
+    #   method: (method, state parts or None, the other arguments, CPU limit)
+    ##
+    def request(self, method, args):
+        parts = None
+        if args and isinstance(args[0], GameState):
+            parts = self.stateParts(args[0])
+            args = args[1:]
+        return pickle.dumps((method, parts, args, self.cpuLimit), pickle.HIGHEST_PROTOCOL)
+
+    ##
+    # stateParts
+    # Description: A state as sent to the agent's process: its packedParts
+    #   and Terrain, with the ant ids and construction records replaced by
+    #   None when they are the same as last time (and then no Terrain).
+    ##
+    def stateParts(self, state):
+        packed, antIds, records, boardless, phase, whoseTurn = state.packedParts()
+        if antIds is self.sentAntIds or antIds == self.sentAntIds:
+            antIds = None
+        else:
+            self.sentAntIds = antIds
+        terrain = None
+        if records is self.sentRecords or records == self.sentRecords:
+            records = None
+        else:
+            self.sentRecords = records
+            terrain = state.getTerrain(False)
+        return (packed, antIds, records, boardless, phase, whoseTurn, terrain)
+
+    ##
+    # ready
+    # Description: Waits up to the given number of seconds for the agent to
+    #   answer (or die).
+    ##
+    def ready(self, timeout):
+        if self.poller is None:
+            return self.conn.poll(timeout)
+        return bool(self.poller.poll(timeout * 1000))
+
+    def getPlacement(self, currentState):
+        return self.call("getPlacement", currentState)
+
+    def getMove(self, currentState):
+        return self.call("getMove", currentState)
+
+    def getAttack(self, currentState, attackingAnt, enemyLocations):
+        return self.call("getAttack", currentState, attackingAnt, enemyLocations)
+
+    def registerWin(self, hasWon):
+        self.call("registerWin", hasWon)
+
+    def seedRandom(self, seed):
+        super(RemotePlayer, self).seedRandom(seed)
+        self.call("seedRandom", seed)
+
+
+##
+# serve
+# Description: The loop run in an agent's process: creates the agent, then
+#   answers calls until the pipe is closed or it is sent None.
+#
+# Parameters:
+#   conn - this end of the pipe (Connection)
+#   aiDir, moduleName, playerId, isCopy - as given to RemotePlayer
+##
+def serve(conn, aiDir, moduleName, playerId, isCopy):
+    sys.path.insert(0, aiDir)
+    try:
+        player = importlib.import_module(moduleName).AIPlayer(playerId)
+        if isCopy:
+            player.markAsCopy()
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+        return
+    conn.send((True, player.author))
+
+    # the ant ids and construction layout of the last state received
+    antIds = layout = None
+    cpuTime = CpuBudget() if resource is not None else None
+    while True:
+        try:
+            request = pickle.loads(conn.recv_bytes())
+        except EOFError:
+            return
+        if request is None:
+            return
+        method, parts, args, cpuLimit = request
+        if parts is not None:
+            packed, newAntIds, newRecords, boardless, phase, whoseTurn, terrain = parts
+            if newAntIds is not None:
+                antIds = newAntIds
+            if newRecords is not None:
+                layout = ConstrLayout.get(newRecords, terrain)
+            args = (packedState(packed, antIds, layout, boardless, phase, whoseTurn),) + args
+        if method == "seedRandom":
+            # for agents that use the random module directly
+            random.seed(args[0])
+        if cpuLimit is not None and cpuTime is not None:
+            cpuTime.limit(cpuLimit)
+        try:
+            reply = pickle.dumps((True, getattr(player, method)(*args)), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # raised by the agent, or what it returned could not be pickled
+            reply = pickle.dumps((False, traceback.format_exc()))
+        conn.send_bytes(reply)
+
+
+##
+# CpuBudget
+# Description: Has the operating system kill this process once it has used
+#   a given number of seconds of CPU time more than it has so far.  The limit
+#   is in whole seconds, so it is only changed when it has to move.
+##
+class CpuBudget(object):
+    def __init__(self):
+        self.hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        self.soft = None
+
+    def limit(self, seconds):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(math.ceil(usage.ru_utime + usage.ru_stime + seconds))
+        if self.hard != resource.RLIM_INFINITY:
+            soft = min(soft, self.hard)
+        if soft != self.soft:
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, self.hard))
+            self.soft = soft
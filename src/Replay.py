@@ -0,0 +1,227 @@
+import sys
+import argparse
+from Constants import *
+from GameState import *
+from Player import Player
+from Engine import Engine
+from GameRecord import *
+from AIPlayerUtils import asciiPrintState
+
+#
+# Replay.py
+#
+# Rebuilds the positions of a recorded game (see GameRecord.py) by carrying
+# out its logged placements, moves and attacks again.  No agent is called
+# and nothing is checked, since every action in a record was legal when it
+# was played, so any position of a long game is back in milliseconds.
+#
+# From the command line:
+#
+#   python Replay.py games.rec              lists the games in the log
+#   python Replay.py games.rec 12           prints the end of game 12
+#   python Replay.py games.rec 12 -t 40     prints game 12 at the start of turn 40
+#   python Replay.py games.rec 12 -e 300    prints game 12 after 300 events
+#
+
+# how often (in events) a copy of the state is kept to start from
+CHECKPOINT_EVERY = 64
+
+
+##
+# Replay
+# Description: The positions of one recorded game.  Position n is the state
+#   after the first n events of the record, so position 0 is the empty board
+#   and position len(replay) is the end of the game.
+#
+# Variables:
+#   record - the GameRecord being replayed
+#   position - how many events have been applied to state
+#   checkpoints - copies of the state (and the setup and undo bookkeeping
+#       that goes with it) by position, made along the way
+##
+class Replay(Engine):
+    ##
+    # __init__
+    # Description: Sets up a replay of a record.
+    #
+    # Parameters:
+    #   record - the game to replay (GameRecord)
+    ##
+    def __init__(self, record):
+        super(Replay, self).__init__(Player(PLAYER_ONE, record.players[0]),
+                                     Player(PLAYER_TWO, record.players[1]), record.seed)
+        self.record = record
+        self.trackUndo = any(event[0] == UNDO_EVENT for event in record.events)
+        self.rewind()
+
+    def __len__(self):
+        return len(self.record.events)
+
+    ##
+    # rewind
+    # Description: Goes back to the empty board.
+    ##
+    def rewind(self):
+        self.state = GameState.getBlankState()
+        self.state.phase = SETUP_PHASE_1
+        self.position = 0
+        self.constrsToPlace = self.constrsFor(SETUP_PHASE_1, PLAYER_ONE)
+        self.undoStates = []
+        self.lastMoved = None
+        self.checkpoints = {0: self.checkpoint()}
+
+    ##
+    # checkpoint
+    # Description: A copy of everything needed to carry on from here.  The
+    #   constructions left to place end up on the board, so only how many
+    #   there are is kept.
+    ##
+    def checkpoint(self):
+        return (self.state.clone(), len(self.constrsToPlace), [state.clone() for state in self.undoStates], self.lastMoved)
+
+    ##
+    # restore
+    # Description: Goes back to a checkpoint.
+    ##
+    def restore(self, position):
+        state, toPlace, undoStates, self.lastMoved = self.checkpoints[position]
+        self.state = state.clone()
+        self.constrsToPlace = self.constrsFor(state.phase, state.whoseTurn)[-toPlace:] if toPlace else []
+        self.undoStates = [state.clone() for state in undoStates]
+        self.position = position
+
+    ##
+    # step
+    # Description: Applies the next event of the record.
+    ##
+    def step(self):
+        kind, playerId, data, seconds = self.record.events[self.position]
+        if kind == PLACE:
+            # placeConstrs takes coordinates as the player sees the board
+            self.placeConstrs(self.constrsToPlace, [self.state.coordLookup(coord, playerId) for coord in data])
+            if not self.constrsToPlace:
+                self.constrsToPlace = self.advanceSetup()
+        elif kind == MOVE_ANT_EVENT:
+            if self.trackUndo:
+                self.undoStates.append(self.state.clone())
+            self.applyMoveAnt(data)
+            self.lastMoved = data.coordList[-1]
+        elif kind == BUILD_EVENT:
+            if self.trackUndo:
+                self.undoStates.append(self.state.clone())
+            self.applyBuild(data)
+        elif kind == END_TURN:
+            self.endTurn()
+            self.undoStates = []
+        elif kind == ATTACK:
+            attackingAnt = self.state.board[self.lastMoved[0]][self.lastMoved[1]].ant
+            self.applyAttack(attackingAnt, data)
+        elif kind == UNDO_EVENT:
+            self.state = self.undoStates.pop()
+
+        self.position += 1
+        if self.position % CHECKPOINT_EVERY == 0 and self.position not in self.checkpoints:
+            self.checkpoints[self.position] = self.checkpoint()
+
+    ##
+    # prepareTerrain
+    # Description: Nothing searches the board during a replay, so the terrain
+    #   is left to be built if and when a state's getTerrain is called.
+    ##
+    def prepareTerrain(self):
+        pass
+
+    ##
+    # stateAt
+    # Description: The state at a position, carrying on from the nearest
+    #   earlier checkpoint (or from where the replay is, if that is closer).
+    #
+    # Parameters:
+    #   position - the number of events applied, 0 to len(self), or negative
+    #       counting back from the end: -1 is the end of the game (the same
+    #       as len(self)), -2 the position before the last event (int)
+    #
+    # Returns: a copy of the state (GameState)
+    ##
+    def stateAt(self, position):
+        asked = position
+        if position < 0:
+            position += len(self) + 1
+        if not 0 <= position <= len(self):
+            raise IndexError("position %d of a game with %d events" % (asked, len(self)))
+
+        start = position - position % CHECKPOINT_EVERY
+        while start not in self.checkpoints:
+            start -= CHECKPOINT_EVERY
+        if not start <= self.position <= position:
+            self.restore(start)
+
+        while self.position < position:
+            self.step()
+        return self.state.clone()
+
+    ##
+    # positionOfTurn
+    # Description: The position at the start of a turn of the play phase
+    #   (turn 0 being the first), or the end of the game if it never came.
+    ##
+    def positionOfTurn(self, turn):
+        ended = 0
+        for position, event in enumerate(self.record.events):
+            if ended == turn and event[0] in (MOVE_ANT_EVENT, BUILD_EVENT, END_TURN):
+                return position
+            if event[0] == END_TURN:
+                ended += 1
+        return len(self)
+
+    ##
+    # states
+    # Description: Steps through the game from the empty board to the end.
+    #   The same GameState is updated in place each time; clone it to keep it.
+    #
+    # Returns: a generator of (position, GameState)
+    ##
+    def states(self):
+        self.rewind()
+        yield 0, self.state
+        while self.position < len(self):
+            self.step()
+            yield self.position, self.state
+
+
+##
+# main
+# Description: The command line described at the top of this file.
+##
+def main(argv):
+    parser = argparse.ArgumentParser(description="Show the positions of recorded games.")
+    parser.add_argument("log", help="a game log written with --record")
+    parser.add_argument("game", type=int, nargs="?", help="the game to show (from 0)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-t", "--turn", type=int, help="show the start of this turn (from 0)")
+    group.add_argument("-e", "--event", type=int, help="show the position after this many events (-1 for the end)")
+    args = parser.parse_args(argv)
+
+    with GameLog(args.log) as log:
+        if args.game is None:
+            for i, record in enumerate(log):
+                print("%4d  seed %-10s  %s" % (i, record.seed, record))
+            return
+        replay = Replay(log[args.game])
+    print(replay.record)
+    if args.turn is not None:
+        position = replay.positionOfTurn(args.turn)
+    elif args.event is not None:
+        position = args.event
+    else:
+        position = len(replay)
+    if position < 0:
+        position += len(replay) + 1
+    state = replay.stateAt(position)
+    turn = sum(1 for event in replay.record.events[:position] if event[0] == END_TURN)
+    print("after %d of %d events, turn %d:" % (position, len(replay), turn))
+    asciiPrintState(state)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
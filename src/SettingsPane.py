@@ -42,6 +42,7 @@ BUTTON1_FONT = ( "Copperplate", 20, "bold")
 BUTTON2_FONT = ( "Copperplate", 15, "bold")
 
 ERROR_CODE = -1
+DEFAULT_FPS = "30"
 
 SETTINGS_FILE = "my-settings.json"
 
@@ -244,6 +245,9 @@ class GameSettingsFrame ( ) :
             message = "Games could not be started.\nError: Invalid timeout"
             wgt.ShowError( title, message, self.handler.root )
             return
+        more_settings [ "fps" ] = self.readFps()
+        if more_settings [ "fps" ] is None :
+            return
         if len(games) <= 0 :
             title = "Error: Games"
             message = "Games could not be started.\nError: No Games in queue"
@@ -288,6 +292,9 @@ class GameSettingsFrame ( ) :
                 message = "Games could not be started.\nError: Invalid timeout"
                 wgt.ShowError( title, message, self.handler.root )
                 return
+            more_settings [ "fps" ] = self.readFps()
+            if more_settings [ "fps" ] is None :
+                return
 
             pcs = [ pc.copyDict() for pc in self.my_pause_conditions ]
             self.saveSettings()
@@ -295,6 +302,20 @@ class GameSettingsFrame ( ) :
             self.the_game.gameStartRequested ()
             self.handler.showFrame(2)
 
+    ###
+    # readFps
+    # the frame rate the board is drawn at during AI games,
+    # or None (after showing an error) if what was entered is not a positive number
+    def readFps ( self ) :
+        rgx_float = re.compile ( "^[0-9]+(\.[0-9]+)?$" )
+        fps = self.additionalOptionsFrame.public_fps
+        if not rgx_float.match(fps) or float(fps) <= 0 :
+            title = "Error: Additional Settings"
+            message = "Games could not be started.\nError: Invalid frame rate"
+            wgt.ShowError( title, message, self.handler.root )
+            return None
+        return float(fps)
+
     ###
     # gameAdded
     # verify that a game is valid
@@ -487,6 +508,7 @@ class GameSettingsFrame ( ) :
         more_settings = copy.deepcopy ( self.additionalOptionsFrame.public_selected )
         more_settings [ "timeout_limit" ] = self.additionalOptionsFrame.public_timeout 
         more_settings [ "layout_chosen" ] = self.additionalOptionsFrame.public_layout
+        more_settings [ "fps" ] = self.additionalOptionsFrame.public_fps
         data['additional_settings'] = more_settings
 
         # pause conditions
@@ -545,8 +567,9 @@ class GameSettingsFrame ( ) :
         
         try:
             # checkboxes | fancy option inputs
-            optsPlus = opts | {'layout_chosen', 'timeout_limit'}
-            if more.keys() != optsPlus :
+            # (files saved before an option was added may not have it)
+            optsPlus = opts | {'layout_chosen', 'timeout_limit', 'fps'}
+            if not more.keys() <= optsPlus :
                 print ( msg )
                 self.resetSettings()
         except:
@@ -565,6 +588,8 @@ class GameSettingsFrame ( ) :
                 self.additionalOptionsFrame.layoutType.set(more[k])
                 self.additionalOptionsFrame.layoutChanged(more[k])
                 pass
+            elif k == 'fps' :
+                self.additionalOptionsFrame.fpsVar.set(more[k])
         
         # check that the pause conditions are in the correct format???
         for pc in data['pause_conditions']:
@@ -587,6 +612,7 @@ class GameSettingsFrame ( ) :
             more_settings[m] = False
         more_settings [ "timeout_limit" ] = "0" 
         more_settings [ "layout_chosen" ] = "Player Invoked"
+        more_settings [ "fps" ] = DEFAULT_FPS
         data['additional_settings'] = more_settings
 
         # pause conditions
@@ -720,6 +746,7 @@ class AdditionalSettingsOptionsFrame ( wgt.ScrollableFrame ) :
         self.public_selected = {}
         self.public_layout = LAYOUT_OPTIONS[0]
         self.public_timeout = str(ERROR_CODE)
+        self.public_fps = DEFAULT_FPS
 
         # additional option keys and their descriptions to be printed on the menu
         # { 'opt' : "", 'descrip' : "" }
@@ -729,7 +756,8 @@ class AdditionalSettingsOptionsFrame ( wgt.ScrollableFrame ) :
                          { 'opt' : "timeout"         , 'descrip' : "move timeout" },
                          { 'opt' : "autorestart"     , 'descrip' : "auto-restart" },
                          { 'opt' : "pause"           , 'descrip' : "pause on start" },
-                         { 'opt' : "pauseIllegal"    , 'descrip' : "pause on illegal move" }
+                         { 'opt' : "pauseIllegal"    , 'descrip' : "pause on illegal move" },
+                         { 'opt' : "endsOnly"        , 'descrip' : "show game ends only" }
                        ]
 
         for i in range(len(self.options)) :
@@ -750,6 +778,15 @@ class AdditionalSettingsOptionsFrame ( wgt.ScrollableFrame ) :
         self.layoutType.set(LAYOUT_OPTIONS[0])
         self.o_layout = tk.OptionMenu(self.interior, self.layoutType, *LAYOUT_OPTIONS, command = self.layoutChanged )
         self.o_layout.grid ( row = r, column = 1, sticky=tk.W )
+
+        r += 1
+        self.fpsText = tk.Label ( self.interior, text = "Frame Rate (fps): " , bg="white")
+        self.fpsText.grid ( row = r, sticky=tk.W )
+        self.fpsVar = tk.StringVar()
+        self.fpsVar.set(DEFAULT_FPS)
+        self.fpsVar.trace("w", lambda name, index, mode: self.fpsChanged(self.fpsVar))
+        self.o_fpsText = tk.Entry ( self.interior, textvar = self.fpsVar )
+        self.o_fpsText.grid ( row = r, column = 1, sticky=tk.W )
             
     def clicked ( self, opt ) :
         self.public_selected[opt] = not self.public_selected[opt]
@@ -760,6 +797,9 @@ class AdditionalSettingsOptionsFrame ( wgt.ScrollableFrame ) :
     def layoutChanged ( self, option ) :
         self.public_layout = option
 
+    def fpsChanged ( self, sv ) :
+        self.public_fps = sv.get()
+
     def addCheckOption ( self, name, text, row ) :
         cb = tk.Checkbutton ( self.interior, text = text, command = partial(self.clicked, opt = name), bg = "white" )
         cb.grid ( row = row, sticky=tk.W )
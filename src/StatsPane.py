@@ -22,6 +22,10 @@ FL_BD = 5
 FL_STYLE = "ridge"
 FL_FONT = ( "Harrington", 16, "bold")
 
+# pixels between game log entries, and white space below the last one
+ROW_GAP = 4
+LOG_BUFFER = 300
+
 # height and width for the totals score card
 HEIGHT = 27#20
 WIDTH = 35
@@ -46,11 +50,11 @@ class StatsPane:
         self.gameLogLabel.pack(side = tkinter.TOP, fill=tkinter.X)
         self.gLFrame.columnconfigure(0, weight=1)
 
-        self.logTextFrame = wgt.ScrollableFrame ( self.gLFrame )
-        self.logTextFrame.canvas.config(height=450)
+        self.logView = GameLogView ( self.gLFrame )
+        self.logView.canvas.config(height=450)
 
         self.gLFrame.columnconfigure(0, weight=1)
-        self.logTextFrame.pack ( fill="both" )
+        self.logView.pack ( fill="both" )
 
         ## make totals display frame
         t_width = 475 if platform != "win32" else 600
@@ -148,8 +152,6 @@ class StatsPane:
         for i in range(7):
             self.buttonFrame.rowconfigure(i, weight=1)
 
-        self.dummyStatLabel = None
-
 
     def UIbuttonPressed(self):
         self.handler.showFrame(2)
@@ -161,53 +163,196 @@ class StatsPane:
     def addGameToLog ( self ) :
         return
 
+    ##
+    # addLogItem
+    #
+    # starts a new entry at the bottom of the game log, with its clock
+    # running, and returns it
+    #
     def addLogItem ( self ) :
-        b = PurpleBox(self.logTextFrame.interior)
-        b.grid()
-        if self.dummyStatLabel is not None:
-            self.dummyStatLabel.destroy()
-        self.dummyStatLabel = tkinter.Label(self.logTextFrame.interior, bg = "white", text = "\n\n")
-        self.dummyStatLabel.grid(sticky=tkinter.W)
-        
-        self.logTextFrame.set_scrollregion(vertical_buff=300) #can change amount of white space beneath game log records
-        self.parent.update_idletasks()
-
-        self.log.append(b)
-        self.cur_log = b
-
-        b.myClock.Reset()
-        b.myClock.Start()
+        entry = LogEntry()
+        entry.clock.Reset()
+        entry.clock.Start()
+        self.log.append(entry)
+        self.cur_log = entry
+        self.logView.append(entry)
+        return entry
 
     def stopCurLogItem(self, game_over = False):
         if self.cur_log is None:
             return
-        self.cur_log.myClock.Stop()
-        if game_over:
-            self.setCurLogItemOver()
+        self.stopLogItem(self.cur_log, game_over)
             
     def startCurLogItem(self):
         if self.cur_log is None:
             return
-        self.cur_log.myClock.Start()
+        self.cur_log.clock.Start()
+        self.logView.changed(self.cur_log)
 
     def setCurLogItemOver(self):
         if self.cur_log is None:
             return
-        self.cur_log.myClock.PermanentlyStop()
+        self.cur_log.clock.PermanentlyStop()
 
     def updateCurLogItem(self, s):
         if self.cur_log is None:
             return
-        self.cur_log.setTextLines(s)
+        self.updateLogItem(self.cur_log, s)
 
-    def clearLog(self):
-        for b in self.log:
-            b.destroy()
+    # log items returned by addLogItem can also be updated directly, for
+    # game sets that are played at the same time (Game.startParallel)
+    def updateLogItem(self, item, s):
+        item.text = s
+        self.logView.changed(item)
 
+    def stopLogItem(self, item, game_over = False):
+        item.clock.Stop()
+        if game_over:
+            item.clock.PermanentlyStop()
+        self.logView.changed(item)
+
+    def clearLog(self):
         self.log = []
         self.cur_log = None
+        self.logView.clear()
+
+
+#####
+# LogEntry
+#
+# one game log entry: its text and its clock.  Only the entries scrolled
+# into view are shown, each by a PurpleBox.
+#####
+class LogEntry :
+    def __init__ ( self ) :
+        self.text = ""
+        self.clock = wgt.Clock()
 
 
+#####
+# GameLogView
+#
+# the scrolling game log.  Every entry gets the same height on the canvas,
+# but only the rows in view have a PurpleBox, taken from a pool of them as
+# rows scroll in and put back as they scroll out, so a long tournament
+# costs no more widgets (or timers) than a short one.
+#####
+class GameLogView ( tkinter.Frame ) :
+    def __init__ ( self, master ) :
+        tkinter.Frame.__init__ ( self, master )
+
+        self.vscrollbar = tkinter.Scrollbar ( self, orient=tkinter.VERTICAL )
+        self.vscrollbar.pack ( side='right', fill="y",  expand="false" )
+        self.canvas = tkinter.Canvas ( self, bg='white', bd=0, highlightthickness=0, yscrollcommand=self.scrolled )
+        self.canvas.pack ( side="left", fill="both", expand="true" )
+        self.vscrollbar.config ( command=self.canvas.yview )
+
+        self.entries = []
+        # shown rows, by entry index, as (PurpleBox, canvas item)
+        self.rows = {}
+        self.pool = []
+        # the most text lines any entry has, and the height that gives a row
+        self.lines = 0
+        self.rowHeight = 1
+        self.region = None
+
+        self.canvas.bind('<Configure>', lambda event: self.layout())
+
+    def append ( self, entry ) :
+        self.entries.append ( entry )
+        self.fit ( entry )
+        self.layout()
+
+    def clear ( self ) :
+        for index in list ( self.rows ) :
+            self.hideRow ( index )
+        self.entries = []
+        self.canvas.yview_moveto ( 0 )
+        self.layout()
+
+    ##
+    # changed
+    #
+    # redraws an entry if it is in view
+    #
+    def changed ( self, entry ) :
+        if self.fit ( entry ) :
+            return
+        for box, item in self.rows.values() :
+            if box.entry is entry :
+                box.show ( entry )
+
+    ##
+    # fit
+    #
+    # makes the rows tall enough for an entry's text, laying every row out
+    # again if they had to grow
+    #
+    # Return: whether the rows grew
+    #
+    def fit ( self, entry ) :
+        lines = entry.text.count ( "\n" ) + 1
+        if lines <= self.lines :
+            return False
+        self.lines = lines
+        box = self.takeBox()
+        box.show ( entry )
+        box.update_idletasks()
+        self.rowHeight = box.winfo_reqheight() + ROW_GAP
+        box.hide()
+        self.pool.append ( box )
+        for index in list ( self.rows ) :
+            self.hideRow ( index )
+        self.layout()
+        return True
+
+    def takeBox ( self ) :
+        if self.pool :
+            return self.pool.pop()
+        return PurpleBox ( self.canvas )
+
+    def hideRow ( self, index ) :
+        box, item = self.rows.pop ( index )
+        self.canvas.delete ( item )
+        box.hide()
+        self.pool.append ( box )
+
+    ##
+    # scrolled
+    #
+    # the canvas' yscrollcommand: moves the scrollbar and brings the rows
+    # now in view on screen
+    #
+    def scrolled ( self, first, last ) :
+        self.vscrollbar.set ( first, last )
+        self.layout()
+
+    ##
+    # layout
+    #
+    # gives the rows in view a PurpleBox and frees the rest
+    #
+    def layout ( self ) :
+        # white space below the last entry; only set when it changes, as
+        # setting it calls scrolled again
+        region = ( 0, 0, max ( self.canvas.winfo_width(), 1 ), len(self.entries) * self.rowHeight + LOG_BUFFER )
+        if region != self.region :
+            self.region = region
+            self.canvas.configure ( scrollregion = region )
+
+        top = self.canvas.canvasy ( 0 )
+        first = max ( 0, int ( top // self.rowHeight ) )
+        last = min ( len(self.entries), int ( ( top + self.canvas.winfo_height() ) // self.rowHeight ) + 1 )
+        for index in list ( self.rows ) :
+            if not first <= index < last :
+                self.hideRow ( index )
+        for index in range ( first, last ) :
+            if index not in self.rows :
+                box = self.takeBox()
+                box.show ( self.entries[index] )
+                item = self.canvas.create_window ( 2, index * self.rowHeight, window=box, anchor="nw" )
+                self.rows[index] = ( box, item )
+
 
 #####
 # PurpleBox
@@ -238,6 +383,27 @@ class PurpleBox ( tkinter.Frame ) :
 
         self.myClock = self.timeLabel = wgt.StopWatch (self)
         self.myClock.grid ( row = 1, column = 0, columnspan = 8 )
+        self.entry = None
+
+    #####
+    # show
+    #
+    # shows a game log entry (see GameLogView)
+    #####
+    def show ( self, entry ) :
+        self.entry = entry
+        self.setTextLines ( entry.text )
+        self.myClock.setClock ( entry.clock )
+        self.myClock.ticker.add ( self.myClock )
+
+    #####
+    # hide
+    #
+    # the box has scrolled out of view, so its clock needn't tick
+    #####
+    def hide ( self ) :
+        self.entry = None
+        self.myClock.ticker.discard ( self.myClock )
 
     #####
     # setTextLines
@@ -0,0 +1,133 @@
+from array import array
+from Constants import *
+from Construction import CONSTR_STATS
+
+#the flat indexes (x*10+y) of the cells next to each cell
+NEIGHBOURS = [[(x + dx) * BOARD_LENGTH + y + dy
+               for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+               if 0 <= x + dx < BOARD_LENGTH and 0 <= y + dy < BOARD_LENGTH]
+              for x in range(BOARD_LENGTH) for y in range(BOARD_LENGTH)]
+
+#the distances for ants that ignore grass, which are the same on every board
+PLAIN_DISTANCES = [abs(src // BOARD_LENGTH - dst // BOARD_LENGTH) + abs(src % BOARD_LENGTH - dst % BOARD_LENGTH)
+                   for src in range(BOARD_LENGTH * BOARD_LENGTH) for dst in range(BOARD_LENGTH * BOARD_LENGTH)]
+
+##
+#Terrain
+#Description: Movement costs and shortest distances over the constructions of
+#   a game.  Constructions never move once play begins, so one Terrain is
+#   built per construction layout (see GameState.getTerrain) and shared by
+#   every state with that layout.  Ants are not taken into account; callers
+#   add occupancy on top where they need it.
+#
+#Variables:
+#   costs - The cost of entering each cell (indexed x*10+y) for an ant that
+#       respects grass.
+#   distances - For ants that respect grass (index 0) and ants that ignore it
+#       (index 1), a flat 100x100 table of the cheapest cost of getting from
+#       one cell to another, indexed by src*100 + dst (cells as x*10+y).
+##
+class Terrain(object):
+
+    ##
+    #__init__
+    #Description: Builds the cost grid and both distance tables
+    #
+    #Parameters:
+    #   records - (inventory, isBuilding, type, x, y) for every construction,
+    #       as in ConstrLayout.records.  If two share a cell the first wins.
+    ##
+    def __init__(self, records):
+        cells = BOARD_LENGTH * BOARD_LENGTH
+        self.costs = [1] * cells
+        for invIndex, isBuilding, constrType, x, y in reversed(records):
+            if x >= 0:
+                self.costs[x * BOARD_LENGTH + y] = CONSTR_STATS[constrType][MOVE_COST]
+
+        grassDistances = []
+        for src in range(cells):
+            grassDistances.extend(self._distancesFrom(src))
+        self.distances = (grassDistances, PLAIN_DISTANCES)
+
+    ##
+    #flipped
+    #Description: Returns the same terrain as seen by the other player.
+    #   Flipping the board maps cell i to cell 99-i, so every table is simply
+    #   reversed and nothing needs to be searched again.
+    ##
+    def flipped(self):
+        terrain = Terrain.__new__(Terrain)
+        terrain.costs = self.costs[::-1]
+        terrain.distances = (self.distances[0][::-1], PLAIN_DISTANCES)
+        return terrain
+
+    ##
+    #__reduce__
+    #Description: Pickles the cost grid and the grass distance table as
+    #   arrays of shorts, 20KB in all, instead of 10,000 pickled ints
+    ##
+    def __reduce__(self):
+        return (unpickleTerrain, (array('h', self.costs).tobytes(), array('h', self.distances[0]).tobytes()))
+
+    ##
+    #distance
+    #Description: Returns the cheapest movement cost from one cell to another,
+    #   ignoring ants
+    #
+    #Parameters:
+    #   src - starting position ((int, int))
+    #   dst - destination position ((int, int))
+    #   ignoresGrass - if grass costs the same as open ground (bool)
+    #
+    #Return: the cost (int)
+    ##
+    def distance(self, src, dst, ignoresGrass = False):
+        return self.distances[1 if ignoresGrass else 0][
+            (src[0] * BOARD_LENGTH + src[1]) * BOARD_LENGTH * BOARD_LENGTH + dst[0] * BOARD_LENGTH + dst[1]]
+
+    ##
+    #cost
+    #Description: Returns the cost of entering a cell for an ant that respects
+    #   grass
+    ##
+    def cost(self, coords):
+        return self.costs[coords[0] * BOARD_LENGTH + coords[1]]
+
+    ##
+    #_distancesFrom
+    #Description: Dijkstra's algorithm from one cell over the cost grid.
+    #   Costs are small whole numbers, so a list of buckets indexed by
+    #   distance stands in for the priority queue.
+    #
+    #Return: the cost of reaching every cell (list of int)
+    ##
+    def _distancesFrom(self, src):
+        costs = self.costs
+        dist = [-1] * len(costs)
+        dist[src] = 0
+        buckets = [[src]]
+        d = 0
+        while d < len(buckets):
+            for cell in buckets[d]:
+                if dist[cell] != d:
+                    continue
+                for nextCell in NEIGHBOURS[cell]:
+                    nextDist = d + costs[nextCell]
+                    if dist[nextCell] < 0 or nextDist < dist[nextCell]:
+                        dist[nextCell] = nextDist
+                        while len(buckets) <= nextDist:
+                            buckets.append([])
+                        buckets[nextDist].append(nextCell)
+            d += 1
+        return dist
+
+
+##
+#unpickleTerrain
+#Description: Rebuilds a Terrain pickled by Terrain.__reduce__
+##
+def unpickleTerrain(costs, grassDistances):
+    terrain = Terrain.__new__(Terrain)
+    terrain.costs = array('h', costs).tolist()
+    terrain.distances = (array('h', grassDistances).tolist(), PLAIN_DISTANCES)
+    return terrain
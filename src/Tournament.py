@@ -0,0 +1,98 @@
+import os, sys, importlib, traceback, multiprocessing
+from Constants import *
+from Engine import Engine
+
+#
+# Tournament.py
+#
+# Plays AI vs AI games in a pool of worker processes (see Game.startParallel).
+# Each game is described by a picklable task and played headless by Engine;
+# only the outcome travels back to the parent.
+#
+# A task is (pairIndex, gameIndex, agent1, agent2, seed), where each agent is
+# (moduleName, playerId, isCopy), agent1 moves first and seed is the game's
+# seed or None (see Engine.seedGame).  The result is
+# (pairIndex, gameIndex, winner, message): winner is 0 if agent1 won, 1 if
+# agent2 did, or None if nobody did, and message explains an illegal action
+# or crash (or is None).
+#
+
+# per worker process: agent modules by name, imported once
+modules = {}
+
+# per worker process: players by (moduleName, playerId, isCopy), so each
+# agent keeps whatever it learns from game to game, as it does in the GUI
+players = {}
+
+# per worker process: seed the random module with each game's seed too
+# (see Engine.seedGame)
+seedModule = False
+
+
+##
+# makePool
+#
+# Description: Starts the worker processes.  They are spawned rather than
+#   forked, since the parent is running Tk and several threads.
+#
+# Parameters:
+#   workers - the number of processes (int)
+#   aiDir - the directory the agent modules are loaded from (str)
+#   seedModule - seed the random module with each game's seed (bool)
+#
+# Returns: the multiprocessing Pool
+##
+def makePool(workers, aiDir, seedModule=False):
+    context = multiprocessing.get_context("spawn")
+    return context.Pool(workers, initializer=initWorker, initargs=(os.path.abspath(aiDir), seedModule))
+
+
+##
+# initWorker
+#
+# Description: Lets a worker process import the agent modules
+##
+def initWorker(aiDir, seedRandomModule=False):
+    global seedModule
+    sys.path.insert(0, aiDir)
+    seedModule = seedRandomModule
+
+
+##
+# getPlayer
+#
+# Description: Returns this worker's instance of an agent, creating it (and
+#   importing its module) the first time it is needed.  Copies are renamed
+#   with Player.markAsCopy, as Game.createAICopy does.
+##
+def getPlayer(agent):
+    player = players.get(agent)
+    if player is None:
+        moduleName, playerId, isCopy = agent
+        if moduleName not in modules:
+            modules[moduleName] = importlib.import_module(moduleName)
+        player = modules[moduleName].AIPlayer(playerId)
+        if isCopy:
+            player.markAsCopy()
+        players[agent] = player
+    return player
+
+
+##
+# playGame
+#
+# Description: Plays the game a task describes.  An agent that raises an
+#   exception loses the game rather than taking the worker down with it.
+#
+# Returns: the result tuple described at the top of this file
+##
+def playGame(task):
+    pairIndex, gameIndex, agent1, agent2, seed = task
+    engine = Engine(getPlayer(agent1), getPlayer(agent2), seed, seedModule=seedModule)
+    try:
+        result = engine.play()
+    except Exception:
+        if engine.state is None:
+            raise
+        return (pairIndex, gameIndex, 1 - engine.state.whoseTurn, "crashed:\n" + traceback.format_exc())
+    return (pairIndex, gameIndex, result.winner, result.message)
@@ -0,0 +1,353 @@
+import os, sys, time, importlib, traceback, multiprocessing
+import argparse
+from Constants import *
+from Engine import Engine, newSeed
+from Experience import ExperienceWriter
+
+#
+# Train.py
+#
+# Trains an agent that learns a utility table (the HW6 agent,
+# AI/martinsi26_leda27_HW6.py) by self-play, headless and in parallel.
+#
+# Worker processes each play games of the agent against itself and send
+# back what the two players learned: the change in utility and the visits
+# of every category they updated.  This process is the learner.  It adds
+# those changes into the table file, and every so often flushes the file and
+# tells the workers, which then re-open it and play from the new snapshot.
+# Each worker explores at its own rate, from EPSILON_HIGH down to
+# EPSILON_LOW.  When training is done the workers play evaluation games
+# (without exploring) against the given opponents.  With --record, the
+# training games are also logged, for Experience.py to learn from offline.
+#
+# Run from the src directory:
+#
+#   python Train.py -g 200                 200 games on every CPU
+#   python Train.py -g 1000 -w 4 -e 50     then 50 games each vs the opponents
+#   python Train.py -g 500 --record experience.log
+#
+
+# the agent trained, and who it is evaluated against
+DEFAULT_AGENT = "martinsi26_leda27_HW6"
+DEFAULT_OPPONENTS = ["Booger", "FoodGatherer"]
+
+# games still going after this many turns end with no winner, since a
+# greedy agent and its opponent can shuffle back and forth forever
+MAX_TURNS = 1000
+
+# exploration rate at the start of each game, spread over the workers
+EPSILON_HIGH = 0.5
+EPSILON_LOW = 0.1
+
+
+##
+# workerEpsilon
+# Description: The exploration rate worker i of n starts its games with:
+#   evenly spaced on a log scale from EPSILON_HIGH to EPSILON_LOW.
+##
+def workerEpsilon(i, n):
+    if n == 1:
+        return EPSILON_HIGH
+    return EPSILON_HIGH * (EPSILON_LOW / EPSILON_HIGH) ** (i / (n - 1))
+
+
+##
+# Worker
+# Description: What a worker process keeps from game to game: its agents,
+#   and which snapshot of the table they are playing from.
+##
+class Worker(object):
+    def __init__(self, aiDir, moduleName, path, epsilon, snapshot, record=False):
+        sys.path.insert(0, aiDir)
+        self.aiDir = aiDir
+        self.module = importlib.import_module(moduleName)
+        self.path = path
+        self.epsilon = epsilon
+        self.snapshot = snapshot
+        self.record = record
+        self.version = None
+        self.learners = [self.module.AIPlayer(PLAYER_ONE, path), self.module.AIPlayer(PLAYER_TWO, path)]
+        self.learners[1].markAsCopy()
+        # players for evaluation games, by (module name, player id)
+        self.players = {}
+
+    ##
+    # getPlayer
+    # Description: This worker's instance of an agent for evaluation games.
+    #   The agent being trained plays from the table being trained.
+    ##
+    def getPlayer(self, moduleName, playerId):
+        player = self.players.get((moduleName, playerId))
+        if player is None:
+            if moduleName == self.module.__name__:
+                player = self.module.AIPlayer(playerId, self.path)
+            else:
+                player = importlib.import_module(moduleName).AIPlayer(playerId)
+            self.players[(moduleName, playerId)] = player
+        return player
+
+    ##
+    # refresh
+    # Description: Re-opens the table for the agents being trained or
+    #   evaluated when the learner has published a new snapshot, closing the
+    #   one they had.
+    ##
+    def refresh(self):
+        version = self.snapshot.value
+        if version == self.version:
+            return
+        self.version = version
+        players = self.learners + [player for player in self.players.values()
+                                   if isinstance(player, self.module.AIPlayer)]
+        for player in players:
+            player.utilityTable.close()
+            player.utilityTable = self.module.UtilityTable.open(False, self.path)
+
+    ##
+    # play
+    # Description: Plays the game a task describes.
+    #
+    # Parameters:
+    #   task - (game number, seed, opponent, seat): a training game when
+    #       opponent is None, otherwise an evaluation game against that
+    #       module with the agent moving first (seat 0) or second (seat 1)
+    #
+    # Returns: (game number, won, turns, learned, episodes) where won says
+    #   whether the agent won (the first player, in training), learned is a
+    #   list of (category index, change in utility, visits) and episodes the
+    #   (steps, outcome) of each player when recording (see Experience.py),
+    #   both empty for evaluation
+    ##
+    def play(self, task):
+        gameIndex, seed, opponent, seat = task
+        self.refresh()
+        if opponent is None:
+            players = self.learners
+            for player in players:
+                player.epsilon = self.epsilon
+                player.learned = {}
+                player.episode = [] if self.record else None
+        else:
+            agent = self.getPlayer(self.module.__name__, seat)
+            agent.epsilon = agent.epsilonMin = 0.0
+            players = [agent, self.getPlayer(opponent, 1 - seat)]
+            if seat == 1:
+                players.reverse()
+
+        result = Engine(players[0], players[1], seed, MAX_TURNS).play()
+        if opponent is not None:
+            return (gameIndex, result.winner == seat, result.turns, [], [])
+
+        learned = {}
+        episodes = []
+        for playerId, player in enumerate(players):
+            for index, (change, visits) in player.learned.items():
+                total = learned.setdefault(index, [0.0, 0])
+                total[0] += change
+                total[1] += visits
+            player.learned = None
+            if player.episode is not None:
+                episodes.append((player.episode, 1.0 if result.winner == playerId else -1.0))
+                player.episode = None
+        return (gameIndex, result.winner == 0, result.turns,
+                [(index, change, visits) for index, (change, visits) in learned.items()], episodes)
+
+
+##
+# runWorker
+# Description: The body of a worker process: plays tasks until it is given
+#   None.  An exception is sent back to the learner rather than lost.
+##
+def runWorker(aiDir, moduleName, path, epsilon, snapshot, record, tasks, results):
+    try:
+        worker = Worker(aiDir, moduleName, path, epsilon, snapshot, record)
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            results.put(worker.play(task))
+    except Exception:
+        results.put(traceback.format_exc())
+
+
+##
+# Trainer
+# Description: The learner, and the worker processes it feeds.
+#
+# Variables:
+#   table - the table being trained (the agent module's UtilityTable)
+#   snapshot - the number of the last snapshot published to the workers
+#   gamesPlayed, trainingTime - training games merged so far, and the
+#       seconds they took
+#   experienceLog - the ExperienceWriter training games are logged to, or
+#       None
+##
+class Trainer(object):
+    ##
+    # __init__
+    # Description: Opens the table and starts the workers.
+    #
+    # Parameters:
+    #   moduleName - the agent to train (str)
+    #   workers - number of worker processes (int)
+    #   path - the table file, by default the agent's own
+    #   snapshotEvery - how many games are merged between snapshots (int)
+    #   record - the experience log to append training games to, or None
+    ##
+    def __init__(self, moduleName=DEFAULT_AGENT, workers=None, path=None, snapshotEvery=10, aiDir="AI",
+                 record=None):
+        aiDir = os.path.abspath(aiDir)
+        if aiDir not in sys.path:
+            sys.path.insert(0, aiDir)
+        module = importlib.import_module(moduleName)
+        self.path = os.path.abspath(path or module.TABLE_FILE)
+        self.table = module.UtilityTable.open(True, self.path)
+        self.snapshotEvery = snapshotEvery
+        self.gamesPlayed = 0
+        self.trainingTime = 0.0
+        self.experienceLog = ExperienceWriter(record) if record else None
+
+        context = multiprocessing.get_context("spawn")
+        self.snapshot = context.Value("i", 0)
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        workers = workers or os.cpu_count() or 1
+        self.processes = [context.Process(target=runWorker, daemon=True,
+                                          args=(aiDir, moduleName, self.path, workerEpsilon(i, workers),
+                                                self.snapshot, record is not None, self.tasks, self.results))
+                          for i in range(workers)]
+        for process in self.processes:
+            process.start()
+
+    ##
+    # nextResult
+    # Description: Waits for a game to finish, raising if a worker failed.
+    ##
+    def nextResult(self):
+        result = self.results.get()
+        if isinstance(result, str):
+            raise RuntimeError("training worker failed:\n" + result)
+        return result
+
+    ##
+    # publish
+    # Description: Writes the table back to its file and has the workers
+    #   pick it up before their next game.
+    ##
+    def publish(self):
+        self.table.flush()
+        with self.snapshot.get_lock():
+            self.snapshot.value += 1
+
+    ##
+    # merge
+    # Description: Adds what one game taught to the table.
+    ##
+    def merge(self, learned):
+        table = self.table
+        for index, change, visits in learned:
+            slot = table.slot(index)
+            table.utilities[slot] += change
+            table.visits[slot] += visits
+
+    ##
+    # train
+    # Description: Plays training games and merges what they teach.
+    #
+    # Parameters:
+    #   games - the number of games (int)
+    #   seed - seed of the first game, the others following on from it, or
+    #       None for new seeds (see Engine.newSeed)
+    #   progress - called after each snapshot with the number of games
+    #       played and the seconds spent training
+    ##
+    def train(self, games, seed=None, progress=None):
+        start = time.perf_counter()
+        for i in range(games):
+            self.tasks.put((i, newSeed() if seed is None else seed + i, None, 0))
+        for done in range(1, games + 1):
+            gameIndex, won, turns, learned, episodes = self.nextResult()
+            self.merge(learned)
+            for steps, outcome in episodes:
+                self.experienceLog.episode(steps, outcome)
+            if done % self.snapshotEvery == 0 or done == games:
+                self.publish()
+                if progress is not None:
+                    progress(self.gamesPlayed + done, self.trainingTime + time.perf_counter() - start)
+        self.gamesPlayed += games
+        self.trainingTime += time.perf_counter() - start
+
+    def gamesPerHour(self):
+        return self.gamesPlayed / self.trainingTime * 3600 if self.trainingTime else 0.0
+
+    ##
+    # evaluate
+    # Description: Plays the trained agent, without exploring, against an
+    #   opponent, half the games moving first and half moving second.  With
+    #   a seed, the games carry on from the seeds training used, so the agent
+    #   is not evaluated on the games it trained on.
+    #
+    # Returns: the fraction of the games the agent won
+    ##
+    def evaluate(self, opponent, games, seed=None):
+        for i in range(games):
+            self.tasks.put((i, newSeed() if seed is None else seed + self.gamesPlayed + i, opponent, i % 2))
+        wins = 0
+        for i in range(games):
+            gameIndex, won, turns, learned, episodes = self.nextResult()
+            wins += won
+        return wins / games if games else 0.0
+
+    ##
+    # close
+    # Description: Stops the workers and closes the table and log.
+    ##
+    def close(self):
+        for process in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join()
+        self.table.close()
+        if self.experienceLog is not None:
+            self.experienceLog.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            for process in self.processes:
+                process.terminate()
+        self.close()
+
+
+##
+# main
+# Description: The command line described at the top of this file.
+##
+def main(argv):
+    parser = argparse.ArgumentParser(description="Train an agent's utility table by parallel self-play.")
+    parser.add_argument("-g", "--games", type=int, default=100, help="self-play games to train on")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("-e", "--eval", type=int, default=20, metavar="GAMES",
+                        help="evaluation games against each opponent afterwards")
+    parser.add_argument("-o", "--opponent", action="append", help="opponent to evaluate against (repeatable)")
+    parser.add_argument("--agent", default=DEFAULT_AGENT, help="the agent module to train")
+    parser.add_argument("--table", help="the table file (default: the agent's own)")
+    parser.add_argument("--snapshot", type=int, default=10, metavar="GAMES",
+                        help="games merged between snapshots sent to the workers")
+    parser.add_argument("--seed", type=int, help="seed of the first game, for repeatable runs")
+    parser.add_argument("--record", metavar="LOG", help="append the training games to this experience log")
+    args = parser.parse_args(argv)
+
+    with Trainer(args.agent, args.workers, args.table, args.snapshot, record=args.record) as trainer:
+        trainer.train(args.games, args.seed, lambda played, seconds: print(
+            "%6d games  %8.0f games/hour  %d categories" % (played, played / seconds * 3600, len(trainer.table))))
+        print("trained on %d games at %.0f games/hour" % (trainer.gamesPlayed, trainer.gamesPerHour()))
+        for opponent in args.opponent or DEFAULT_OPPONENTS:
+            rate = trainer.evaluate(opponent, args.eval, args.seed)
+            print("win rate against %s: %.0f%% of %d games" % (opponent, rate * 100, args.eval))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])